@@ -2,126 +2,67 @@ import streamlit as st
 from streamlit_option_menu import option_menu
 
 from services.constants import DEFAULTS
-from views.autorizacao_viagem_manual import render_autorizacao_viagem_manual
-from views.cadastro_emissao_gta import render_cadastro_emissao_gta
-from views.declaracao_cadastral_suinos import render_declaracao_cadastral_suinos
-from views.declaracao_nada_consta import render_declaracao_nada_consta
-from views.declaracao_residencia import render_declaracao_residencia
-from views.etiqueta_arquivo import render_etiqueta_arquivo
-from views.fai_vazio_sanitario import render_fai_vazio_sanitario
-from views.guia_malote import render_guia_malote
-from views.lista_presenca import render_lista_presenca
-from views.parcelamento import render_parcelamento
-from views.reeducandos import render_folha_ponto
-from views.restituicao import render_restituicao
-from views.veiculos import render_veiculos
+from views.registro import carregar_pagina, icones, pagina_oculta, rotulos
 
 
-st.set_page_config(
-    page_title="Utilitários IDARON",
-    page_icon="\U0001F4C4",
-    layout="centered",
-    initial_sidebar_state="expanded",
-)
-
-st.markdown(
-    """
-    <style>
-    .stApp .block-container {
-        padding-left: 2rem;
-        padding-right: 2rem;
-    }
-    .stApp .block-container h1,
-    .stApp .block-container h2 {
-        text-align: center;
-    }
-    [data-testid="stSidebar"] {
-        min-width: 430px;
-        max-width: 430px;
-    }
-    [data-testid="stSidebar"] .nav-link {
-        white-space: normal;
-        line-height: 1.2;
-    }
-    </style>
-    """,
-    unsafe_allow_html=True,
-)
+def main():
+    st.set_page_config(
+        page_title="Utilitários IDARON",
+        page_icon="\U0001F4C4",
+        layout="centered",
+        initial_sidebar_state="expanded",
+    )
 
-for chave, valor in DEFAULTS.items():
-    st.session_state.setdefault(chave, valor)
+    st.markdown(
+        """
+        <style>
+        .stApp .block-container {
+            padding-left: 2rem;
+            padding-right: 2rem;
+        }
+        .stApp .block-container h1,
+        .stApp .block-container h2 {
+            text-align: center;
+        }
+        [data-testid="stSidebar"] {
+            min-width: 430px;
+            max-width: 430px;
+        }
+        [data-testid="stSidebar"] .nav-link {
+            white-space: normal;
+            line-height: 1.2;
+        }
+        </style>
+        """,
+        unsafe_allow_html=True,
+    )
 
-st.session_state.setdefault("_upload_aplicado", False)
-st.session_state.setdefault("_ultimo_upload", "")
+    for chave, valor in DEFAULTS.items():
+        st.session_state.setdefault(chave, valor)
 
+    st.session_state.setdefault("_upload_aplicado", False)
+    st.session_state.setdefault("_ultimo_upload", "")
 
-with st.sidebar:
-    destino = option_menu(
-        "Navegação",
-        [
-            "Folha Reeducandos",
-            "Lista de Presença",
-            "Controle de Veículos",
-            "Cadastro de Emissão de GTA",
-            "Parcelar Auto de Infração",
-            "Requerimento de restituição de valor recolhido indevidamente",
-            "Declaração de nada consta",
-            "Declaração de residência",
-            "Declaração cadastral - suínos",
-            "Etiqueta de arquivo",
-            "Guia de malote",
-            "Autorização de viagem manual",
-            "FAI vazio sanitário",
-        ],
-        icons=[
-            "file-earmark-text",
-            "card-checklist",
-            "truck",
-            "person-vcard",
-            "receipt",
-            "cash-coin",
-            "file-text",
-            "house",
-            "file-earmark-richtext",
-            "tag",
-            "inbox",
-            "car-front",
-            "clipboard2-check",
-        ],
-        menu_icon="cast",
-        default_index=0,
-        styles={
-            "nav-link": {
-                "font-size": "14px",
-                "white-space": "normal",
-                "line-height": "1.2",
+    with st.sidebar:
+        destino = option_menu(
+            "Navegação",
+            rotulos(),
+            icons=icones(),
+            menu_icon="cast",
+            default_index=0,
+            styles={
+                "nav-link": {
+                    "font-size": "14px",
+                    "white-space": "normal",
+                    "line-height": "1.2",
+                },
             },
-        },
-    )
+        )
+
+    carregar_pagina(pagina_oculta(st.query_params.get("pagina")) or destino)()
+
 
-if destino == "Folha Reeducandos":
-    render_folha_ponto()
-elif destino == "Lista de Presença":
-    render_lista_presenca()
-elif destino == "Controle de Veículos":
-    render_veiculos()
-elif destino == "Cadastro de Emissão de GTA":
-    render_cadastro_emissao_gta()
-elif destino == "Parcelar Auto de Infração":
-    render_parcelamento()
-elif destino == "Requerimento de restituição de valor recolhido indevidamente":
-    render_restituicao()
-elif destino == "Declaração de nada consta":
-    render_declaracao_nada_consta()
-elif destino == "Declaração de residência":
-    render_declaracao_residencia()
-elif destino == "Declaração cadastral - suínos":
-    render_declaracao_cadastral_suinos()
-elif destino == "Etiqueta de arquivo":
-    render_etiqueta_arquivo()
-elif destino == "Guia de malote":
-    render_guia_malote()
-elif destino == "Autorização de viagem manual":
-    render_autorizacao_viagem_manual()
-else:
-    render_fai_vazio_sanitario()
+# os processos filhos dos pools (``services.lote``, ``services.importacao``)
+# importam este arquivo como ``__mp_main__``: só a execução do Streamlit desenha a tela
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""
+Benchmarks dos geradores de documentos, sem Streamlit rodando.
+
+``python -m benchmarks`` gera cada caso de ``benchmarks.casos`` com dados
+representativos, mede tempo, pico de memória e tamanho da saída e compara
+com a linha de base guardada em ``benchmarks/baseline.json``.
+"""
@@ -0,0 +1,132 @@
+"""
+Executa os casos de ``benchmarks.casos`` e compara com a linha de base.
+
+    python -m benchmarks                      # mede e compara
+    python -m benchmarks --salvar             # grava a linha de base
+    python -m benchmarks --casos folha guia   # só casos com esses trechos no nome
+    python -m benchmarks --limite-tempo 0.5   # tolera até +50% de tempo
+
+Os geradores são chamados sem ``em_cache`` nem ``medido`` (``inspect.unwrap``),
+depois de uma chamada de aquecimento que carrega fontes, imagens e modelos de
+página. O tempo é a mediana de ``--repeticoes`` chamadas; o pico de memória
+vem de uma chamada extra sob ``tracemalloc``. Sai com código 1 quando algum
+caso passa dos limites.
+"""
+
+import argparse
+import importlib
+import inspect
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.casos import casos
+
+
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+# aumento tolerado em relação à linha de base (0.25 = +25%)
+LIMITES = {"ms": 0.25, "pico_kb": 0.20, "bytes": 0.05}
+
+
+def _gerador(caminho: str):
+    nome_modulo, nome_funcao = caminho.split(":")
+    return inspect.unwrap(getattr(importlib.import_module(nome_modulo), nome_funcao))
+
+
+def medir_caso(funcao, args, kwargs, repeticoes: int) -> dict:
+    """Mediana e mínimo do tempo (ms), pico de memória (KiB) e tamanho da saída."""
+    saida = funcao(*args, **kwargs)  # aquecimento
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao(*args, **kwargs)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    tracemalloc.start()
+    try:
+        funcao(*args, **kwargs)
+        pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {
+        "ms": round(statistics.median(tempos), 3),
+        "min_ms": round(min(tempos), 3),
+        "pico_kb": round(pico / 1024, 1),
+        "bytes": len(saida),
+    }
+
+
+def comparar(resultados: dict, baseline: dict, limites: dict) -> list:
+    """``(caso, métrica, base, atual, variação)`` de cada métrica acima do limite."""
+    regressoes = []
+    for nome, atual in resultados.items():
+        base = baseline.get(nome)
+        if not base:
+            continue
+        for metrica, limite in limites.items():
+            if not base.get(metrica):
+                continue
+            variacao = atual[metrica] / base[metrica] - 1
+            if variacao > limite:
+                regressoes.append((nome, metrica, base[metrica], atual[metrica], variacao))
+    return regressoes
+
+
+def _ler_baseline(caminho: Path) -> dict:
+    if not caminho.exists():
+        return {}
+    return json.loads(caminho.read_text(encoding="utf-8"))["casos"]
+
+
+def _gravar_baseline(caminho: Path, resultados: dict) -> None:
+    conteudo = {"python": sys.version.split()[0], "casos": resultados}
+    caminho.write_text(json.dumps(conteudo, ensure_ascii=False, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def _argumentos(argv):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmarks dos geradores de documentos.")
+    parser.add_argument("--casos", nargs="*", default=[], help="trechos do nome dos casos a executar")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--salvar", action="store_true", help="grava os resultados como nova linha de base")
+    parser.add_argument("--saida", type=Path, help="grava os resultados desta execução em JSON")
+    parser.add_argument("--limite-tempo", type=float, default=LIMITES["ms"])
+    parser.add_argument("--limite-memoria", type=float, default=LIMITES["pico_kb"])
+    parser.add_argument("--limite-bytes", type=float, default=LIMITES["bytes"])
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    opcoes = _argumentos(argv)
+    baseline = _ler_baseline(opcoes.baseline)
+    selecionados = [
+        caso for caso in casos() if not opcoes.casos or any(trecho in caso[0] for trecho in opcoes.casos)
+    ]
+
+    resultados = {}
+    print(f"{'caso':<32} {'ms':>9} {'base':>9} {'pico KiB':>10} {'bytes':>9}")
+    for nome, caminho, args, kwargs in selecionados:
+        resultado = medir_caso(_gerador(caminho), args, kwargs, max(1, opcoes.repeticoes))
+        resultados[nome] = resultado
+        base = baseline.get(nome, {}).get("ms")
+        base_texto = f"{base:9.1f}" if base else f"{'-':>9}"
+        print(f"{nome:<32} {resultado['ms']:9.1f} {base_texto} {resultado['pico_kb']:10.1f} {resultado['bytes']:9d}")
+
+    if opcoes.saida:
+        _gravar_baseline(opcoes.saida, resultados)
+    if opcoes.salvar:
+        _gravar_baseline(opcoes.baseline, {**baseline, **resultados})
+        print(f"linha de base gravada em {opcoes.baseline}")
+        return 0
+
+    limites = {"ms": opcoes.limite_tempo, "pico_kb": opcoes.limite_memoria, "bytes": opcoes.limite_bytes}
+    regressoes = comparar(resultados, baseline, limites)
+    for nome, metrica, base, atual, variacao in regressoes:
+        print(f"REGRESSÃO {nome}: {metrica} {base} -> {atual} ({variacao:+.0%})")
+    return 1 if regressoes else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,393 @@
+"""
+Casos de benchmark: um gerador e os argumentos representativos de cada documento.
+
+Cada caso é ``(nome, "modulo:funcao", args, kwargs)``; o módulo só é
+importado quando o caso roda. Os dados imitam o que as telas montam
+(``views/*``), com textos longos onde o layout quebra linhas.
+"""
+
+from pathlib import Path
+
+from services.feriados import feriados_do_mes
+
+
+ASSETS = Path(__file__).resolve().parents[1] / "assets"
+LOGO_IDARON = ASSETS / "logo_inferior_dir.jpg"
+LOGO_GTA = ASSETS / "logo_ro_horizontal.JPG"
+LOGO_SUGESP = ASSETS / "logo_sugesp.png"
+
+MUNICIPIO = "Porto Velho"
+
+# (ano, mês): fevereiro comum (28) e bissexto (29), abril (30) e outubro (31),
+# todos com feriados (Carnaval, Sexta-feira Santa, Tiradentes, 02/10 e 12/10)
+MESES_FOLHA = ((2026, 2), (2028, 2), (2026, 4), (2026, 10))
+
+PESSOA = {
+    "endereco": "Av. Farquar, 2986 - Palácio Rio Madeira, Ed. Rio Pacaás Novos",
+    "cep": "76801-470",
+    "telefone": "(69) 3216-5000",
+    "secretaria": "AGÊNCIA DE DEFESA SANITÁRIA AGROSILVOPASTORIL DO ESTADO DE RONDÔNIA",
+    "reeducando": "JOSÉ DA SILVA SAURO DE OLIVEIRA",
+    "funcao": "AUXILIAR DE SERVIÇOS GERAIS",
+    "data_inclusao": "03/02/2025",
+    "municipio": MUNICIPIO,
+    "cpf": "123.456.789-00",
+    "banco": "BANCO DO BRASIL",
+    "agencia": "1234-5",
+    "conta": "98765-4",
+    "tipo_conta": "CORRENTE",
+}
+
+
+def _feriados(ano, mes) -> dict:
+    return feriados_do_mes(ano, mes, MUNICIPIO, facultativos=True)
+
+
+def _folha(ano, mes) -> dict:
+    return {
+        **PESSOA,
+        "ano": ano,
+        "mes": mes,
+        "he": "07:30",
+        "hs": "13:30",
+        "data_preenchimento": f"01/{mes:02d}/{ano}",
+        "feriados": _feriados(ano, mes),
+    }
+
+
+def _relatorio(ano, mes) -> dict:
+    campos = ("secretaria", "reeducando", "funcao", "municipio", "endereco", "cep", "telefone")
+    return {
+        **{campo: PESSOA[campo] for campo in campos},
+        "ano": ano,
+        "mes": mes,
+        "data_preenchimento": f"01/{mes:02d}/{ano}",
+        "feriados": _feriados(ano, mes),
+    }
+
+
+def _periodo(ano) -> dict:
+    return {
+        **PESSOA,
+        "ano": ano,
+        "meses": list(range(1, 13)),
+        "he": "07:30",
+        "hs": "13:30",
+        "data_preenchimento": f"01/01/{ano}",
+        "feriados_por_mes": {mes: _feriados(ano, mes) for mes in range(1, 13)},
+    }
+
+
+LISTA_PRESENCA = {
+    "mes": 4,
+    "ano": 2026,
+    "regional": "REGIONAL DE PORTO VELHO",
+    "unidade": "ULSAV PORTO VELHO",
+    "atividade": "EDUCAÇÃO SANITÁRIA EM DEFESA AGROPECUÁRIA",
+    "atividade_palestra": "X",
+    "atividade_reuniao": "",
+    "atividade_curso": "X",
+    "atividade_encontro": "",
+    "outro_qual": "",
+    "tema": "Vazio sanitário da soja e controle da ferrugem asiática nas propriedades rurais",
+    "data": "14/04/2026",
+    "horario_inicio": "08:00",
+    "horario_fim": "12:00",
+    "local": "Auditório da Escola Estadual Rural",
+    "municipio": MUNICIPIO,
+    "tipo_publico": "Produtor, Lideranças, Servidores IDARON",
+    "qual": "",
+}
+
+
+def _guia_malote(itens: int) -> dict:
+    return {
+        "supervisao_regional": "SUPERVISÃO REGIONAL DE PORTO VELHO",
+        "identificacao_guia": "GUIA N° 012/2026",
+        "origem_resumo": "ULSAV PORTO VELHO",
+        "destino_resumo": "IDARON - SEDE CENTRAL / GERÊNCIA ADMINISTRATIVA",
+        "data_envio": "17/04/2026",
+        "itens": [
+            {"descricao": f"Processo administrativo nº {numero:05d}/2026 - nota fiscal avulsa de serviços"}
+            for numero in range(1, itens + 1)
+        ],
+        "assinatura_nome": "MARIA APARECIDA DOS SANTOS",
+        "assinatura_cargo": "FISCAL ESTADUAL AGROPECUÁRIO",
+        "assinatura_matricula": "300012345",
+    }
+
+
+MESES_ETIQUETA = (
+    "JANEIRO", "FEVEREIRO", "MARÇO", "ABRIL", "MAIO", "JUNHO",
+    "JULHO", "AGOSTO", "SETEMBRO", "OUTUBRO", "NOVEMBRO", "DEZEMBRO",
+)
+
+
+def _etiqueta(cartoes: int) -> dict:
+    cards = [
+        {
+            "supervisao_regional": "SUPERVISÃO REGIONAL DE PORTO VELHO",
+            "unidade": "ULSAV PORTO VELHO",
+            "caixa": f"{numero:03d}",
+            "month_sections": [
+                {"month": mes, "year": 2026, "text": "GTA, e-GTA, notas fiscais e termos de fiscalização"}
+                for mes in MESES_ETIQUETA[(numero % 4) * 3:(numero % 4) * 3 + 3]
+            ],
+        }
+        for numero in range(1, cartoes + 1)
+    ]
+    return {
+        "supervisao_regional": cards[0]["supervisao_regional"],
+        "unidade": cards[0]["unidade"],
+        "caixa": cards[0]["caixa"],
+        "month_sections": cards[0]["month_sections"],
+        "label_cards": cards,
+    }
+
+
+GTA = {
+    "nome": "JOÃO PEREIRA DA COSTA",
+    "cargo": "FISCAL ESTADUAL AGROPECUÁRIO",
+    "formacao": "MÉDICO VETERINÁRIO",
+    "matricula": "300054321",
+    "rg": "1234567 SESDEC/RO",
+    "cpf": "987.654.321-00",
+    "orgao_origem": "IDARON",
+    "data_emissao": "10/03/2026",
+    "regional": "REGIONAL DE ARIQUEMES",
+    "unidade_lotacao": "ULSAV ARIQUEMES",
+    "data_lotacao": "01/02/2020",
+    "autorizado_transito": "TODO O ESTADO DE RONDÔNIA",
+    "municipio_estado": "ARIQUEMES/RO",
+    "especies": "BOVINOS, BUBALINOS, SUÍNOS, EQUINOS, AVES",
+    "outros_documentos": "Certificado de vacinação; atestado de exame de brucelose e tuberculose",
+}
+
+PERMISSOES_GTA = {
+    item: {"novo": item % 2 == 0, "editar": True, "cancelar": item % 3 == 0, "consultar": True}
+    for item in range(1, 10)
+}
+
+FAI = {
+    "numero": "0123/2026",
+    "data_emissao": "15/07/2026",
+    "responsavel": "ANA PAULA FERREIRA",
+    "produtor": "CARLOS ALBERTO MENDES",
+    "propriedade": "FAZENDA BOA ESPERANÇA",
+    "cod_propriedade": "110002001234",
+    "logradouro": "Linha C-45, Km 12, Gleba Triunfo",
+    "municipio": "VILHENA",
+    "area_propriedade": "1.250,00",
+    "area_soja_cadastrada": "980,00",
+    "cod_sisvegetal": "SV-445566",
+    "sojicultor": "CARLOS ALBERTO MENDES",
+    "cpf": "111.222.333-44",
+    "email": "carlos.mendes@example.com",
+    "fone": "(69) 99999-0000",
+    "coord_s": "12°44'10\"",
+    "coord_w": "60°08'22\"",
+    "coord_confere": "SIM",
+    "uf": "RO",
+    "ulsav_de": "VILHENA",
+    "regional": "VILHENA",
+    "placa_veiculo": "NBX-1234",
+    "hod_inicial": "45210",
+    "hod_final": "45298",
+    "dist_ulsav_km": "44",
+    "cultura": "",
+    "area": "",
+    "talhao": "",
+    "titulo": "FISCALIZAÇÃO DO VAZIO SANITÁRIO DA SOJA",
+    "subtitulo": "ESTABELECIDA PELA INSTRUÇÃO NORMATIVA",
+    "observacoes": "Propriedade vistoriada sem presença de plantas voluntárias de soja nos talhões.",
+    "cadastro_idaron_status": "SIM",
+    "cadastro_prazo_status": "SIM",
+    "notificacao_produtor_checked": False,
+    "irregularidade_checked": False,
+    "auto_infracao_numero": "",
+    "auto_infracao_data": "",
+    "monitoramento_ferrugem_status": "SIM",
+    "cultiva_soja_safrinha_status": "NÃO",
+    "ocorrencia_ferrugem_status": "NÃO",
+    "cadastro_safrinha_status": "NÃO",
+    "ocorrencia_laboratorio_status": "NÃO",
+    "data_plantio": "",
+    "laboratorio": "",
+    "outros_cultivos_safrinha": "MILHO",
+    "estimativa_perda": "",
+    "origem_propria": False,
+    "origem_empresa": True,
+    "origem_outra": False,
+    "assinatura_horario": "10:30",
+    "assinatura_data": "15/07/2026",
+    "assinatura_local": "VILHENA",
+    "assinatura_nome": "CARLOS ALBERTO MENDES",
+    "assinatura_cpf": "111.222.333-44",
+}
+
+VEICULO = {"mes": "ABRIL", "ano": 2026, "unidade": "ULSAV PORTO VELHO", "placa": "NCX-4G21", "modelo": "HILUX CD 4X4"}
+
+RESTITUICAO = {
+    "nome": "PEDRO HENRIQUE ALVES",
+    "nacionalidade": "BRASILEIRO",
+    "cpf_cnpj": "222.333.444-55",
+    "residente": "Rua das Palmeiras, 123, Bairro Centro",
+    "municipio": "JI-PARANÁ",
+    "propriedade": "SÍTIO SÃO JOÃO",
+    "taxa_gta": True,
+    "taxa_gta_presencial": False,
+    "taxa_multa": False,
+    "vem_requerer": "a restituição do valor recolhido indevidamente referente à emissão de GTA",
+    "justificativa": "O pagamento foi efetuado em duplicidade, conforme comprovantes anexos. " * 4,
+    "titular": "PEDRO HENRIQUE ALVES",
+    "conta_cpf": "222.333.444-55",
+    "banco": "BANCO DO BRASIL",
+    "agencia": "4321-0",
+    "conta_corrente": "55555-6",
+    "numero_banco": "001",
+    "tipo": "CORRENTE",
+    "codigo_barras": "85890000001 2 34560123456 7 89012345678 9 01234567890 1",
+    "declaracao": "Declaro, para os devidos fins, que não existe outro processo de restituição "
+    "referente ao pagamento desta GTA em andamento no âmbito da IDARON.",
+    "local": "JI-PARANÁ",
+    "data": "20/04/2026",
+}
+
+DECLARACAO_NADA_CONSTA = {
+    "destinatario": "Ao Senhor Gerente de Defesa Sanitária Animal",
+    "vocativo": "Senhor Gerente,",
+    "nome_caps": "LUCAS MOREIRA DA SILVA",
+    "corpo": "Declaramos, para os devidos fins, que não constam pendências em nome do requerente "
+    "junto a esta unidade até a presente data. " * 3,
+    "servidor_nome": "MARIA APARECIDA DOS SANTOS",
+    "servidor_cargo": "FISCAL ESTADUAL AGROPECUÁRIO",
+    "servidor_matricula": "300012345",
+    "cpf": "333.444.555-66",
+    "rg": "7654321 SESDEC/RO",
+    "incluir_assinatura_requerente": True,
+}
+
+DECLARACAO_RESIDENCIA = {
+    "nome_declarante": "Joao da Silva - CPF 000.000.000-00",
+    "logradouro": "Linha 625, Lote 14, Gleba 02",
+    "municipio": "ROLIM DE MOURA",
+    "complemento": "Próximo à escola rural",
+    "observacoes": "Residente no endereço desde 2015.",
+    "data": "20/04/2026",
+}
+
+DECLARACAO_SUINOS = {
+    "ulsav": "ULSAV CACOAL",
+    "numero_declaracao": "045/2026",
+    "nome": "ANTÔNIO CARLOS RIBEIRO",
+    "nacionalidade": "BRASILEIRO",
+    "profissao": "AGRICULTOR",
+    "rg": "556677 SESDEC/RO",
+    "orgao_emissor": "SESDEC/RO",
+    "cpf_cnpj": "444.555.666-77",
+    "endereco": "Linha 10, Km 5, Zona Rural",
+    "municipio": "CACOAL",
+    "uf": "RO",
+    "reprodutor": 2,
+    "matriz": 10,
+    "leitao_m": 18,
+    "leitao_f": 21,
+    "idade_sexo_nao_relevante": 0,
+    "total_animais": 51,
+    "cpf_cnpj_prop": "444.555.666-77",
+    "nome_prop_imovel": "ANTÔNIO CARLOS RIBEIRO",
+    "cod_propriedade_pga": "110004005678",
+    "observacoes": "",
+    "tipo_vinculo": "PROPRIETÁRIO",
+    "cod_exploracao_pga": "2",
+    "local_data_extenso": "CACOAL, 20 de abril de 2026.",
+    "emitente_nome": "MARIA APARECIDA DOS SANTOS",
+    "emitente_cargo": "FISCAL ESTADUAL AGROPECUÁRIO",
+    "emitente_matricula": "300012345",
+}
+
+AUTORIZACAO_VIAGEM = {
+    "placa": "NCX-4G21",
+    "tipo_modelo": "HILUX CD 4X4",
+    "objetivo": "Fiscalização do trânsito agropecuário e atendimento a notificação de suspeita",
+    "destino": "GUAJARÁ-MIRIM / NOVA MAMORÉ",
+    "servidor": "JOÃO PEREIRA DA COSTA",
+    "cargo_funcao": "FISCAL ESTADUAL AGROPECUÁRIO",
+    "matricula": "300054321",
+    "habilitacao": "01234567890",
+    "categoria": "B",
+    "validade": "18/12/2033",
+    "saida_texto": "25/03/2026 07:30",
+    "km_saida": "45210",
+    "responsavel_transporte": "SETOR DE TRANSPORTES",
+    "chegada_texto": "25/03/2026 18:00",
+    "km_chegada": "45890",
+    "observacao": "",
+}
+
+
+def casos() -> list:
+    """Todos os casos, na ordem em que são executados."""
+    lista = []
+    for ano, mes in MESES_FOLHA:
+        lista.append((f"folha_{ano}_{mes:02d}", "services.pdf_builders:gerar_pdf", (), _folha(ano, mes)))
+    for ano, mes in MESES_FOLHA:
+        lista.append(
+            (f"relatorio_{ano}_{mes:02d}", "services.pdf_builders:gerar_relatorio_pdf", (), _relatorio(ano, mes))
+        )
+    lista.append(("periodo_2026", "services.pdf_builders:gerar_periodo_pdf", (), _periodo(2026)))
+    lista.append(("lista_presenca", "services.pdf_builders:gerar_lista_presenca_pdf", (), LISTA_PRESENCA))
+    for itens in (5, 50, 500):
+        lista.append(
+            (f"guia_malote_{itens}", "pdf.guia_malote:build_pdf_guia_malote_v2", (_guia_malote(itens), LOGO_IDARON), {})
+        )
+    for cartoes in (1, 40):
+        lista.append(
+            (f"etiqueta_{cartoes}", "pdf.etiqueta_arquivo:build_pdf_etiqueta_arquivo", (), _etiqueta(cartoes))
+        )
+    lista.append(("cadastro_gta_pdf", "pdf.cadastro_emissao_gta:build_pdf_cadastro_gta", (GTA, LOGO_GTA), {}))
+    lista.append(("cadastro_gta_docx", "pdf.cadastro_emissao_gta:build_docx_cadastro_gta", (GTA, LOGO_GTA), {}))
+    lista.append(
+        (
+            "permissoes_gta",
+            "pdf.cadastro_emissao_gta:build_pdf_permissoes_gta",
+            (GTA, LOGO_GTA, PERMISSOES_GTA),
+            {},
+        )
+    )
+    lista.append(("fai_vazio_sanitario", "pdf.fai_vazio_sanitario:build_pdf", (FAI,), {}))
+    lista.append(("veiculo", "pdf.veiculos:build_pdf_veiculo", (VEICULO, LOGO_IDARON), {}))
+    lista.append(("restituicao", "pdf.restituicao:build_pdf_restituicao", (RESTITUICAO, LOGO_IDARON), {}))
+    lista.append(
+        (
+            "declaracao_nada_consta",
+            "pdf.declaracao_nada_consta:build_pdf_declaracao_nada_consta",
+            (DECLARACAO_NADA_CONSTA, LOGO_IDARON),
+            {},
+        )
+    )
+    lista.append(
+        (
+            "declaracao_residencia",
+            "pdf.declaracao_residencia:build_pdf_declaracao_residencia",
+            (DECLARACAO_RESIDENCIA, LOGO_IDARON),
+            {},
+        )
+    )
+    lista.append(
+        (
+            "declaracao_cadastral_suinos",
+            "pdf.declaracao_cadastral_suinos:build_pdf_declaracao_cadastral_suinos",
+            (DECLARACAO_SUINOS, LOGO_IDARON),
+            {},
+        )
+    )
+    lista.append(
+        (
+            "autorizacao_viagem_manual",
+            "pdf.autorizacao_viagem_manual:build_pdf_autorizacao_viagem_manual",
+            (AUTORIZACAO_VIAGEM, LOGO_SUGESP),
+            {},
+        )
+    )
+    return lista
@@ -0,0 +1,264 @@
+"""PDF da autorização de viagem manual (SUGESP)."""
+
+from io import BytesIO
+from pathlib import Path
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+
+from pdf.dados_embutidos import embutir_dados
+from pdf.imagens import desenhar_imagem, obter_imagem
+from pdf.layout import quebrar_linhas
+from services.cache_documentos import em_cache
+from services.instrumentacao import medido
+
+
+FONT_REGULAR = "Helvetica"
+FONT_BOLD = "Helvetica-Bold"
+
+
+def _ensure_fonts() -> None:
+    global FONT_REGULAR, FONT_BOLD
+
+    if getattr(_ensure_fonts, "_loaded", False):
+        return
+
+    regular_path = Path(r"C:\Windows\Fonts\arial.ttf")
+    bold_path = Path(r"C:\Windows\Fonts\arialbd.ttf")
+    if regular_path.exists() and bold_path.exists():
+        pdfmetrics.registerFont(TTFont("AVMArial", str(regular_path)))
+        pdfmetrics.registerFont(TTFont("AVMArial-Bold", str(bold_path)))
+        FONT_REGULAR = "AVMArial"
+        FONT_BOLD = "AVMArial-Bold"
+
+    _ensure_fonts._loaded = True
+
+
+def _draw_box(c: canvas.Canvas, x: float, y_top: float, w: float, h: float) -> None:
+    c.setLineWidth(0.6)
+    c.rect(x, y_top - h, w, h)
+
+
+def _draw_labeled_box(
+    c: canvas.Canvas,
+    x: float,
+    y_top: float,
+    w: float,
+    h: float,
+    label: str,
+    value: str,
+    value_size: float = 8.5,
+    max_lines: int = 3,
+) -> None:
+    _draw_box(c, x, y_top, w, h)
+    pad_x = 1.5 * mm
+    c.setFont(FONT_REGULAR, value_size)
+    linhas = quebrar_linhas(value, FONT_REGULAR, value_size, w - 3 * mm, preservar_quebras=True) or [""]
+    if label:
+        c.setFont(FONT_BOLD, 6.5)
+        c.drawString(x + pad_x, y_top - 3.3 * mm, label)
+        y = y_top - 7 * mm
+    else:
+        y = y_top - 4.7 * mm
+    c.setFont(FONT_REGULAR, value_size)
+    for linha in linhas[:max_lines]:
+        c.drawString(x + pad_x, y, linha)
+        y -= 3.8 * mm
+
+
+def _draw_centered_text_box(
+    c: canvas.Canvas,
+    x: float,
+    y_top: float,
+    w: float,
+    h: float,
+    linhas: list[str],
+    font_name: str,
+    font_size: float,
+    leading: float,
+) -> None:
+    _draw_box(c, x, y_top, w, h)
+    c.setFont(font_name, font_size)
+    total_h = max(len(linhas) - 1, 0) * leading
+    y = y_top - (h / 2) + (total_h / 2) + 1.2 * mm
+    for linha in linhas:
+        c.drawCentredString(x + (w / 2), y, linha)
+        y -= leading
+
+
+def _draw_header(c: canvas.Canvas, x: float, y_top: float, w: float, h: float, logo_path: Path) -> None:
+    logo_w = 24 * mm
+    gov_w = 72 * mm
+    title_w = w - logo_w - gov_w
+
+    _draw_box(c, x, y_top, logo_w, h)
+    _draw_centered_text_box(
+        c,
+        x + logo_w,
+        y_top,
+        gov_w,
+        h,
+        [
+            "GOVERNO DO ESTADO DE RONDÔNIA",
+            "AGÊNCIA DE DEFESA AGROSILVOPASTORIL",
+            "DO ESTADO DE RONDÔNIA - IDARON",
+        ],
+        FONT_BOLD,
+        7.1,
+        3.8 * mm,
+    )
+    _draw_centered_text_box(
+        c,
+        x + logo_w + gov_w,
+        y_top,
+        title_w,
+        h,
+        [
+            "AUTORIZAÇÃO PROVISÓRIA DE",
+            "VIAGEM OU TRÂNSITO FORA DO",
+            "HORÁRIO DE EXPEDIENTE",
+        ],
+        FONT_BOLD,
+        7.8,
+        4.2 * mm,
+    )
+
+    logo = obter_imagem(logo_path)
+    if logo is not None:
+        img_w, img_h = logo["largura"], logo["altura"]
+        max_w = logo_w - 4 * mm
+        max_h = h - 4 * mm
+        escala = min(max_w / img_w, max_h / img_h)
+        draw_w = img_w * escala
+        draw_h = img_h * escala
+        desenhar_imagem(
+            c,
+            logo,
+            x + (logo_w - draw_w) / 2,
+            y_top - h + (h - draw_h) / 2,
+            width=draw_w,
+            height=draw_h,
+            mask="auto",
+        )
+
+
+def _draw_label_row(c: canvas.Canvas, x: float, y_top: float, w: float, h: float, split: float) -> None:
+    left_w = w * split
+    right_w = w - left_w
+    _draw_box(c, x, y_top, left_w, h)
+    _draw_box(c, x + left_w, y_top, right_w, h)
+
+    c.setFont(FONT_BOLD, 7.6)
+    baseline_y = y_top - h + (h * 0.42)
+    c.drawCentredString(x + (left_w / 2), baseline_y, "OBJETIVO")
+    c.drawCentredString(x + left_w + (right_w / 2), baseline_y, "DESTINO")
+
+
+def _draw_route_row(
+    c: canvas.Canvas, x: float, y_top: float, w: float, h: float, data: dict, is_saida: bool
+) -> tuple[float, float]:
+    left_w = w * 0.46
+    km_w = w * 0.12
+
+    prefixo = "SAÍDA" if is_saida else "CHEGADA"
+    valor_data = data.get("saida_texto" if is_saida else "chegada_texto", "")
+    valor_km = data.get("km_saida" if is_saida else "km_chegada", "")
+
+    _draw_labeled_box(c, x, y_top, left_w, h, f"{prefixo}:", valor_data, value_size=8.5, max_lines=2)
+    _draw_labeled_box(c, x + left_w, y_top, km_w, h, "KM:", valor_km, value_size=8.5, max_lines=2)
+    return left_w + km_w, w - left_w - km_w
+
+
+def _draw_formulario(c: canvas.Canvas, x: float, y_top: float, w: float, data: dict, logo_path: Path) -> None:
+    y = y_top
+
+    header_h = 19 * mm
+    vehicle_h = 11 * mm
+    section_label_h = 6 * mm
+    objetivo_h = 18 * mm
+    servidor_h = 23 * mm
+    route_h = 10 * mm
+    obs_h = 8 * mm
+
+    _draw_header(c, x, y, w, header_h, logo_path)
+    y -= header_h
+
+    veiculo = f"PLACA {data.get('placa', '').strip()}    TIPO/MODELO: {data.get('tipo_modelo', '').strip()}"
+    _draw_labeled_box(c, x, y, w, vehicle_h, "VEÍCULO", veiculo, value_size=8.8, max_lines=2)
+    y -= vehicle_h
+
+    _draw_label_row(c, x, y, w, section_label_h, 0.6)
+    y -= section_label_h
+
+    left_w = w * 0.6
+    right_w = w - left_w
+    _draw_labeled_box(c, x, y, left_w, objetivo_h, "", data.get("objetivo", ""), value_size=8.4, max_lines=4)
+    _draw_labeled_box(c, x + left_w, y, right_w, objetivo_h, "", data.get("destino", ""), value_size=8.4, max_lines=4)
+    y -= objetivo_h
+
+    servidor_linhas = [
+        f"SERVIDOR: {data.get('servidor', '').strip()}",
+        f"CARGO/FUNÇÃO: {data.get('cargo_funcao', '').strip()}",
+        f"MATRÍCULA: {data.get('matricula', '').strip()}",
+        (
+            "HABILITAÇÃO: "
+            f"{data.get('habilitacao', '').strip()}    - CATEGORIA: {data.get('categoria', '').strip()}    "
+            f"- VALIDADE: {data.get('validade', '').strip()}"
+        ),
+    ]
+    _draw_labeled_box(c, x, y, w, servidor_h, "", "\n".join(servidor_linhas), value_size=8.4, max_lines=5)
+    y -= servidor_h
+
+    resp_x, resp_w = _draw_route_row(c, x, y, w, route_h, data, is_saida=True)
+    y -= route_h
+
+    _draw_route_row(c, x, y, w, route_h, data, is_saida=False)
+    _draw_labeled_box(
+        c,
+        x + resp_x,
+        y + route_h,
+        resp_w,
+        route_h * 2,
+        "Responsável Transporte:",
+        data.get("responsavel_transporte", ""),
+        value_size=8.3,
+        max_lines=4,
+    )
+    y -= route_h
+
+    observacao = data.get("observacao", "").strip()
+    _draw_labeled_box(c, x, y, w, obs_h, "OBS:", observacao, value_size=8.1, max_lines=2)
+
+
+@medido("autorizacao_viagem_manual")
+@em_cache()
+def build_pdf_autorizacao_viagem_manual(data: dict, logo_path: Path) -> bytes:
+    _ensure_fonts()
+    buffer = BytesIO()
+    page_width, page_height = A4
+    c = canvas.Canvas(buffer, pagesize=A4)
+
+    x = 10 * mm
+    w = page_width - 20 * mm
+    top_margin = 10 * mm
+    form_h = 105 * mm
+    gap = 11 * mm
+
+    top1 = page_height - top_margin
+    top2 = top1 - form_h - gap
+
+    _draw_formulario(c, x, top1, w, data, logo_path)
+
+    c.setFont(FONT_BOLD, 8)
+    c.drawCentredString(page_width / 2, top2 + 5 * mm, "2ª VIA PARA O SETOR")
+
+    _draw_formulario(c, x, top2, w, data, logo_path)
+
+    c.showPage()
+    embutir_dados(c, "autorizacao_viagem_manual", data)
+    c.save()
+    buffer.seek(0)
+    return buffer.read()
@@ -2,9 +2,9 @@ from pathlib import Path
 
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm
-from reportlab.lib.utils import ImageReader
 
 from pdf import bookman_font
+from pdf.imagens import desenhar_imagem, obter_imagem
 
 
 LOGO_PATH = Path("assets/logo_ro_horizontal.jpg")
@@ -28,16 +28,17 @@ def desenhar_cabecalho(
     logo_path = LOGO_PATH if LOGO_PATH.exists() else LOGO_PATH_ALT
     y_logo = altura_pagina - margem_topo
 
-    if logo_path.exists():
-        logo = ImageReader(str(logo_path))
-        w_px, h_px = logo.getSize()
+    logo = obter_imagem(logo_path)
+    if logo is not None:
+        w_px, h_px = logo["largura"], logo["altura"]
         largura_mm = 24
         w_pt = largura_mm * mm
         proporcao = w_pt / w_px
         h_pt = h_px * proporcao
         x_logo = (largura_pagina - w_pt) / 2
         y_logo = altura_pagina - margem_topo - h_pt - deslocar_logo_para_cima
-        c.drawImage(
+        desenhar_imagem(
+            c,
             logo,
             x_logo,
             y_logo,
@@ -1,8 +1,9 @@
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm
-import calendar
 
 from pdf import bookman_font
+from pdf.layout import layout_paragraph
+from services.feriados import indice_mes
 
 def desenhar_tabela(
     c,
@@ -26,7 +27,14 @@ def desenhar_tabela(
     agencia=None,
     conta=None,
     tipo_conta=None,
+    estrutura=True,
+    conteudo=True,
 ):
+    """
+    Desenha a folha de ponto. ``estrutura`` controla as partes fixas (grade,
+    títulos e rótulos) e ``conteudo`` os dados do reeducando e os dias do mês,
+    para que a estrutura possa vir de um modelo de página em cache.
+    """
     bookman_font.ensure_bookman_fonts()
     largura_pagina, altura_pagina = A4
     feriados = feriados or {}
@@ -80,143 +88,154 @@ def desenhar_tabela(
     # 1ª LINHA – REGISTRO INDIVIDUAL DE PONTO
     # ------------------------------------------------------------
     y1 = y_top - altura_titulo
-    c.rect(x, y1, largura_tabela, altura_titulo, fill=0)
+    if estrutura:
+        c.rect(x, y1, largura_tabela, altura_titulo, fill=0)
 
-    c.setFont(bookman_font.FONT_BOLD, 12)   # Arial Black 12 ~
-    c.drawCentredString(
-        x + largura_tabela / 2,
-        y1 + (altura_titulo / 2) - 4,
-        "REGISTRO INDIVIDUAL DE PONTO"
-    )
+        c.setFont(bookman_font.FONT_BOLD, 12)   # Arial Black 12 ~
+        c.drawCentredString(
+            x + largura_tabela / 2,
+            y1 + (altura_titulo / 2) - 4,
+            "REGISTRO INDIVIDUAL DE PONTO"
+        )
     y_atual = y1
 
     # ------------------------------------------------------------
     # 2ª LINHA – SECRETARIA / ANO (linha corta antes do ANO)
     # ------------------------------------------------------------
     y2 = y_atual - altura_linha
-    c.rect(x, y2, largura_tabela, altura_linha, fill=0)
-
-    c.setFont(bookman_font.FONT_BOLD, 11)
-    texto_ano = f"ANO: {ano}"
-    largura_texto_ano = c.stringWidth(texto_ano, bookman_font.FONT_BOLD, 11)
-
-    x_ano = x + largura_tabela - pad - largura_texto_ano
-    x_div1 = x_ano - pad
-    c.line(x_div1, y2, x_div1, y2 + altura_linha)
-
-    c.drawString(
-        x + pad,
-        y2 + (altura_linha / 2) - 3,
-        f"SECRETARIA: {secretaria}"
-    )
-    c.drawString(
-        x_ano,
-        y2 + (altura_linha / 2) - 3,
-        texto_ano
-    )
+    if estrutura:
+        c.rect(x, y2, largura_tabela, altura_linha, fill=0)
+
+    if conteudo:
+        c.setFont(bookman_font.FONT_BOLD, 11)
+        texto_ano = f"ANO: {ano}"
+        largura_texto_ano = c.stringWidth(texto_ano, bookman_font.FONT_BOLD, 11)
+
+        x_ano = x + largura_tabela - pad - largura_texto_ano
+        x_div1 = x_ano - pad
+        c.line(x_div1, y2, x_div1, y2 + altura_linha)
+
+        c.drawString(
+            x + pad,
+            y2 + (altura_linha / 2) - 3,
+            f"SECRETARIA: {secretaria}"
+        )
+        c.drawString(
+            x_ano,
+            y2 + (altura_linha / 2) - 3,
+            texto_ano
+        )
     y_atual = y2
 
     # ------------------------------------------------------------
     # 3ª LINHA – REEDUCANDO / MÊS
     # ------------------------------------------------------------
     y3 = y_atual - altura_linha
-    c.rect(x, y3, largura_tabela, altura_linha, fill=0)
-
     largura_reeducando = largura_tabela * 0.70
-    c.line(x + largura_reeducando, y3, x + largura_reeducando, y3 + altura_linha)
-
-    c.drawString(
-        x + pad,
-        y3 + (altura_linha / 2) - 3,
-        f"REEDUCANDO: {nome_reeducando}"
-    )
-    c.drawString(
-        x + largura_reeducando + pad,
-        y3 + (altura_linha / 2) - 3,
-        f"MÊS: {nome_mes}"
-    )
+    if estrutura:
+        c.rect(x, y3, largura_tabela, altura_linha, fill=0)
+        c.line(x + largura_reeducando, y3, x + largura_reeducando, y3 + altura_linha)
+
+    if conteudo:
+        c.drawString(
+            x + pad,
+            y3 + (altura_linha / 2) - 3,
+            f"REEDUCANDO: {nome_reeducando}"
+        )
+        c.drawString(
+            x + largura_reeducando + pad,
+            y3 + (altura_linha / 2) - 3,
+            f"MÊS: {nome_mes}"
+        )
     y_atual = y3
 
     # ------------------------------------------------------------
     # 4ª LINHA – FUNÇÃO
     # ------------------------------------------------------------
     y4 = y_atual - altura_linha
-    c.rect(x, y4, largura_tabela, altura_linha, fill=0)
-
-    c.drawString(
-        x + pad,
-        y4 + (altura_linha / 2) - 3,
-        f"FUNÇÃO: {funcao}"
-    )
+    if estrutura:
+        c.rect(x, y4, largura_tabela, altura_linha, fill=0)
+
+    if conteudo:
+        c.drawString(
+            x + pad,
+            y4 + (altura_linha / 2) - 3,
+            f"FUNÇÃO: {funcao}"
+        )
     y_atual = y4
 
     # ------------------------------------------------------------
     # 5ª LINHA – DATA DA INCLUSÃO / MUNICÍPIO
     # ------------------------------------------------------------
     y5 = y_atual - altura_linha
-    c.rect(x, y5, largura_tabela, altura_linha, fill=0)
+    if estrutura:
+        c.rect(x, y5, largura_tabela, altura_linha, fill=0)
 
-    c.setFont(bookman_font.FONT_BOLD, 11)
-    texto_data = f"DATA DA INCLUSÃO: {data_inclusao}"
-    largura_texto_data = c.stringWidth(texto_data, bookman_font.FONT_BOLD, 11)
+    if conteudo:
+        c.setFont(bookman_font.FONT_BOLD, 11)
+        texto_data = f"DATA DA INCLUSÃO: {data_inclusao}"
+        largura_texto_data = c.stringWidth(texto_data, bookman_font.FONT_BOLD, 11)
 
-    x_fim_data = x + pad + largura_texto_data + 2
-    c.line(x_fim_data, y5, x_fim_data, y5 + altura_linha)
+        x_fim_data = x + pad + largura_texto_data + 2
+        c.line(x_fim_data, y5, x_fim_data, y5 + altura_linha)
 
-    c.drawString(
-        x + pad,
-        y5 + (altura_linha / 2) - 3,
-        texto_data
-    )
-    c.drawString(
-        x_fim_data + pad,
-        y5 + (altura_linha / 2) - 3,
-        f"MUNICÍPIO: {municipio}"
-    )
+        c.drawString(
+            x + pad,
+            y5 + (altura_linha / 2) - 3,
+            texto_data
+        )
+        c.drawString(
+            x_fim_data + pad,
+            y5 + (altura_linha / 2) - 3,
+            f"MUNICÍPIO: {municipio}"
+        )
     y_atual = y5
 
     # ------------------------------------------------------------
     # 6ª LINHA – CPF / BCO / AG / CONTA
     # ------------------------------------------------------------
     y6 = y_atual - altura_linha
-    c.rect(x, y6, largura_tabela, altura_linha, fill=0)
-
     larg_cpf = largura_tabela * 0.45
     larg_bco = largura_tabela * 0.13
     x_cpf_fim = x + larg_cpf
     x_bco_fim = x_cpf_fim + larg_bco
 
-    c.line(x_cpf_fim, y6, x_cpf_fim, y6 + altura_linha)
-    c.line(x_bco_fim, y6, x_bco_fim, y6 + altura_linha)
+    if estrutura:
+        c.rect(x, y6, largura_tabela, altura_linha, fill=0)
+        c.line(x_cpf_fim, y6, x_cpf_fim, y6 + altura_linha)
+        c.line(x_bco_fim, y6, x_bco_fim, y6 + altura_linha)
 
-    c.drawString(
-        x + pad,
-        y6 + (altura_linha / 2) - 3,
-        f"CPF: {cpf}"
-    )
-    c.drawString(
-        x_cpf_fim + pad,
-        y6 + (altura_linha / 2) - 3,
-        f"BCO: {banco}"
-    )
-    c.drawString(
-        x_bco_fim + pad,
-        y6 + (altura_linha / 2) - 3,
-        f"AG: {agencia} CONTA: {conta}"
-    )
+    if conteudo:
+        c.drawString(
+            x + pad,
+            y6 + (altura_linha / 2) - 3,
+            f"CPF: {cpf}"
+        )
+        c.drawString(
+            x_cpf_fim + pad,
+            y6 + (altura_linha / 2) - 3,
+            f"BCO: {banco}"
+        )
+        c.drawString(
+            x_bco_fim + pad,
+            y6 + (altura_linha / 2) - 3,
+            f"AG: {agencia} CONTA: {conta}"
+        )
     y_atual = y6
 
     # ------------------------------------------------------------
     # 7ª LINHA – TIPO DE CONTA
     # ------------------------------------------------------------
     y7 = y_atual - altura_linha
-    c.rect(x, y7, largura_tabela, altura_linha, fill=0)
-
-    c.drawString(
-        x + pad,
-        y7 + (altura_linha / 2) - 3,
-        f"TIPO DE CONTA: {tipo_conta}"
-    )
+    if estrutura:
+        c.rect(x, y7, largura_tabela, altura_linha, fill=0)
+
+    if conteudo:
+        c.drawString(
+            x + pad,
+            y7 + (altura_linha / 2) - 3,
+            f"TIPO DE CONTA: {tipo_conta}"
+        )
 
     # ------------------------------------------------------------
     # Espaço entre a primeira tabela e a segunda tabela
@@ -259,34 +278,11 @@ def desenhar_tabela(
 
     # cabeçalho só até SAÍDA TARDE (NÃO pega a última coluna)
     y_header = y_atual - altura_cabecalho_dias
-    c.rect(x0, y_header, x5 - x0, altura_cabecalho_dias, fill=0)
-
-    for xv in (x1, x2, x3, x4, x5):
-        c.line(xv, y_header, xv, y_header + altura_cabecalho_dias)
-
-    c.setFont(bookman_font.FONT_BOLD, 9)
-
-    def wrap_text(texto, max_width, font_name, font_size):
-        """Quebra o texto para caber na largura disponível."""
-        palavras = texto.split()
-        linhas = []
-        atual = ""
-        for palavra in palavras:
-            candidato = palavra if not atual else f"{atual} {palavra}"
-            if c.stringWidth(candidato, font_name, font_size) <= max_width:
-                atual = candidato
-            else:
-                if atual:
-                    linhas.append(atual)
-                atual = palavra
-        if atual:
-            linhas.append(atual)
-        return linhas or [""]
 
     def draw_wrapped_centered(texto, x_centro, y_row, largura_coluna, font_name, font_size):
         max_width = max(largura_coluna - (pad * 2), 1)
-        linhas = wrap_text(texto, max_width, font_name, font_size)
         line_height = font_size + 2
+        linhas, _ = layout_paragraph(texto, font_name, font_size, max_width, leading=line_height)
         base_centro = y_row + (altura_linha_dia / 2) - 3
         start_y = base_centro + ((len(linhas) - 1) * line_height) / 2
         for idx, linha in enumerate(linhas):
@@ -294,55 +290,66 @@ def desenhar_tabela(
             c.setFont(font_name, font_size)
             c.drawCentredString(x_centro, y_texto, linha)
 
-    c.drawCentredString((x0 + x1) / 2,
-                        y_header + (altura_cabecalho_dias / 2) - 3,
-                        "DIA")
-    c.drawCentredString((x1 + x2) / 2,
-                        y_header + (altura_cabecalho_dias / 2) - 3,
-                        "HE")
-    c.drawCentredString((x2 + x3) / 2,
-                        y_header + (altura_cabecalho_dias / 2) - 3,
-                        "ENTRADA MANHA")
-    c.drawCentredString((x3 + x4) / 2,
-                        y_header + (altura_cabecalho_dias / 2) - 3,
-                        "HS")
-    c.drawCentredString((x4 + x5) / 2,
-                        y_header + (altura_cabecalho_dias / 2) - 3,
-                        "SAÍDA TARDE")
-    # última coluna SEM cabeçalho
+    if estrutura:
+        c.rect(x0, y_header, x5 - x0, altura_cabecalho_dias, fill=0)
+
+        for xv in (x1, x2, x3, x4, x5):
+            c.line(xv, y_header, xv, y_header + altura_cabecalho_dias)
+
+        c.setFont(bookman_font.FONT_BOLD, 9)
+        c.drawCentredString((x0 + x1) / 2,
+                            y_header + (altura_cabecalho_dias / 2) - 3,
+                            "DIA")
+        c.drawCentredString((x1 + x2) / 2,
+                            y_header + (altura_cabecalho_dias / 2) - 3,
+                            "HE")
+        c.drawCentredString((x2 + x3) / 2,
+                            y_header + (altura_cabecalho_dias / 2) - 3,
+                            "ENTRADA MANHA")
+        c.drawCentredString((x3 + x4) / 2,
+                            y_header + (altura_cabecalho_dias / 2) - 3,
+                            "HS")
+        c.drawCentredString((x4 + x5) / 2,
+                            y_header + (altura_cabecalho_dias / 2) - 3,
+                            "SAÍDA TARDE")
+        # última coluna SEM cabeçalho
 
     y_atual = y_header
 
     # ============================================================
     # LINHAS DOS DIAS (última coluna SEM linhas internas)
     # ============================================================
-    dias_no_mes = calendar.monthrange(ano, mes)[1]
+    dias_no_mes, dias_semana = indice_mes(ano, mes) if conteudo else (0, ())
     total_linhas = 31
     altura_linha_dia = 5 * mm
 
-    c.setFont(bookman_font.FONT_BOLD, 9)
-
     # topo da tabela de dias fica logo abaixo do cabeçalho
     y_top_tabela = y_header
     y_ultima_linha = y_top_tabela
 
     for dia in range(1, total_linhas + 1):
-        # reset fonte padrÇœo da linha para evitar heranÓas do feriado anterior
-        c.setFont(bookman_font.FONT_BOLD, 9)
         y_row = y_ultima_linha - altura_linha_dia
 
-        # retângulo DA LINHA até SAÍDA TARDE (não entra na última coluna)
-        c.rect(x0, y_row, x5 - x0, altura_linha_dia, fill=0)
+        if estrutura:
+            # retângulo DA LINHA até SAÍDA TARDE (não entra na última coluna)
+            c.rect(x0, y_row, x5 - x0, altura_linha_dia, fill=0)
 
-        # divisões internas até SAÍDA TARDE
-        for xv in (x1, x2, x3, x4, x5):
-            c.line(xv, y_row, xv, y_row + altura_linha_dia)
+            # divisões internas até SAÍDA TARDE
+            for xv in (x1, x2, x3, x4, x5):
+                c.line(xv, y_row, xv, y_row + altura_linha_dia)
+
+        if not conteudo:
+            y_ultima_linha = y_row
+            continue
+
+        # reset fonte padrÇœo da linha para evitar heranÓas do feriado anterior
+        c.setFont(bookman_font.FONT_BOLD, 9)
 
         # DIA centralizado + marcação de fins de semana, feriados e horários
         placeholder_invalido = False
         if dia <= dias_no_mes:
             dia_str = f"{dia:02d}"
-            dow = calendar.weekday(ano, mes, dia)
+            dow = dias_semana[dia - 1]
             feriado_desc = feriados.get(dia)
             entrada_texto = ""
             saida_texto = ""
@@ -445,94 +452,106 @@ def desenhar_tabela(
     # coluna extra deve fechar até a linha superior do cabeçalho
     y_top_coluna_extra = y_header + altura_cabecalho_dias
     altura_coluna_extra = y_top_coluna_extra - y_ultima_linha
-    c.rect(x5, y_ultima_linha, largura_col_extra, altura_coluna_extra, fill=0)
-
-    # Texto a ser repetido com espaço entre blocos
-    bloco_texto = [
-        "HORARIO",
-        "CORRIDO",
-        "DE",
-        "ACORDO",
-        "COM",
-        "O DEC.",
-        "N° 11619",
-        "DE 7:30",
-        "HE AS",
-        "13:30 HS",
-    ]
-
-    c.setFont(bookman_font.FONT_BOLD, 7)
-
-    line_h = 9  # altura aproximada da linha em pontos
-    linhas_por_bloco = len(bloco_texto) + 1  # +1 linha em branco
-    altura_bloco = linhas_por_bloco * line_h
-
-    # quantos blocos cabem na coluna
-    num_blocos = max(1, int(altura_coluna_extra // altura_bloco))
-
-    x_centro = x5 + largura_col_extra / 2
-    y_texto = y_top_tabela - line_h  # começa um pouco abaixo do topo
-
-    for _ in range(num_blocos):
-        for linha in bloco_texto:
+    if estrutura:
+        c.rect(x5, y_ultima_linha, largura_col_extra, altura_coluna_extra, fill=0)
+
+        # Texto a ser repetido com espaço entre blocos
+        bloco_texto = [
+            "HORARIO",
+            "CORRIDO",
+            "DE",
+            "ACORDO",
+            "COM",
+            "O DEC.",
+            "N° 11619",
+            "DE 7:30",
+            "HE AS",
+            "13:30 HS",
+        ]
+
+        c.setFont(bookman_font.FONT_BOLD, 7)
+
+        line_h = 9  # altura aproximada da linha em pontos
+        linhas_por_bloco = len(bloco_texto) + 1  # +1 linha em branco
+        altura_bloco = linhas_por_bloco * line_h
+
+        # quantos blocos cabem na coluna
+        num_blocos = max(1, int(altura_coluna_extra // altura_bloco))
+
+        x_centro = x5 + largura_col_extra / 2
+        y_texto = y_top_tabela - line_h  # começa um pouco abaixo do topo
+
+        for _ in range(num_blocos):
+            for linha in bloco_texto:
+                if y_texto < y_ultima_linha + line_h:
+                    break
+                c.drawCentredString(x_centro, y_texto, linha)
+                y_texto -= line_h
+            # linha em branco entre um bloco e outro
+            y_texto -= line_h
             if y_texto < y_ultima_linha + line_h:
                 break
-            c.drawCentredString(x_centro, y_texto, linha)
-            y_texto -= line_h
-        # linha em branco entre um bloco e outro
-        y_texto -= line_h
-        if y_texto < y_ultima_linha + line_h:
-            break
 
     # ------------------------------------------------------------
     # RODAPÉ COM ENDEREÇO / CONTATOS / ASSINATURAS
     # ------------------------------------------------------------
     altura_footer = 5 * mm
-
-    # linha 1: endereço (largura total)
     y_footer1 = y_ultima_linha - altura_footer
-    c.rect(x, y_footer1, largura_tabela, altura_footer, fill=0)
-    c.drawString(
-        x + pad,
-        y_footer1 + (altura_footer / 2) - 3,
-        f"ENDEREÇO: {endereco}"
-    )
-
-    # linha 2: CEP | TELEFONE | DATA
     y_footer2 = y_footer1 - altura_footer
-    c.rect(x, y_footer2, largura_tabela, altura_footer, fill=0)
+    y_footer3 = y_footer2 - altura_footer
     col1 = largura_tabela * 0.35
     col2 = largura_tabela * 0.30
     x_col1 = x + col1
     x_col2 = x_col1 + col2
-    c.line(x_col1, y_footer2, x_col1, y_footer2 + altura_footer)
-    c.line(x_col2, y_footer2, x_col2, y_footer2 + altura_footer)
-    c.drawString(x + pad, y_footer2 + (altura_footer / 2) - 3, f"CEP: {cep}")
-    c.drawString(x_col1 + pad, y_footer2 + (altura_footer / 2) - 3, f"TELEFONE: {telefone}")
-    c.drawString(x_col2 + pad, y_footer2 + (altura_footer / 2) - 3, f"DATA: {data_preenchimento}")
-
-    # linha 3: assinaturas
-    y_footer3 = y_footer2 - altura_footer
-    c.rect(x, y_footer3, largura_tabela, altura_footer, fill=0)
     x_meio = x + (largura_tabela / 2)
-    c.line(x_meio, y_footer3, x_meio, y_footer3 + altura_footer)
-    c.drawCentredString(
-        x + (largura_tabela / 4),
-        y_footer3 + (altura_footer / 2) - 3,
-        "ASSINATURA DO REEDUCANDO"
-    )
-    c.drawCentredString(
-        x + (3 * largura_tabela / 4),
-        y_footer3 + (altura_footer / 2) - 3,
-        "VISTO DO CHEFE"
-    )
+
+    if estrutura:
+        # linha 1: endereço (largura total)
+        c.rect(x, y_footer1, largura_tabela, altura_footer, fill=0)
+
+        # linha 2: CEP | TELEFONE | DATA
+        c.rect(x, y_footer2, largura_tabela, altura_footer, fill=0)
+        c.line(x_col1, y_footer2, x_col1, y_footer2 + altura_footer)
+        c.line(x_col2, y_footer2, x_col2, y_footer2 + altura_footer)
+
+        # linha 3: assinaturas
+        c.rect(x, y_footer3, largura_tabela, altura_footer, fill=0)
+        c.line(x_meio, y_footer3, x_meio, y_footer3 + altura_footer)
+        c.drawCentredString(
+            x + (largura_tabela / 4),
+            y_footer3 + (altura_footer / 2) - 3,
+            "ASSINATURA DO REEDUCANDO"
+        )
+        c.drawCentredString(
+            x + (3 * largura_tabela / 4),
+            y_footer3 + (altura_footer / 2) - 3,
+            "VISTO DO CHEFE"
+        )
+
+    if conteudo:
+        # mesma fonte do texto da coluna extra, que fica ativa até o rodapé
+        c.setFont(bookman_font.FONT_BOLD, 7)
+        c.drawString(
+            x + pad,
+            y_footer1 + (altura_footer / 2) - 3,
+            f"ENDEREÇO: {endereco}"
+        )
+        c.drawString(x + pad, y_footer2 + (altura_footer / 2) - 3, f"CEP: {cep}")
+        c.drawString(x_col1 + pad, y_footer2 + (altura_footer / 2) - 3, f"TELEFONE: {telefone}")
+        c.drawString(x_col2 + pad, y_footer2 + (altura_footer / 2) - 3, f"DATA: {data_preenchimento}")
 
     # linha extra para o campo de assinatura de ambos
     altura_campo_assinatura = 8 * mm
     y_footer4 = y_footer3 - altura_campo_assinatura
-    c.rect(x, y_footer4, largura_tabela, altura_campo_assinatura, fill=0)
-    c.line(x_meio, y_footer4, x_meio, y_footer4 + altura_campo_assinatura)
+    if estrutura:
+        c.rect(x, y_footer4, largura_tabela, altura_campo_assinatura, fill=0)
+        c.line(x_meio, y_footer4, x_meio, y_footer4 + altura_campo_assinatura)
 
     y_ultima_linha = y_footer4
 
     return y_ultima_linha
+
+
+def desenhar_estrutura_tabela(c, y_top=None):
+    """Só as partes fixas da folha de ponto (grade, títulos e rótulos)."""
+    return desenhar_tabela(c, ano=None, mes=None, y_top=y_top, conteudo=False)
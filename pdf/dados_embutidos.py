@@ -0,0 +1,122 @@
+"""
+Dados de entrada embutidos nos PDFs gerados.
+
+Cada gerador anexa ao PDF (arquivo incorporado ``dados.json``, em
+``/EmbeddedFiles``) o dict exato que recebeu, com o tipo do documento e a
+versão do esquema. Ao reimportar um PDF nosso, ``ler_dados_embutidos`` devolve
+esse dict sem extrair texto nem aplicar as regexes de ``services.parsers``.
+
+Incremente ``VERSAO_SCHEMA`` quando o formato de ``dados`` de algum tipo
+mudar de forma incompatível; versões mais novas que a do código são
+ignoradas (o arquivo cai na extração de texto).
+"""
+
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from io import BytesIO
+from pathlib import Path
+
+from reportlab.pdfbase.pdfdoc import PDFArray, PDFDictionary, PDFName, PDFStream, PDFString, PDFZCompress
+
+
+VERSAO_SCHEMA = 1
+NOME_ANEXO = "dados.json"
+# marcador que todo PDF com arquivos incorporados tem em texto puro
+_MARCADOR = b"/EmbeddedFiles"
+
+
+def _para_json(valor):
+    if isinstance(valor, (datetime, date, time)):
+        return valor.isoformat()
+    if isinstance(valor, (Decimal, Path)):
+        return str(valor)
+    if isinstance(valor, (set, frozenset)):
+        return sorted(valor, key=str)
+    raise TypeError(f"valor não serializável: {type(valor).__name__}")
+
+
+def payload_json(tipo: str, dados: dict) -> bytes:
+    """JSON estável (chaves ordenadas) com tipo, versão do esquema e dados."""
+    payload = {"schema": VERSAO_SCHEMA, "tipo": tipo, "dados": dados}
+    return json.dumps(payload, ensure_ascii=False, sort_keys=True, default=_para_json).encode("utf-8")
+
+
+def embutir_dados(c, tipo: str, dados: dict) -> None:
+    """Anexa ``dados`` ao documento do canvas ``c`` (chamar antes de ``save``)."""
+    doc = c._doc
+    arquivo = PDFStream(
+        dictionary=PDFDictionary({"Type": PDFName("EmbeddedFile"), "Subtype": PDFName("application#2Fjson")}),
+        content=payload_json(tipo, dados),
+        filters=[PDFZCompress],
+    )
+    especificacao = PDFDictionary(
+        {
+            "Type": PDFName("Filespec"),
+            "F": PDFString(NOME_ANEXO),
+            "UF": PDFString(NOME_ANEXO),
+            "Desc": PDFString(f"Dados de entrada ({tipo})"),
+            "EF": PDFDictionary({"F": doc.Reference(arquivo)}),
+        }
+    )
+    doc.Catalog.Names = PDFDictionary(
+        {
+            "EmbeddedFiles": PDFDictionary(
+                {"Names": PDFArray([PDFString(NOME_ANEXO), doc.Reference(especificacao)])}
+            )
+        }
+    )
+
+
+def _anexo_fitz(dados_pdf: bytes):
+    try:
+        import pymupdf as fitz
+    except ImportError:
+        import fitz
+    with fitz.open(stream=dados_pdf, filetype="pdf") as doc:
+        if NOME_ANEXO not in doc.embfile_names():
+            return None
+        return doc.embfile_get(NOME_ANEXO)
+
+
+def _anexo_pypdf2(dados_pdf: bytes):
+    from PyPDF2 import PdfReader
+
+    nomes = PdfReader(BytesIO(dados_pdf)).trailer["/Root"]
+    for chave in ("/Names", "/EmbeddedFiles", "/Names"):
+        if chave not in nomes:
+            return None
+        nomes = nomes[chave]  # o [] do PyPDF2 já resolve referências indiretas
+    # pares [nome, especificação] (só a árvore plana que ``embutir_dados`` escreve)
+    for nome, especificacao in zip(nomes[::2], nomes[1::2]):
+        if nome == NOME_ANEXO:
+            return especificacao.get_object()["/EF"]["/F"].get_object().get_data()
+    return None
+
+
+def ler_dados_embutidos(dados_pdf: bytes):
+    """
+    ``{"schema", "tipo", "dados"}`` embutido por ``embutir_dados`` ou None
+    (PDF de terceiros, anexo ilegível ou esquema mais novo que o código).
+    """
+    if _MARCADOR not in dados_pdf:
+        return None
+    for leitor in (_anexo_fitz, _anexo_pypdf2):
+        try:
+            bruto = leitor(dados_pdf)
+        except ImportError:
+            continue
+        except Exception:
+            return None
+        if bruto is None:
+            return None
+        try:
+            payload = json.loads(bruto)
+        except ValueError:
+            return None
+        if not isinstance(payload, dict) or not isinstance(payload.get("dados"), dict):
+            return None
+        if not isinstance(payload.get("schema"), int) or payload["schema"] > VERSAO_SCHEMA:
+            return None
+        return payload
+    return None
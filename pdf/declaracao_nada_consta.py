@@ -0,0 +1,111 @@
+"""PDF da declaração de nada consta."""
+
+from io import BytesIO
+from pathlib import Path
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from reportlab.pdfgen import canvas
+
+from pdf.dados_embutidos import embutir_dados
+from pdf.imagens import desenhar_imagem, obter_imagem
+from pdf.layout import quebrar_linhas
+from services.cache_documentos import em_cache
+from services.instrumentacao import medido
+
+
+@medido("declaracao_nada_consta")
+@em_cache()
+def build_pdf_declaracao_nada_consta(data: dict, logo_path: Path) -> bytes:
+    buffer = BytesIO()
+    page_width, page_height = A4
+    c = canvas.Canvas(buffer, pagesize=A4)
+
+    margin = 20 * mm
+    y = page_height - margin
+
+    logo = obter_imagem(logo_path)
+    if logo is not None:
+        img_w, img_h = logo["largura"], logo["altura"]
+        max_w = page_width - 2 * margin
+        max_h = 25 * mm
+        scale = min(max_w / img_w, max_h / img_h)
+        draw_w = img_w * scale
+        draw_h = img_h * scale
+        img_x = (page_width - draw_w) / 2
+        y -= draw_h
+        desenhar_imagem(c, logo, img_x, y, width=draw_w, height=draw_h, mask="auto")
+        y -= 10 * mm
+    else:
+        y -= 10 * mm
+
+    c.setFont("Helvetica-Bold", 14)
+    c.drawCentredString(page_width / 2, y, "DECLARAÇÃO")
+    y -= 12 * mm
+
+    c.setFont("Helvetica", 11)
+    for linha in [
+        data.get("destinatario", ""),
+        "Requerente",
+        data.get("nome_caps", ""),
+        data.get("vocativo", ""),
+    ]:
+        if linha:
+            c.drawString(margin, y, linha)
+            y -= 6 * mm
+
+    corpo = data.get("corpo", "")
+    if corpo:
+        y -= 2 * mm
+        for linha in quebrar_linhas(corpo, "Helvetica", 11, page_width - 2 * margin, preservar_quebras=True):
+            c.drawString(margin, y, linha)
+            y -= 5 * mm
+
+    y -= 6 * mm
+    c.drawString(margin, y, "Atenciosamente,")
+    y -= 14 * mm
+
+    servidor_nome = data.get("servidor_nome") or data.get("nome_caps", "")
+    servidor_cargo = data.get("servidor_cargo", "")
+    servidor_matricula = data.get("servidor_matricula", "")
+    incluir_assinatura_requerente = data.get("incluir_assinatura_requerente", True)
+    requerente_nome = data.get("nome_caps", "").strip()
+    requerente_cpf = data.get("cpf", "").strip()
+    requerente_rg = data.get("rg", "").strip()
+
+    if servidor_nome:
+        c.setFont("Helvetica", 11)
+        c.drawCentredString(page_width / 2, y, servidor_nome)
+        y -= 6 * mm
+    if servidor_cargo:
+        c.setFont("Helvetica", 10)
+        c.drawCentredString(page_width / 2, y, f"Cargo: {servidor_cargo}")
+        y -= 5 * mm
+    if servidor_matricula:
+        c.setFont("Helvetica", 10)
+        c.drawCentredString(page_width / 2, y, f"Matrícula: {servidor_matricula}")
+        y -= 5 * mm
+
+    if incluir_assinatura_requerente and (requerente_nome or requerente_cpf or requerente_rg):
+        y -= 10 * mm
+        if requerente_nome:
+            c.setFont("Helvetica", 11)
+            c.drawCentredString(page_width / 2, y, requerente_nome)
+            y -= 6 * mm
+        docs_requerente = []
+        if requerente_cpf:
+            docs_requerente.append(f"CPF: {requerente_cpf}")
+        if requerente_rg:
+            docs_requerente.append(f"RG: {requerente_rg}")
+        if docs_requerente:
+            c.setFont("Helvetica", 10)
+            c.drawCentredString(page_width / 2, y, " | ".join(docs_requerente))
+            y -= 5 * mm
+        c.setFont("Helvetica", 10)
+        c.drawCentredString(page_width / 2, y, "Assinatura do requerente")
+
+    c.showPage()
+    embutir_dados(c, "declaracao_nada_consta", data)
+    c.save()
+    buffer.seek(0)
+    return buffer.read()
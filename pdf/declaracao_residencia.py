@@ -0,0 +1,93 @@
+"""PDF da declaração de residência."""
+
+from io import BytesIO
+from pathlib import Path
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from reportlab.pdfgen import canvas
+
+from pdf.dados_embutidos import embutir_dados
+from pdf.imagens import desenhar_imagem, obter_imagem
+from pdf.layout import quebrar_linhas
+from services.cache_documentos import em_cache
+from services.instrumentacao import medido
+
+
+def _draw_restituicao_header(
+    c: canvas.Canvas, page_width: float, page_height: float, logo_path: Path
+) -> float:
+    margin = 15 * mm
+    rect_h = 30 * mm
+    rect_w = page_width - 2 * margin
+    rect_x = margin
+    rect_y = page_height - margin - rect_h
+
+    logo = obter_imagem(logo_path)
+    if logo is not None:
+        img_w, img_h = logo["largura"], logo["altura"]
+        max_w = rect_w * 0.8
+        max_h = 32 * mm
+        scale = min(max_w / img_w, max_h / img_h)
+        draw_w = img_w * scale
+        draw_h = img_h * scale
+        img_x = rect_x + (rect_w - draw_w) / 2
+        img_y = rect_y + (rect_h - draw_h) / 2 - 2 * mm
+        desenhar_imagem(c, logo, img_x, img_y, width=draw_w, height=draw_h, mask="auto")
+
+    return rect_y
+
+
+@medido("declaracao_residencia")
+@em_cache()
+def build_pdf_declaracao_residencia(data: dict, logo_path: Path) -> bytes:
+    buffer = BytesIO()
+    page_width, page_height = A4
+    c = canvas.Canvas(buffer, pagesize=A4)
+
+    title_y = _draw_restituicao_header(c, page_width, page_height, logo_path)
+
+    margin = 20 * mm
+    y = title_y - 12 * mm
+    c.setFont("Helvetica-Bold", 12)
+    c.drawCentredString(page_width / 2, y, "DECLARAÇÃO DE RESIDÊNCIA")
+    y -= 14 * mm
+
+    nome = data.get("nome_declarante", "").strip() or "____________________________"
+    logradouro = data.get("logradouro", "").strip() or "____________________________"
+    municipio = data.get("municipio", "").strip() or "____________________________"
+    complemento = data.get("complemento", "").strip()
+    observacoes = data.get("observacoes", "").strip()
+
+    endereco = f"{logradouro}, município de {municipio}"
+    if complemento:
+        endereco = f"{endereco}, complemento: {complemento}"
+
+    texto = (
+        f"Eu, {nome}, declaro para os devidos fins que resido no endereço {endereco}. "
+        "Firmo a presente declaração para os efeitos legais cabíveis."
+    )
+    if observacoes:
+        texto = f"{texto} Observações: {observacoes}."
+
+    c.setFont("Helvetica", 11)
+    for linha in quebrar_linhas(texto, "Helvetica", 11, page_width - 2 * margin, preservar_quebras=True):
+        c.drawString(margin, y, linha)
+        y -= 6 * mm
+
+    y -= 6 * mm
+    c.drawRightString(page_width - margin, y, data.get("data", ""))
+
+    sig_y = 35 * mm
+    sig_w = 75 * mm
+    sig_x = (page_width - sig_w) / 2
+    c.line(sig_x, sig_y, sig_x + sig_w, sig_y)
+    c.setFont("Helvetica", 10)
+    c.drawCentredString(sig_x + sig_w / 2, sig_y - 5 * mm, nome)
+    c.drawCentredString(sig_x + sig_w / 2, sig_y - 10 * mm, "Assinatura do declarante")
+
+    c.showPage()
+    embutir_dados(c, "declaracao_residencia", data)
+    c.save()
+    buffer.seek(0)
+    return buffer.read()
@@ -0,0 +1,366 @@
+"""PDF das etiquetas de caixa de arquivo."""
+
+from datetime import date
+from io import BytesIO
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from reportlab.pdfgen import canvas
+
+from pdf.dados_embutidos import embutir_dados
+from pdf.layout import ajustar_tamanho_fonte, quebrar_linhas
+from services.cache_documentos import em_cache
+from services.instrumentacao import medido
+from services.renderizacao import informar_progresso
+
+
+LABEL_WIDTH_MM = 115
+MONTH_HEADER_HEIGHT_MM = 14
+ROW_HEIGHTS_MM = [MONTH_HEADER_HEIGHT_MM, MONTH_HEADER_HEIGHT_MM, MONTH_HEADER_HEIGHT_MM]
+MONTH_SEPARATOR_HEIGHT_MM = MONTH_HEADER_HEIGHT_MM / 2
+MONTH_BODY_MIN_HEIGHT_MM = 0
+MONTH_BODY_TOP_PADDING_MM = 5
+MONTH_BODY_BOTTOM_PADDING_MM = 2
+PAGE_MARGIN_MM = 15
+LABEL_GAP_MM = 8
+TEXT_FONT = "Helvetica-Bold"
+TEXT_SIZE = 12
+MIN_TEXT_SIZE = 6
+INNER_LINE_WIDTH = 0.8
+BORDER_LINE_WIDTH = 1.6
+CURRENT_YEAR = date.today().year
+
+
+def _normalize_text(text: str) -> str:
+    normalized = " ".join((text or "").strip().split())
+    return normalized
+
+
+def _fit_single_line_text(text: str, max_width: float, font_name: str, base_size: int, min_size: int):
+    normalized = _normalize_text(text)
+    return ajustar_tamanho_fonte(normalized, font_name, base_size, min_size, max_width, passo=1), normalized
+
+
+def _draw_double_line(
+    c: canvas.Canvas,
+    x1: float,
+    y1: float,
+    x2: float,
+    y2: float,
+    line_width: float = INNER_LINE_WIDTH,
+):
+    c.setLineWidth(line_width)
+    c.line(x1, y1, x2, y2)
+
+
+def _draw_inner_horizontal_line(c: canvas.Canvas, x: float, y: float, width: float):
+    _draw_double_line(c, x, y, x + width, y)
+
+
+def _draw_outer_horizontal_line(c: canvas.Canvas, x: float, y: float, width: float):
+    _draw_double_line(c, x, y, x + width, y, BORDER_LINE_WIDTH)
+
+
+def _draw_vertical_borders(c: canvas.Canvas, x: float, y_top: float, y_bottom: float, width: float):
+    _draw_double_line(c, x, y_top, x, y_bottom, BORDER_LINE_WIDTH)
+    _draw_double_line(c, x + width, y_top, x + width, y_bottom, BORDER_LINE_WIDTH)
+
+
+def _draw_row(c: canvas.Canvas, label: str, value: str, x: float, y_top: float, width: float, height: float):
+    padding_x = 5 * mm
+
+    full_text = f"{label} {(value or '').upper()}".strip()
+    text_width = width - (2 * padding_x)
+    font_size, line = _fit_single_line_text(full_text, text_width, TEXT_FONT, TEXT_SIZE, MIN_TEXT_SIZE)
+    text_y = y_top - (height / 2) - (font_size / 3)
+
+    c.setFont(TEXT_FONT, font_size)
+    c.drawString(x + padding_x, text_y, line)
+
+
+def _draw_centered_row(c: canvas.Canvas, text: str, x: float, y_top: float, width: float, height: float):
+    padding_x = 5 * mm
+    text = (text or "").upper()
+    text_width = width - (2 * padding_x)
+    font_size, line = _fit_single_line_text(text, text_width, TEXT_FONT, TEXT_SIZE, MIN_TEXT_SIZE)
+    text_y = y_top - (height / 2) - (font_size / 3)
+
+    c.setFont(TEXT_FONT, font_size)
+    c.drawCentredString(x + width / 2, text_y, line)
+
+
+def _split_text_lines(text: str, max_width: float | None = None) -> list[str]:
+    lines = []
+    for raw_line in (text or "").splitlines():
+        line = raw_line.strip()
+        if line:
+            if max_width:
+                lines.extend(quebrar_linhas(line, TEXT_FONT, TEXT_SIZE, max_width))
+            else:
+                lines.append(line)
+    return lines
+
+
+def _month_body_height(line_count: int):
+    return (
+        (MONTH_BODY_TOP_PADDING_MM * mm)
+        + (max(1, line_count) * TEXT_SIZE * 1.45)
+        + (MONTH_BODY_BOTTOM_PADDING_MM * mm)
+    )
+
+
+def _max_month_lines_for_height(body_height: float):
+    usable_height = body_height - (MONTH_BODY_TOP_PADDING_MM * mm) - (MONTH_BODY_BOTTOM_PADDING_MM * mm)
+    return max(1, int(usable_height // (TEXT_SIZE * 1.45)))
+
+
+def _draw_month_section(
+    c: canvas.Canvas,
+    *,
+    month: str,
+    year: int,
+    lines: list[str],
+    x: float,
+    y_top: float,
+    width: float,
+    header_height: float,
+    body_height: float,
+    separator_height: float,
+):
+    padding_x = 5 * mm
+    inner_x = x
+    inner_width = width
+    header_y = y_top - (header_height / 2) - (TEXT_SIZE / 3)
+    body_top = y_top - header_height
+    body_bottom = body_top - body_height
+    separator_bottom = body_bottom - separator_height
+
+    c.setFont(TEXT_FONT, TEXT_SIZE)
+    c.drawString(x + padding_x, header_y, f"MÊS/ANO: {month.upper()}/{year}")
+    _draw_inner_horizontal_line(c, x, body_top, width)
+
+    line_height = TEXT_SIZE * 1.45
+    cursor_y = body_top - (MONTH_BODY_TOP_PADDING_MM * mm)
+    for line in lines:
+        if cursor_y < body_bottom + (MONTH_BODY_BOTTOM_PADDING_MM * mm):
+            break
+        c.drawString(x + padding_x, cursor_y, line)
+        cursor_y -= line_height
+
+    c.rect(inner_x, separator_bottom, inner_width, separator_height, stroke=1, fill=0)
+    c.setFillColorRGB(127 / 255, 127 / 255, 127 / 255)
+    c.rect(
+        inner_x + 0.4,
+        separator_bottom + 0.4,
+        inner_width - 0.8,
+        separator_height - 0.8,
+        stroke=0,
+        fill=1,
+    )
+    c.setFillColorRGB(0, 0, 0)
+    return separator_bottom
+
+
+def _draw_fixed_header(
+    c: canvas.Canvas,
+    *,
+    supervisao_regional: str,
+    unidade: str,
+    caixa: str,
+    x: float,
+    y_top: float,
+    width: float,
+    row_heights: list[float],
+):
+    c.setFillColorRGB(0, 0, 0)
+    _draw_outer_horizontal_line(c, x, y_top, width)
+
+    rows = [
+        ("SUPERVISÃO REGIONAL:", supervisao_regional),
+        ("UNIDADE:", unidade),
+    ]
+
+    cursor_top = y_top
+    for index, (label, value) in enumerate(rows):
+        row_height = row_heights[index]
+        _draw_row(c, label, value, x, cursor_top, width, row_height)
+        cursor_top -= row_height
+        _draw_inner_horizontal_line(c, x, cursor_top, width)
+
+    _draw_centered_row(c, f"CAIXA Nº: {caixa}", x, cursor_top, width, row_heights[2])
+    cursor_top -= row_heights[2]
+    _draw_inner_horizontal_line(c, x, cursor_top, width)
+    return cursor_top
+
+
+@medido("etiqueta_arquivo")
+@em_cache()
+def build_pdf_etiqueta_arquivo(
+    *,
+    supervisao_regional: str,
+    unidade: str,
+    caixa: str,
+    month_sections: list[dict] | None = None,
+    label_cards: list[dict] | None = None,
+) -> bytes:
+    buffer = BytesIO()
+    page_width, page_height = A4
+    c = canvas.Canvas(buffer, pagesize=A4)
+
+    label_width = LABEL_WIDTH_MM * mm
+    row_heights = [value * mm for value in ROW_HEIGHTS_MM]
+    month_sections = month_sections or []
+    month_header_height = MONTH_HEADER_HEIGHT_MM * mm
+    month_separator_height = MONTH_SEPARATOR_HEIGHT_MM * mm
+    month_body_min_height = MONTH_BODY_MIN_HEIGHT_MM * mm
+
+    x = (page_width - label_width) / 2
+    page_margin = PAGE_MARGIN_MM * mm
+    page_top = page_height - page_margin
+    page_bottom = page_margin
+    label_gap = LABEL_GAP_MM * mm
+    cursor_top = page_top
+
+    cards = label_cards or [
+        {
+            "supervisao_regional": supervisao_regional,
+            "unidade": unidade,
+            "caixa": caixa,
+            "month_sections": month_sections or [],
+        }
+    ]
+
+    def build_month_layouts(sections: list[dict]):
+        layouts = []
+        text_width = label_width - (2 * 5 * mm)
+        for section in sections:
+            lines = _split_text_lines(section.get("text", ""), text_width) or [""]
+            body_height = max(
+                month_body_min_height,
+                _month_body_height(len(lines)),
+            )
+            layouts.append((section, lines, body_height))
+        return layouts
+
+    def finish_card(y_start: float, y_bottom: float):
+        _draw_vertical_borders(c, x, y_start, y_bottom, label_width)
+        _draw_outer_horizontal_line(c, x, y_bottom, label_width)
+
+    def draw_header(card: dict, y_top: float):
+        return _draw_fixed_header(
+            c,
+            supervisao_regional=card.get("supervisao_regional", ""),
+            unidade=card.get("unidade", ""),
+            caixa=card.get("caixa", ""),
+            x=x,
+            y_top=y_top,
+            width=label_width,
+            row_heights=row_heights,
+        )
+
+    def start_new_page(card: dict):
+        nonlocal cursor_top
+        c.showPage()
+        cursor_top = page_top
+        card_start_top = cursor_top
+        cursor_top = draw_header(card, card_start_top)
+        return card_start_top
+
+    fresh_page_available = page_top - sum(row_heights) - page_bottom
+
+    for card_index, card in enumerate(cards):
+        informar_progresso(card_index, len(cards), f"etiqueta {card_index + 1} de {len(cards)}")
+        if card_index > 0:
+            cursor_top -= label_gap
+
+        month_layouts = build_month_layouts(card.get("month_sections", []))
+        required_height = sum(row_heights)
+        if month_layouts:
+            _section, _lines, first_body_height = month_layouts[0]
+            first_section_height = month_header_height + first_body_height + month_separator_height
+            if first_section_height <= fresh_page_available:
+                required_height += first_section_height
+            else:
+                required_height += month_header_height + _month_body_height(1) + month_separator_height
+
+        if cursor_top - required_height < page_bottom:
+            c.showPage()
+            cursor_top = page_top
+
+        card_start_top = cursor_top
+        cursor_top = draw_header(card, card_start_top)
+
+        for section, lines, body_height in month_layouts:
+            section_height = month_header_height + body_height + month_separator_height
+            if section_height <= fresh_page_available and cursor_top - section_height < page_bottom:
+                finish_card(card_start_top, cursor_top)
+                card_start_top = start_new_page(card)
+
+            line_index = 0
+            while line_index < len(lines):
+                available_height = cursor_top - page_bottom
+                remaining_lines = len(lines) - line_index
+                remaining_body_height = max(month_body_min_height, _month_body_height(remaining_lines))
+                remaining_section_height = month_header_height + remaining_body_height + month_separator_height
+
+                if remaining_section_height <= available_height:
+                    lines_to_draw = lines[line_index:]
+                    fragment_body_height = remaining_body_height
+                else:
+                    fragment_available_body_height = available_height - month_header_height - month_separator_height
+                    if fragment_available_body_height <= _month_body_height(1):
+                        finish_card(card_start_top, cursor_top)
+                        card_start_top = start_new_page(card)
+                        continue
+                    max_lines = min(
+                        remaining_lines,
+                        _max_month_lines_for_height(fragment_available_body_height),
+                    )
+                    lines_to_draw = lines[line_index:line_index + max_lines]
+                    fragment_body_height = _month_body_height(len(lines_to_draw))
+
+                cursor_top = _draw_month_section(
+                    c,
+                    month=section.get("month", ""),
+                    year=section.get("year", CURRENT_YEAR),
+                    lines=lines_to_draw,
+                    x=x,
+                    y_top=cursor_top,
+                    width=label_width,
+                    header_height=month_header_height,
+                    body_height=fragment_body_height,
+                    separator_height=month_separator_height,
+                )
+                line_index += len(lines_to_draw)
+                if line_index < len(lines):
+                    finish_card(card_start_top, cursor_top)
+                    card_start_top = start_new_page(card)
+
+        finish_card(card_start_top, cursor_top)
+
+    if not cards:
+        cursor_top = draw_header(
+            {
+                "supervisao_regional": supervisao_regional,
+                "unidade": unidade,
+                "caixa": caixa,
+            },
+            cursor_top,
+        )
+        finish_card(page_top, cursor_top)
+
+    c.showPage()
+    embutir_dados(
+        c,
+        "etiqueta_arquivo",
+        {
+            "supervisao_regional": supervisao_regional,
+            "unidade": unidade,
+            "caixa": caixa,
+            "month_sections": month_sections,
+            "label_cards": label_cards,
+        },
+    )
+    c.save()
+    buffer.seek(0)
+    return buffer.read()
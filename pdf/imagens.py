@@ -0,0 +1,188 @@
+"""
+Registro de imagens (logos) compartilhado por todo o processo.
+
+Cada arquivo de ``assets/`` é lido e decodificado uma única vez: os bytes
+originais, o ``ImageReader`` com os pixels já extraídos, o tamanho e o XObject
+de imagem (stream JPEG/zlib pronto) ficam em memória e são reaproveitados por
+todos os PDFs gerados depois.
+"""
+
+import copy
+import threading
+from io import BytesIO
+from pathlib import Path
+
+from reportlab.lib.boxstuff import aspectRatioFix
+from reportlab.lib.utils import ImageReader, _digester
+from reportlab.pdfbase import pdfdoc
+
+
+_IMAGENS = {}
+_XOBJECTS = {}
+_LOCK = threading.Lock()
+_ESTATISTICAS = {"hits": 0, "misses": 0}
+
+
+def _carregar(caminho: Path) -> dict:
+    dados = caminho.read_bytes()
+    leitor = ImageReader(BytesIO(dados))
+    # força a decodificação agora; o ImageReader guarda o resultado em _data/_dataA
+    leitor.getRGBData()
+    largura, altura = leitor.getSize()
+    return {
+        "caminho": caminho,
+        "dados": dados,
+        "leitor": leitor,
+        "largura": largura,
+        "altura": altura,
+        "xobjects": {},
+    }
+
+
+def obter_imagem(caminho):
+    """
+    Devolve a entrada em cache da imagem (decodificando-a na primeira chamada)
+    ou None se o arquivo não existir.
+    """
+    caminho = Path(caminho)
+    try:
+        chave = caminho.resolve()
+    except OSError:
+        return None
+
+    imagem = _IMAGENS.get(chave)
+    if imagem is not None:
+        with _LOCK:
+            _ESTATISTICAS["hits"] += 1
+        return imagem
+
+    if not chave.is_file():
+        return None
+
+    with _LOCK:
+        imagem = _IMAGENS.get(chave)
+        if imagem is None:
+            imagem = _carregar(chave)
+            _IMAGENS[chave] = imagem
+            _ESTATISTICAS["misses"] += 1
+        else:
+            _ESTATISTICAS["hits"] += 1
+    return imagem
+
+
+def _obter_xobject(imagem: dict, mask):
+    """XObject de imagem já montado (e comprimido) para a combinação imagem/mask."""
+    chave = str(mask)
+    xobject = imagem["xobjects"].get(chave)
+    if xobject is not None:
+        return xobject
+
+    with _LOCK:
+        xobject = imagem["xobjects"].get(chave)
+        if xobject is None:
+            leitor = imagem["leitor"]
+            rawdata = leitor.getRGBData()
+            if mask == "auto" and leitor._dataA:
+                mdata = leitor._dataA.getRGBData()
+            else:
+                mdata = str(mask).encode("utf8")
+            nome = _digester(rawdata + mdata)
+            xobject = pdfdoc.PDFImageXObject(nome, leitor, mask=mask)
+            xobject.name = nome
+            imagem["xobjects"][chave] = xobject
+            _XOBJECTS[nome] = xobject
+    return xobject
+
+
+def desenhar_imagem(
+    c,
+    imagem,
+    x,
+    y,
+    width=None,
+    height=None,
+    mask="auto",
+    preserveAspectRatio=False,
+    anchor="c",
+):
+    """
+    Equivalente a ``c.drawImage`` usando o registro de imagens.
+
+    ``imagem`` pode ser um caminho ou uma entrada devolvida por ``obter_imagem``.
+    O XObject em cache é copiado para o documento do canvas, então nada é
+    decodificado nem comprimido de novo. Devolve (largura, altura) desenhadas,
+    ou None se a imagem não existir.
+    """
+    if not isinstance(imagem, dict):
+        imagem = obter_imagem(imagem)
+        if imagem is None:
+            return None
+
+    xobject = _obter_xobject(imagem, mask)
+    c._currentPageHasImages = 1
+    reg_name = _registrar(c, xobject)
+
+    x, y, width, height, _ = aspectRatioFix(
+        preserveAspectRatio, anchor, x, y, width, height, xobject.width, xobject.height
+    )
+    c.saveState()
+    c.translate(x, y)
+    c.scale(width, height)
+    c._code.append("/%s Do" % reg_name)
+    c.restoreState()
+    c._formsinuse.append(xobject.name)
+    return width, height
+
+
+def registrar_xobject(c, nome: str) -> bool:
+    """
+    Registra no documento do canvas um XObject de imagem já preparado, pelo
+    nome interno (usado pelos modelos de página). Devolve False se o nome não
+    pertencer ao registro.
+    """
+    xobject = _XOBJECTS.get(nome)
+    if xobject is None:
+        return False
+    _registrar(c, xobject)
+    return True
+
+
+def _registrar(c, xobject) -> str:
+    """Copia o XObject (e a máscara suave) para o documento, se ainda não estiver lá."""
+    nome = xobject.name
+    doc = c._doc
+    reg_name = doc.getXObjectName(nome)
+    if doc.idToObject.get(reg_name) is None:
+        img_obj = copy.copy(xobject)
+        c._setXObjects(img_obj)
+        doc.Reference(img_obj, reg_name)
+        doc.addForm(nome, img_obj)
+        smask = getattr(xobject, "_smask", None)
+        if smask:
+            del img_obj._smask
+            m_reg_name = doc.getXObjectName(smask.name)
+            if doc.idToObject.get(m_reg_name) is None:
+                m_obj = copy.copy(smask)
+                c._setXObjects(m_obj)
+                img_obj.smask = doc.Reference(m_obj, m_reg_name)
+            else:
+                img_obj.smask = pdfdoc.PDFObjectReference(m_reg_name)
+    return reg_name
+
+
+def estatisticas_imagens() -> dict:
+    """Contadores de acerto/falha do registro e quantidade de imagens em memória."""
+    with _LOCK:
+        return {
+            "hits": _ESTATISTICAS["hits"],
+            "misses": _ESTATISTICAS["misses"],
+            "imagens": len(_IMAGENS),
+        }
+
+
+def limpar_cache_imagens() -> None:
+    with _LOCK:
+        _IMAGENS.clear()
+        _XOBJECTS.clear()
+        _ESTATISTICAS["hits"] = 0
+        _ESTATISTICAS["misses"] = 0
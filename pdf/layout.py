@@ -0,0 +1,161 @@
+"""
+Motor único de diagramação de texto usado por todos os geradores de PDF.
+
+As larguras são medidas uma vez por (texto, fonte, tamanho) e reaproveitadas;
+as linhas são montadas somando a largura das palavras (sem medir de novo a
+linha inteira a cada palavra) e o corte de palavras longas / truncamento usa
+busca binária sobre as larguras acumuladas dos caracteres.
+"""
+
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
+
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+
+ELLIPSIS = "..."
+
+# folga para diferenças de arredondamento entre somar larguras e medir a linha inteira
+_TOLERANCIA = 1e-6
+
+
+@lru_cache(maxsize=16384)
+def largura_texto(texto: str, font_name: str, font_size: float) -> float:
+    """``stringWidth`` memoizado por (texto, fonte, tamanho)."""
+    return stringWidth(texto, font_name, font_size)
+
+
+def _larguras_acumuladas(texto: str, font_name: str, font_size: float) -> list:
+    return [0.0, *accumulate(largura_texto(ch, font_name, font_size) for ch in texto)]
+
+
+def _maior_prefixo(acumuladas: list, inicio: int, max_width: float) -> int:
+    """Maior índice ``fim`` tal que texto[inicio:fim] cabe em ``max_width``."""
+    return bisect_right(acumuladas, acumuladas[inicio] + max_width + _TOLERANCIA) - 1
+
+
+def dividir_palavra(palavra: str, font_name: str, font_size: float, max_width: float) -> list:
+    """Quebra uma palavra maior que a largura em pedaços que cabem (ao menos 1 caractere cada)."""
+    acumuladas = _larguras_acumuladas(palavra, font_name, font_size)
+    partes = []
+    inicio = 0
+    while inicio < len(palavra):
+        fim = max(_maior_prefixo(acumuladas, inicio, max_width), inicio + 1)
+        partes.append(palavra[inicio:fim])
+        inicio = fim
+    return partes
+
+
+def truncar_texto(texto, font_name: str, font_size: float, max_width: float, reticencias: bool = False) -> str:
+    """
+    Corta o final do texto até caber na largura. Com ``reticencias`` o sufixo
+    "..." é sempre acrescentado (e considerado na largura).
+    """
+    texto = str(texto or "")
+    sufixo = ELLIPSIS if reticencias else ""
+
+    if not reticencias and largura_texto(texto, font_name, font_size) <= max_width:
+        return texto
+
+    disponivel = max_width - largura_texto(sufixo, font_name, font_size)
+    if disponivel < 0:
+        return ELLIPSIS
+    acumuladas = _larguras_acumuladas(texto, font_name, font_size)
+    texto = texto[: _maior_prefixo(acumuladas, 0, disponivel)]
+    return f"{texto}{sufixo}" if texto else ELLIPSIS
+
+
+def ajustar_tamanho_fonte(
+    texto,
+    font_name: str,
+    max_size: float,
+    min_size: float,
+    max_width: float,
+    passo: float = 0.25,
+) -> float:
+    """Maior tamanho (de ``passo`` em ``passo`` a partir de ``max_size``) em que o texto cabe numa linha."""
+    largura_unitaria = largura_texto(str(texto or ""), font_name, 1)
+    size = max_size
+    while size > min_size and largura_unitaria * size > max_width + _TOLERANCIA:
+        size -= passo
+    return max(size, min_size)
+
+
+def _quebrar_palavras(palavras, font_name, font_size, max_width, dividir_palavras):
+    espaco = largura_texto(" ", font_name, font_size)
+    limite = max_width + _TOLERANCIA
+    linhas = []
+    atual = []
+    largura_atual = 0.0
+
+    for palavra in palavras:
+        largura = largura_texto(palavra, font_name, font_size)
+        if atual:
+            candidata = largura_atual + espaco + largura
+            if candidata <= limite:
+                atual.append(palavra)
+                largura_atual = candidata
+                continue
+            linhas.append(" ".join(atual))
+
+        if dividir_palavras and largura > limite:
+            partes = dividir_palavra(palavra, font_name, font_size, max_width)
+            linhas.extend(partes[:-1])
+            palavra = partes[-1]
+            largura = largura_texto(palavra, font_name, font_size)
+        atual = [palavra]
+        largura_atual = largura
+
+    if atual:
+        linhas.append(" ".join(atual))
+    return linhas
+
+
+def layout_paragraph(
+    texto,
+    font_name: str,
+    font_size: float,
+    max_width: float,
+    leading: float = None,
+    preservar_quebras: bool = False,
+    dividir_palavras: bool = False,
+    max_linhas: int = None,
+    reticencias: bool = True,
+):
+    """
+    Quebra ``texto`` em linhas de até ``max_width`` pontos e devolve
+    ``(linhas, altura_total)``, com altura = linhas x ``leading`` (padrão 1,2 x fonte).
+
+    - ``preservar_quebras``: cada linha do texto original vira um parágrafo
+      (linhas em branco são mantidas como ""); texto vazio não gera linhas.
+      Sem ela, os espaços/quebras são normalizados e sempre há ao menos [""].
+    - ``dividir_palavras``: palavras mais largas que a linha são quebradas.
+    - ``max_linhas``: limita a quantidade de linhas; com ``reticencias`` a
+      última linha recebe "..." quando o texto foi cortado.
+    """
+    texto = str(texto or "")
+    if preservar_quebras:
+        linhas = []
+        for paragrafo in texto.splitlines():
+            palavras = paragrafo.split()
+            if not palavras:
+                linhas.append("")
+                continue
+            linhas.extend(_quebrar_palavras(palavras, font_name, font_size, max_width, dividir_palavras))
+    else:
+        linhas = _quebrar_palavras(texto.split(), font_name, font_size, max_width, dividir_palavras) or [""]
+
+    if max_linhas is not None and len(linhas) > max_linhas:
+        linhas = linhas[:max_linhas]
+        if reticencias and linhas:
+            linhas[-1] = truncar_texto(linhas[-1], font_name, font_size, max_width, reticencias=True)
+
+    if leading is None:
+        leading = font_size * 1.2
+    return linhas, len(linhas) * leading
+
+
+def quebrar_linhas(texto, font_name: str, font_size: float, max_width: float, **opcoes) -> list:
+    """Atalho para ``layout_paragraph`` quando só as linhas interessam."""
+    return layout_paragraph(texto, font_name, font_size, max_width, **opcoes)[0]
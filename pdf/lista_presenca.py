@@ -2,68 +2,13 @@ from pathlib import Path
 
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm
-from reportlab.lib.utils import ImageReader
 
-
-LOGO_IDARON = Path("assets/logo_idaron1548x1787px-1.png")
-
-
-def _wrap_text(c, text, max_width, font_name, font_size):
-    """Quebra texto respeitando a largura em pontos do ReportLab."""
-    words = str(text or "").split()
-    lines = []
-    current = ""
-
-    def split_long_word(word):
-        parts = []
-        part = ""
-        for char in word:
-            candidate = f"{part}{char}"
-            if c.stringWidth(candidate, font_name, font_size) <= max_width:
-                part = candidate
-            else:
-                if part:
-                    parts.append(part)
-                part = char
-        if part:
-            parts.append(part)
-        return parts
-
-    for word in words:
-        candidate = word if not current else f"{current} {word}"
-        if c.stringWidth(candidate, font_name, font_size) <= max_width:
-            current = candidate
-            continue
-
-        if current:
-            lines.append(current)
-            current = ""
-
-        if c.stringWidth(word, font_name, font_size) <= max_width:
-            current = word
-        else:
-            parts = split_long_word(word)
-            lines.extend(parts[:-1])
-            current = parts[-1] if parts else ""
-
-    if current:
-        lines.append(current)
-
-    return lines or [""]
+from pdf.dados_embutidos import embutir_dados
+from pdf.imagens import desenhar_imagem, obter_imagem
+from pdf.layout import layout_paragraph
 
 
-def _truncate_to_width(c, text, max_width, font_name, font_size, add_ellipsis=False):
-    ellipsis = "..."
-    text = str(text or "")
-    suffix = ellipsis if add_ellipsis else ""
-
-    if not add_ellipsis and c.stringWidth(text, font_name, font_size) <= max_width:
-        return text
-
-    while text and c.stringWidth(f"{text}{suffix}", font_name, font_size) > max_width:
-        text = text[:-1]
-
-    return f"{text}{suffix}" if text else ellipsis
+LOGO_IDARON = Path("assets/logo_idaron1548x1787px-1.png")
 
 
 def _draw_wrapped_text(
@@ -77,18 +22,15 @@ def _draw_wrapped_text(
     font_size=8,
     line_height=8.8,
 ):
-    lines = _wrap_text(c, text, max_width, font_name, font_size)
-    max_lines = max(1, int(max_height // line_height))
-    if len(lines) > max_lines:
-        lines = lines[:max_lines]
-        lines[-1] = _truncate_to_width(
-            c,
-            lines[-1],
-            max_width,
-            font_name,
-            font_size,
-            add_ellipsis=True,
-        )
+    lines, _ = layout_paragraph(
+        text,
+        font_name,
+        font_size,
+        max_width,
+        leading=line_height,
+        dividir_palavras=True,
+        max_linhas=max(1, int(max_height // line_height)),
+    )
 
     c.setFont(font_name, font_size)
     start_y = y_top - font_size
@@ -133,13 +75,14 @@ def _draw_header(
     logo_box_y = bloco_top_y - logo_h
     logo_box_w = area_campos_x - logo_box_x
     logo_base_y = logo_box_y + 2 * mm
-    if LOGO_IDARON.exists():
-        logo = ImageReader(str(LOGO_IDARON))
-        w_px, h_px = logo.getSize()
+    logo = obter_imagem(LOGO_IDARON)
+    if logo is not None:
+        w_px, h_px = logo["largura"], logo["altura"]
         scale = logo_h / h_px
         logo_w = w_px * scale
         c.rect(logo_box_x, logo_box_y, logo_box_w, logo_h, fill=0)
-        c.drawImage(
+        desenhar_imagem(
+            c,
             logo,
             x + 4 * mm,
             logo_base_y,
@@ -450,6 +393,9 @@ def gerar_pdf_lista_presenca(
     tipo_publico,
     qual,
 ):
+    # argumentos recebidos, embutidos no PDF para reimportação
+    entrada = dict(locals())
+
     from io import BytesIO
     from reportlab.pdfgen import canvas
 
@@ -480,6 +426,7 @@ def gerar_pdf_lista_presenca(
     )
 
     c.showPage()
+    embutir_dados(c, "lista_presenca", entrada)
     c.save()
     buffer.seek(0)
     return buffer.getvalue()
@@ -0,0 +1,188 @@
+"""
+Modelos de página: as partes fixas de um layout (brasão, grade, rótulos,
+rodapé) são desenhadas uma única vez por processo num canvas de rascunho e
+guardadas já codificadas. Cada documento novo recebe esse conteúdo como um
+form XObject e só desenha por cima o texto variável.
+
+A chave do modelo deve incluir tudo que altera as partes fixas (nomes das
+fontes, textos de rodapé...). ``VERSAO_LAYOUT`` entra em todas as chaves:
+incremente-a sempre que o desenho fixo de algum layout mudar.
+"""
+
+import hashlib
+import re
+import threading
+from io import BytesIO
+
+from reportlab import rl_config
+from reportlab.pdfbase import pdfdoc, pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+
+from pdf.imagens import registrar_xobject
+
+
+VERSAO_LAYOUT = 1
+
+_MODELOS = {}
+_LOCK = threading.Lock()
+_ESTATISTICAS = {"hits": 0, "misses": 0, "diretos": 0}
+
+# nome interno de fonte seguido do operador Tf (ex.: "/F1 12 Tf", "/F3+0 9 Tf")
+_RE_FONTE = re.compile(r"(/F\d+)((?:\+\d+)? [-\d.]+ Tf)")
+
+
+def _gravar(chave, desenhar, pagesize) -> dict:
+    """Executa ``desenhar`` num canvas de rascunho e guarda os operadores gerados."""
+    rascunho = canvas.Canvas(BytesIO(), pagesize=pagesize)
+    retorno = desenhar(rascunho)
+    doc = rascunho._doc
+
+    fontes = []
+    for fonte_ps, interno in doc.fontMapping.items():
+        fonte = pdfmetrics.getFont(fonte_ps)
+        estado = fonte.state.get(doc) if isinstance(fonte, TTFont) else None
+        if estado is not None:
+            estado = {
+                "assignments": dict(estado.assignments),
+                "subsets": [list(subset) for subset in estado.subsets],
+                "nextCode": estado.nextCode,
+            }
+        fontes.append((interno, fonte_ps, estado))
+
+    imagens = list(dict.fromkeys(rascunho._formsinuse))
+    assinatura = hashlib.md5(repr(chave).encode("utf-8")).hexdigest()[:16]
+    return {
+        "nome": f"Modelo{assinatura}",
+        "pagesize": tuple(pagesize),
+        "preambulo": rascunho._preamble,
+        "codigo": list(rascunho._code),
+        "fontes": fontes,
+        "imagens": imagens,
+        "retorno": retorno,
+        "streams": {},
+    }
+
+
+def _obter_modelo(chave, desenhar, pagesize):
+    chave = (VERSAO_LAYOUT, tuple(pagesize), chave)
+    modelo = _MODELOS.get(chave)
+    if modelo is not None:
+        with _LOCK:
+            _ESTATISTICAS["hits"] += 1
+        return modelo
+
+    with _LOCK:
+        modelo = _MODELOS.get(chave)
+        if modelo is None:
+            modelo = _gravar(chave, desenhar, pagesize)
+            _MODELOS[chave] = modelo
+            _ESTATISTICAS["misses"] += 1
+        else:
+            _ESTATISTICAS["hits"] += 1
+    return modelo
+
+
+def _preparar_fontes(c, modelo):
+    """
+    Registra as fontes do modelo no documento e devolve o mapa
+    nome interno gravado -> nome interno no documento. Devolve None quando
+    uma fonte TrueType já foi usada no documento (os códigos do subset não
+    seriam os mesmos da gravação).
+    """
+    doc = c._doc
+    mapa = {}
+    for interno, fonte_ps, estado in modelo["fontes"]:
+        if estado is None:
+            mapa[interno] = doc.getInternalFontName(fonte_ps)
+            continue
+        fonte = pdfmetrics.getFont(fonte_ps)
+        if doc in fonte.state:
+            return None
+        novo = fonte._assignState(doc)
+        novo.assignments = dict(estado["assignments"])
+        novo.subsets = [list(subset) for subset in estado["subsets"]]
+        novo.nextCode = estado["nextCode"]
+        mapa[interno] = fonte.getSubsetInternalName(0, doc).split("+")[0]
+    return mapa
+
+
+def _stream_codificado(c, modelo, mapa) -> pdfdoc.PDFStream:
+    """Conteúdo do form já filtrado (zlib/ASCII85), reaproveitado entre documentos."""
+    compressao = bool(c._pageCompression)
+    chave = (compressao, tuple(sorted(mapa.items())))
+    codificado = modelo["streams"].get(chave)
+    if codificado is None:
+        linhas = [modelo["preambulo"], *modelo["codigo"]]
+        if any(origem != destino for origem, destino in mapa.items()):
+            linhas = [
+                _RE_FONTE.sub(lambda m: mapa.get(m.group(1), m.group(1)) + m.group(2), linha)
+                for linha in linhas
+            ]
+        conteudo = pdfdoc.pdfdocEnc("\n".join(linhas))
+        filtros = []
+        if compressao:
+            filtros = [pdfdoc.PDFBase85Encode, pdfdoc.PDFZCompress] if rl_config.useA85 else [pdfdoc.PDFZCompress]
+            for filtro in reversed(filtros):
+                conteudo = filtro.encode(conteudo)
+        codificado = (conteudo, [filtro.pdfname for filtro in filtros])
+        modelo["streams"][chave] = codificado
+
+    conteudo, nomes_filtros = codificado
+    stream = pdfdoc.PDFStream(content=conteudo)
+    stream.__Comment__ = "xobject form stream"
+    if nomes_filtros:
+        stream.dictionary["Filter"] = pdfdoc.PDFArray([pdfdoc.PDFName(nome) for nome in nomes_filtros])
+    return stream
+
+
+def desenhar_modelo(c, chave, desenhar):
+    """
+    Desenha as partes fixas de uma página usando o modelo em cache.
+
+    ``desenhar(c)`` é a função que desenha essas partes diretamente; ela só é
+    executada na primeira vez para cada ``chave`` (ou quando o documento não
+    permite reaproveitar o modelo). Devolve o mesmo valor que ``desenhar``.
+    """
+    modelo = _obter_modelo(chave, desenhar, c._pagesize)
+    doc = c._doc
+    nome = modelo["nome"]
+    reg_name = doc.getXObjectName(nome)
+
+    if doc.idToObject.get(reg_name) is None:
+        if tuple(c._pagesize) != modelo["pagesize"]:
+            return _desenhar_direto(c, desenhar)
+        mapa = _preparar_fontes(c, modelo)
+        if mapa is None or not all(registrar_xobject(c, imagem) for imagem in modelo["imagens"]):
+            return _desenhar_direto(c, desenhar)
+
+        largura, altura = modelo["pagesize"]
+        form = pdfdoc.PDFFormXObject(lowerx=0, lowery=0, upperx=largura, uppery=altura)
+        form.compression = c._pageCompression
+        form.Contents = _stream_codificado(c, modelo, mapa)
+        form.XObjects = doc.xobjDict(modelo["imagens"]) if modelo["imagens"] else None
+        doc.addForm(nome, form)
+
+    if modelo["imagens"]:
+        c._currentPageHasImages = 1
+    c.doForm(nome)
+    return modelo["retorno"]
+
+
+def _desenhar_direto(c, desenhar):
+    with _LOCK:
+        _ESTATISTICAS["diretos"] += 1
+    return desenhar(c)
+
+
+def estatisticas_modelos() -> dict:
+    """Acertos/falhas do cache de modelos e quantas vezes foi preciso desenhar direto."""
+    with _LOCK:
+        return {**_ESTATISTICAS, "modelos": len(_MODELOS)}
+
+
+def limpar_cache_modelos() -> None:
+    with _LOCK:
+        _MODELOS.clear()
+        for chave in _ESTATISTICAS:
+            _ESTATISTICAS[chave] = 0
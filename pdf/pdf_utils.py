@@ -1,8 +1,17 @@
 import base64
 import streamlit as st
+from streamlit.errors import StreamlitAPIException
 
 def mostrar_pdf_na_tela(pdf_bytes: bytes):
     """Mostra o PDF inline no Streamlit sem abrir nova aba."""
+    # pela mídia da sessão (a URL só vale para ela); sem o componente de PDF,
+    # embutido em base64. Nunca pelo servidor estático: os documentos têm
+    # dados pessoais
+    try:
+        st.pdf(pdf_bytes, height=800)
+        return
+    except StreamlitAPIException:
+        pass
     base64_pdf = base64.b64encode(pdf_bytes).decode("utf-8")
 
     pdf_iframe = f"""
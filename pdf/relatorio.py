@@ -1,9 +1,9 @@
-import calendar
-
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm
 
 from pdf.cabecalho import desenhar_cabecalho
+from pdf.layout import layout_paragraph
+from services.feriados import indice_mes
 
 
 MESES_PT = {
@@ -21,6 +21,11 @@ MESES_PT = {
     12: "DEZEMBRO",
 }
 
+LARGURA_TABELA = 175 * mm
+LARGURA_COL_DIA = 12 * mm
+ALTURA_CABECALHO_TABELA = 5.5 * mm
+FONTE_CABECALHO_TABELA = ("Helvetica-Bold", 9)
+
 
 def gerar_relatorio_cabecalho(
     c,
@@ -34,12 +39,16 @@ def gerar_relatorio_cabecalho(
     cep,
     telefone,
     data_preenchimento,
+    y_base=None,
 ):
     """
     Desenha o cabeçalho oficial (logo) e o título do relatório,
     devolvendo a coordenada Y onde a tabela deve começar.
+    Se ``y_base`` for informado o brasão já foi desenhado (modelo de página)
+    e só o título é escrito.
     """
-    y_base = desenhar_cabecalho(c)
+    if y_base is None:
+        y_base = desenhar_cabecalho(c)
 
     largura_pagina, _ = A4
     x_centro = largura_pagina / 2
@@ -49,16 +58,19 @@ def gerar_relatorio_cabecalho(
     nome_mes = MESES_PT.get(mes, str(mes)).upper()
     linha2 = f"MÊS: {nome_mes}/{ano}"
 
-    # Sobe a primeira linha e aumenta a folga para n?o grudar na linha de baixo
-    y1 = y_base - 4 * mm   # primeira linha do t?tulo (mais afastada do cabe?alho)
-    y2 = y1 - 4 * mm       # segunda linha (M?S: ...)
-
+    y1, y2, y_tabela_top = posicoes_titulo_relatorio(y_base)
     c.drawCentredString(x_centro, y1, linha1)
     c.drawCentredString(x_centro, y2, linha2)
+    return y_tabela_top
 
+
+def posicoes_titulo_relatorio(y_base):
+    """Posições Y das duas linhas do título e do topo da tabela, a partir do fim do cabeçalho."""
+    # Sobe a primeira linha e aumenta a folga para n?o grudar na linha de baixo
+    y1 = y_base - 4 * mm   # primeira linha do t?tulo (mais afastada do cabe?alho)
+    y2 = y1 - 4 * mm       # segunda linha (M?S: ...)
     # Espa?o entre o t?tulo e o cabe?alho da tabela (reduzido)
-    y_tabela_top = y2 - 1 * mm
-    return y_tabela_top
+    return y1, y2, y2 - 1 * mm
 
 
 def desenhar_tabela_relatorio(
@@ -69,22 +81,25 @@ def desenhar_tabela_relatorio(
     atividade_base,
     feriados=None,
     y_top=None,
+    cabecalho=True,
 ):
     """
     Desenha a tabela de atividades do mês.
 
     Se y_top for informado, usa exatamente essa posição como topo da tabela.
     Caso contrário, calcula um topo padrão com base no tamanho da página.
+    Com ``cabecalho=False`` a linha "Dia | Atividade" não é desenhada (ela
+    vem do modelo de página).
     """
     feriados = feriados or {}
 
     largura_pagina, _ = A4
-    largura_tabela = 175 * mm
-    largura_col_dia = 12 * mm
+    largura_tabela = LARGURA_TABELA
+    largura_col_dia = LARGURA_COL_DIA
     largura_col_atividade = largura_tabela - largura_col_dia
 
     pad = 1.2 * mm
-    fonte_header = ("Helvetica-Bold", 9)
+    fonte_header = FONTE_CABECALHO_TABELA
     fonte_linha = ("Helvetica", 7.5)
     line_h = 8.0  # altura da linha em pontos
 
@@ -96,56 +111,27 @@ def desenhar_tabela_relatorio(
     x = (largura_pagina - largura_tabela) / 2
     y = y_top
 
-    def wrap_text(texto, max_width, font_name, font_size):
-        """Quebra o texto em múltiplas linhas respeitando uma largura máxima."""
-        palavras = texto.split()
-        linhas = []
-        atual = ""
-        for palavra in palavras:
-            cand = palavra if not atual else f"{atual} {palavra}"
-            if c.stringWidth(cand, font_name, font_size) <= max_width:
-                atual = cand
-            else:
-                if atual:
-                    linhas.append(atual)
-                atual = palavra
-        if atual:
-            linhas.append(atual)
-        return linhas or [""]
-
     # Cabeçalho da tabela
-    cabecalho_alt = 5.5 * mm
-    c.setFont(*fonte_header)
-    c.rect(x, y - cabecalho_alt, largura_tabela, cabecalho_alt, fill=0)
-    c.line(x + largura_col_dia, y - cabecalho_alt, x + largura_col_dia, y)
+    if cabecalho:
+        desenhar_cabecalho_tabela_relatorio(c, y)
+    y -= ALTURA_CABECALHO_TABELA
 
-    c.drawCentredString(
-        x + largura_col_dia / 2,
-        y - cabecalho_alt / 2 - 3,
-        "Dia",
-    )
-    c.drawCentredString(
-        x + largura_col_dia + (largura_col_atividade / 2),
-        y - cabecalho_alt / 2 - 3,
-        "Atividade",
-    )
-    y -= cabecalho_alt
-
-    dias_no_mes = calendar.monthrange(ano, mes)[1]
+    dias_no_mes, dias_semana = indice_mes(ano, mes)
 
     # Altura padro de linha baseada no texto de atividade normal
     texto_base = atividade_base.replace("{municipio}", municipio)
-    linhas_base = wrap_text(
+    _, altura_texto_base = layout_paragraph(
         texto_base,
-        largura_col_atividade - pad * 2,
         fonte_linha[0],
         fonte_linha[1],
+        largura_col_atividade - pad * 2,
+        leading=line_h,
     )
-    altura_base = len(linhas_base) * line_h + pad
+    altura_base = altura_texto_base + pad
     altura_minima = min(8 * mm, max(4.8 * mm, altura_base))
 
     for dia in range(1, dias_no_mes + 1):
-        dow = calendar.weekday(ano, mes, dia)
+        dow = dias_semana[dia - 1]
 
         if dow == 5:
             atividade = "SABADO"
@@ -160,14 +146,15 @@ def desenhar_tabela_relatorio(
         is_especial = (dow in (5, 6)) or (dia in feriados)
         font_nome_linha = "Helvetica-Bold" if is_especial else fonte_linha[0]
         font_tam_linha = 8 if is_especial else fonte_linha[1]
-        linhas = wrap_text(
+        linhas, altura_texto = layout_paragraph(
             atividade,
-            largura_col_atividade - pad * 2,
             font_nome_linha,
             font_tam_linha,
+            largura_col_atividade - pad * 2,
+            leading=line_h,
         )
 
-        altura_row = max(altura_minima, len(linhas) * line_h + pad)
+        altura_row = max(altura_minima, altura_texto + pad)
 
         # Caixa da linha (borda externa)
         c.rect(x, y - altura_row, largura_tabela, altura_row, fill=0)
@@ -185,7 +172,7 @@ def desenhar_tabela_relatorio(
 
         # Coluna "Atividade"
         c.setFont(font_nome_linha, font_tam_linha)
-        bloco_altura = len(linhas) * line_h
+        bloco_altura = altura_texto
         margem_superior = (altura_row - bloco_altura) / 2
         # Usa a mÇ®dia entre a posiÇõÇœ original e a centrada para nÇœo subir demais
         offset_antigo = pad + font_tam_linha
@@ -201,4 +188,27 @@ def desenhar_tabela_relatorio(
         y -= altura_row
 
     # devolve a última posição Y, caso precise continuar o desenho depois
-    return y
\ No newline at end of file
+    return y
+
+
+def desenhar_cabecalho_tabela_relatorio(c, y_top):
+    """Linha fixa "Dia | Atividade" no topo da tabela do relatório."""
+    largura_pagina, _ = A4
+    x = (largura_pagina - LARGURA_TABELA) / 2
+    largura_col_atividade = LARGURA_TABELA - LARGURA_COL_DIA
+    cabecalho_alt = ALTURA_CABECALHO_TABELA
+
+    c.setFont(*FONTE_CABECALHO_TABELA)
+    c.rect(x, y_top - cabecalho_alt, LARGURA_TABELA, cabecalho_alt, fill=0)
+    c.line(x + LARGURA_COL_DIA, y_top - cabecalho_alt, x + LARGURA_COL_DIA, y_top)
+
+    c.drawCentredString(
+        x + LARGURA_COL_DIA / 2,
+        y_top - cabecalho_alt / 2 - 3,
+        "Dia",
+    )
+    c.drawCentredString(
+        x + LARGURA_COL_DIA + (largura_col_atividade / 2),
+        y_top - cabecalho_alt / 2 - 3,
+        "Atividade",
+    )
@@ -0,0 +1,186 @@
+"""PDF do requerimento de restituição de valor recolhido indevidamente."""
+
+from io import BytesIO
+from pathlib import Path
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+
+from pdf.dados_embutidos import embutir_dados
+from pdf.imagens import desenhar_imagem, obter_imagem
+from pdf.layout import layout_paragraph, quebrar_linhas
+from services.cache_documentos import em_cache
+from services.instrumentacao import medido
+
+
+@medido("restituicao")
+@em_cache()
+def build_pdf_restituicao(data: dict, logo_path: Path) -> bytes:
+    buffer = BytesIO()
+    page_width, page_height = A4
+    c = canvas.Canvas(buffer, pagesize=A4)
+
+    margin = 15 * mm
+    rect_h = 30 * mm
+    rect_w = page_width - 2 * margin
+    rect_x = margin
+    rect_y = page_height - margin - rect_h
+
+    logo = obter_imagem(logo_path)
+    if logo is not None:
+        img_w, img_h = logo["largura"], logo["altura"]
+        max_w = rect_w * 0.8
+        max_h = 32 * mm
+        scale = min(max_w / img_w, max_h / img_h)
+        draw_w = img_w * scale
+        draw_h = img_h * scale
+        img_x = rect_x + (rect_w - draw_w) / 2
+        img_y = rect_y + (rect_h - draw_h) / 2 - 2 * mm
+        desenhar_imagem(c, logo, img_x, img_y, width=draw_w, height=draw_h, mask="auto")
+
+    title_h = 6 * mm
+    title_y = rect_y - title_h
+    c.setFont("Helvetica-Bold", 10)
+    c.drawCentredString(
+        rect_x + rect_w / 2,
+        title_y + 2.2 * mm,
+        "Requerimento de restituição de valor recolhido indevidamente",
+    )
+
+    x = margin
+    y = title_y - 10 * mm
+    line_h = 6 * mm
+
+    def val_or_line(value: str) -> str:
+        return value if value else "______________________________"
+
+    def draw_label_value(label: str, value: str, y_pos: float) -> float:
+        label_text = f"{label} "
+        c.setFont("Helvetica-Bold", 10)
+        c.drawString(x, y_pos, label_text)
+        c.setFont("Helvetica", 10)
+        c.drawString(x + stringWidth(label_text, "Helvetica-Bold", 10), y_pos, value)
+        return y_pos - line_h
+
+    c.setFont("Helvetica-Bold", 10)
+    c.drawString(
+        x,
+        y,
+        "RESTITUIÇÃO DE VALOR RECOLHIDO INDEVIDAMENTE, REFERENTE A TAXAS",
+    )
+    y -= line_h
+
+    def draw_checkbox(label: str, checked: bool, x_pos: float, y_pos: float) -> float:
+        box = 4 * mm
+        c.rect(x_pos, y_pos - 2.5 * mm, box, box)
+        if checked:
+            c.setFont("Helvetica-Bold", 12)
+            c.drawString(x_pos + 0.7 * mm, y_pos - 1.5 * mm, "X")
+        c.setFont("Helvetica", 10)
+        c.drawString(x_pos + box + 2 * mm, y_pos - 0.5 * mm, label)
+        return x_pos + box + 2 * mm + stringWidth(label, "Helvetica", 10) + 6 * mm
+
+    x_checks = x
+    x_checks = draw_checkbox("GTA ONLINE", data.get("taxa_gta", False), x_checks, y)
+    x_checks = draw_checkbox(
+        "GTA PRESENCIAL NA UNIDADE", data.get("taxa_gta_presencial", False), x_checks, y
+    )
+    # Quebra a linha longa da multa para não estourar a página
+    multa_label = (
+        "MULTA DECORRENTES DA ATUAÇÃO DA AGÊNCIA DE DEFESA AGROSILVOPASTORIL "
+        "DO ESTADO DE RONDÔNIA – IDARON"
+    )
+    box = 4 * mm
+    y_multa = y - 6 * mm
+    c.rect(x, y_multa - 2.5 * mm, box, box)
+    if data.get("taxa_multa", False):
+        c.setFont("Helvetica-Bold", 12)
+        c.drawString(x + 0.7 * mm, y_multa - 1.5 * mm, "X")
+    c.setFont("Helvetica", 10)
+    label_x = x + box + 2 * mm
+    max_w_label = page_width - margin - label_x
+    linhas_multa, altura_multa = layout_paragraph(
+        multa_label, "Helvetica", 10, max_w_label, leading=5 * mm, preservar_quebras=True
+    )
+    for idx, linha in enumerate(linhas_multa):
+        c.drawString(label_x, y_multa - (idx * 5 * mm), linha)
+    y -= 6 * mm + altura_multa
+
+    y = draw_label_value("Nome:", val_or_line(data.get("nome", "")), y)
+    y = draw_label_value("Nacionalidade:", val_or_line(data.get("nacionalidade", "")), y)
+    y = draw_label_value("CPF/CNPJ:", val_or_line(data.get("cpf_cnpj", "")), y)
+    y = draw_label_value("Residente e domiciliado:", val_or_line(data.get("residente", "")), y)
+    y = draw_label_value("Município/Distrito:", val_or_line(data.get("municipio", "")), y)
+    y = draw_label_value("Propriedade:", val_or_line(data.get("propriedade", "")), y)
+
+    c.setFont("Helvetica-Bold", 10)
+    c.drawString(x, y, "VEM REQUERER:")
+    y -= line_h
+    c.setFont("Helvetica", 10)
+    vem_requerer = data.get("vem_requerer", "")
+    max_w = page_width - 2 * margin
+    for linha in quebrar_linhas(vem_requerer, "Helvetica", 10, max_w, preservar_quebras=True):
+        c.drawString(x, y, linha)
+        y -= 5 * mm
+    y -= 2 * mm
+
+    c.setFont("Helvetica-Bold", 10)
+    c.drawString(x, y, "JUSTIFICATIVA:")
+    y -= line_h
+    c.setFont("Helvetica", 10)
+    justificativa = data.get("justificativa", "")
+    for linha in quebrar_linhas(justificativa, "Helvetica", 10, max_w, preservar_quebras=True):
+        c.drawString(x, y, linha)
+        y -= 5 * mm
+
+    y -= 2 * mm
+    c.setFont("Helvetica-Bold", 10)
+    c.drawString(x, y, "DADOS DA CONTA BANCÁRIA PARA DEVOLUÇÃO:")
+    y -= line_h
+
+    y = draw_label_value("Nome do titular da conta:", val_or_line(data.get("titular", "")), y)
+    y = draw_label_value("CPF:", val_or_line(data.get("conta_cpf", "")), y)
+    y = draw_label_value("Banco:", val_or_line(data.get("banco", "")), y)
+    y = draw_label_value("Agência:", val_or_line(data.get("agencia", "")), y)
+    y = draw_label_value("Conta corrente:", val_or_line(data.get("conta_corrente", "")), y)
+    y = draw_label_value("Número do banco:", val_or_line(data.get("numero_banco", "")), y)
+    y = draw_label_value("Tipo:", val_or_line(data.get("tipo", "")), y)
+
+    y -= 2 * mm
+    c.setFont("Helvetica-Bold", 10)
+    c.drawString(x, y, "DECLARAÇÃO DE INEXISTÊNCIA DE PROCESSO DE RESTITUIÇÃO EM ANDAMENTO")
+    y -= line_h
+    c.setFont("Helvetica", 10)
+    declaracao = data.get("declaracao", "")
+    for linha in quebrar_linhas(declaracao, "Helvetica", 10, max_w, preservar_quebras=True):
+        c.drawString(x, y, linha)
+        y -= 5 * mm
+    y -= 2 * mm
+
+    c.setFont("Helvetica-Bold", 10)
+    c.drawString(x, y, "CÓDIGO DE BARRAS DO DARE (BOLETO):")
+    y -= line_h
+    y = draw_label_value("Código de barras:", val_or_line(data.get("codigo_barras", "")), y)
+
+    local_data = f"{data.get('local', '')}, {data.get('data', '')}".strip(", ")
+    y = draw_label_value("Local e data:", val_or_line(local_data), y)
+
+    # assinatura centralizada no rodapé
+    sig_y = margin + 12 * mm
+    sig_w = 70 * mm
+    sig_x = (page_width - sig_w) / 2
+    c.line(sig_x, sig_y, sig_x + sig_w, sig_y)
+    c.setFont("Helvetica", 9)
+    nome_assinatura = data.get("nome", "").strip()
+    if nome_assinatura:
+        c.drawCentredString(sig_x + sig_w / 2, sig_y - 4 * mm, nome_assinatura)
+    else:
+        c.drawCentredString(sig_x + sig_w / 2, sig_y - 4 * mm, "Assinatura")
+
+    c.showPage()
+    embutir_dados(c, "restituicao", data)
+    c.save()
+    buffer.seek(0)
+    return buffer.read()
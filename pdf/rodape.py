@@ -1,8 +1,9 @@
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm
-from reportlab.lib.utils import ImageReader
 from pathlib import Path
 
+from pdf.imagens import desenhar_imagem, obter_imagem
+
 LOGO_ESQ_PATH = Path("assets/logo_inferior_esq.JPG")
 LOGO_DIR_PATH = Path("assets/logo_inferior_dir.JPG")
 
@@ -41,9 +42,10 @@ def desenhar_rodape(
     logo_esq_path = LOGO_ESQ_PATH if LOGO_ESQ_PATH.exists() else Path("assets/logo_inferior_esq.jpg")
     logo_dir_path = LOGO_DIR_PATH if LOGO_DIR_PATH.exists() else Path("assets/logo_inferior_dir.jpg")
 
-    if logo_esq_path.exists():
-        img_esq = ImageReader(str(logo_esq_path))
-        c.drawImage(
+    img_esq = obter_imagem(logo_esq_path)
+    if img_esq is not None:
+        desenhar_imagem(
+            c,
             img_esq,
             x_esq,
             y_logo,
@@ -53,9 +55,10 @@ def desenhar_rodape(
             mask="auto",
         )
 
-    if logo_dir_path.exists():
-        img_dir = ImageReader(str(logo_dir_path))
-        c.drawImage(
+    img_dir = obter_imagem(logo_dir_path)
+    if img_dir is not None:
+        desenhar_imagem(
+            c,
             img_dir,
             x_dir - logo_w_dir,
             y_logo,
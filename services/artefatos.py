@@ -0,0 +1,91 @@
+"""
+Imagens fixas servidas por URL (servidor estático do Streamlit).
+
+Em vez de embutir logos e imagens em base64 no HTML a cada rerun, o conteúdo
+é gravado uma vez em ``static/artefatos/<sha256>.<ext>`` e referenciado pela
+URL ``app/static/artefatos/...``. Como o nome é o hash do conteúdo, o arquivo
+nunca muda: o navegador reaproveita o cache (ETag/Last-Modified).
+
+O servidor estático não tem sessão: qualquer um com a URL baixa o arquivo.
+Por isso só imagens (``EXTENSOES_PUBLICAS``) são publicadas; os documentos
+gerados, com nome, CPF e conta bancária, vão pela sessão (``st.pdf``,
+``st.download_button``), e PDFs publicados por versões anteriores são
+apagados na primeira limpeza.
+
+Requer ``server.enableStaticServing = true`` (.streamlit/config.toml); sem
+isso ``publicar`` devolve None e as telas usam o modo antigo.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+
+
+DIRETORIO = Path(__file__).resolve().parents[1] / "static" / "artefatos"
+URL_BASE = "app/static/artefatos"
+TTL_SEGUNDOS = 7 * 24 * 60 * 60
+EXTENSOES_PUBLICAS = (".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp")
+# limpeza dos arquivos antigos no máximo uma vez por hora
+_INTERVALO_LIMPEZA = 60 * 60
+
+_LOCK = threading.Lock()
+_ULTIMA_LIMPEZA = {"quando": 0.0}
+
+
+def servidor_estatico_ativo() -> bool:
+    try:
+        import streamlit as st  # lazy import: o módulo também é usado fora da UI
+        return bool(st.get_option("server.enableStaticServing"))
+    except Exception:
+        return False
+
+
+def nome_artefato(dados: bytes, extensao: str) -> str:
+    return f"{hashlib.sha256(dados).hexdigest()}{extensao}"
+
+
+def publicar(dados: bytes, extensao: str = ".pdf"):
+    """
+    Grava ``dados`` (se ainda não estiverem publicados) e devolve a URL
+    relativa do artefato, ou None quando o servidor estático está desligado.
+    Só imagens: outra extensão levanta ``ValueError``.
+    """
+    if extensao.lower() not in EXTENSOES_PUBLICAS:
+        raise ValueError(f"só imagens são publicadas no servidor estático, não {extensao}")
+    if not servidor_estatico_ativo():
+        return None
+    _limpar_se_preciso()
+    nome = nome_artefato(dados, extensao)
+    caminho = DIRETORIO / nome
+    if not caminho.exists():
+        DIRETORIO.mkdir(parents=True, exist_ok=True)
+        temporario = caminho.with_name(f".{nome}.{os.getpid()}.{threading.get_ident()}.tmp")
+        temporario.write_bytes(dados)
+        os.replace(temporario, caminho)
+    return f"{URL_BASE}/{nome}"
+
+
+def _limpar_se_preciso() -> None:
+    agora = time.time()
+    with _LOCK:
+        if agora - _ULTIMA_LIMPEZA["quando"] < _INTERVALO_LIMPEZA:
+            return
+        _ULTIMA_LIMPEZA["quando"] = agora
+    limpar_artefatos()
+
+
+def limpar_artefatos(ttl: float = TTL_SEGUNDOS) -> None:
+    """Apaga artefatos não modificados há mais de ``ttl`` segundos e os que não são imagens."""
+    if not DIRETORIO.is_dir():
+        return
+    limite = time.time() - ttl
+    for caminho in DIRETORIO.iterdir():
+        if caminho.name.startswith("."):
+            continue  # temporário de uma publicação em andamento
+        try:
+            if caminho.suffix.lower() not in EXTENSOES_PUBLICAS or caminho.stat().st_mtime < limite:
+                caminho.unlink()
+        except OSError:
+            pass
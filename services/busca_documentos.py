@@ -0,0 +1,241 @@
+"""
+Busca de texto nos documentos do registro (``services.registro_documentos``).
+
+Cada documento registrado entra na tabela FTS5 ``busca`` do mesmo banco
+(rowid = id do documento) com a pessoa, o número, o nome do arquivo, os
+dados de entrada embutidos no PDF (``pdf.dados_embutidos``) e o texto
+extraído. O gravador em
+segundo plano chama ``indexar_pendentes`` depois de cada lote, que só
+processa os documentos ainda sem linha em ``busca``.
+
+Os PDFs antigos da pasta ``pdf/`` (gravados antes do registro) entram uma vez
+com ``backfill``:
+
+    python -m services.busca_documentos backfill            # pdf/ do projeto
+    python -m services.busca_documentos backfill --pasta X
+    python -m services.busca_documentos indexar             # só os pendentes
+    python -m services.busca_documentos reindexar           # refaz tudo
+    python -m services.busca_documentos buscar "joao silva"
+"""
+
+import argparse
+import re
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
+from pdf.dados_embutidos import ler_dados_embutidos
+from services.documentos import dados_para_regerar
+from services.extracao import extrair_texto
+from services.registro_documentos import _conexao, _como_dict, ler_conteudo, registrar_varios
+
+
+PASTA_LEGADA = Path(__file__).resolve().parents[1] / "pdf"
+LOTE_BACKFILL = 32
+# campos dos dados embutidos usados como pessoa/número no backfill, em ordem
+CAMPOS_PESSOA = ("reeducando", "nome", "nome_caps", "nome_declarante", "produtor", "servidor", "supervisao_regional", "unidade")
+CAMPOS_NUMERO = ("numero_declaracao", "identificacao_guia", "numero", "cpf", "cpf_cnpj", "placa", "caixa")
+_MIMES = {
+    ".pdf": "application/pdf",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+_LOCK = threading.Lock()
+_ESTATISTICAS = {"indexados": 0, "falhas": 0, "buscas": 0}
+
+
+def texto_dos_dados(dados) -> str:
+    """Valores (texto e números) de um dict/lista aninhado, um por linha."""
+    partes = []
+    pilha = [dados]
+    while pilha:
+        valor = pilha.pop()
+        if isinstance(valor, dict):
+            pilha.extend(reversed(list(valor.values())))
+        elif isinstance(valor, (list, tuple)):
+            pilha.extend(reversed(valor))
+        elif isinstance(valor, (str, int, float)) and not isinstance(valor, bool):
+            texto = str(valor).strip()
+            if texto:
+                partes.append(texto)
+    return "\n".join(partes)
+
+
+def _conteudo_busca(registro: dict) -> tuple:
+    """``(dados, texto)`` do documento para o índice."""
+    conteudo = ler_conteudo(registro)
+    payload = ler_dados_embutidos(conteudo) if registro["extensao"] == ".pdf" else None
+    try:
+        texto = extrair_texto(registro["nome_arquivo"] or f"x{registro['extensao']}", conteudo)
+    except RuntimeError:
+        texto = ""
+    return (texto_dos_dados(payload["dados"]) if payload else ""), texto
+
+
+def indexar_pendentes(limite=None) -> int:
+    """
+    Indexa os documentos ainda fora de ``busca``; devolve quantos entraram.
+    A extração roda sem o lock do módulo (que só protege os contadores), para
+    as buscas não esperarem um lote; dois indexadores ao mesmo tempo podem
+    extrair o mesmo documento, mas só um grava a linha.
+    """
+    conexao = _conexao()
+    consulta = (
+        "SELECT d.*, b.extensao, b.tamanho FROM documentos d JOIN blobs b ON b.sha256 = d.sha256"
+        " WHERE d.id NOT IN (SELECT rowid FROM busca) ORDER BY d.id"
+    )
+    if limite:
+        consulta += f" LIMIT {int(limite)}"
+    pendentes = [_como_dict(linha) for linha in conexao.execute(consulta).fetchall()]
+    indexados = falhas = 0
+    for registro in pendentes:
+        try:
+            dados, texto = _conteudo_busca(registro)
+        except OSError:
+            # arquivo sumiu (retenção ou apagado à mão): entra só com os metadados
+            dados, texto = "", ""
+            falhas += 1
+        try:
+            conexao.execute(
+                "INSERT INTO busca (rowid, pessoa, numero, nome_arquivo, dados, texto) VALUES (?, ?, ?, ?, ?, ?)",
+                (registro["id"], registro["pessoa"], registro["numero"], registro["nome_arquivo"], dados, texto),
+            )
+        except sqlite3.IntegrityError:
+            continue  # outro indexador gravou primeiro
+        indexados += 1
+    with _LOCK:
+        _ESTATISTICAS["indexados"] += indexados
+        _ESTATISTICAS["falhas"] += falhas
+    return indexados
+
+
+def reindexar() -> int:
+    """Apaga o índice e indexa todos os documentos de novo."""
+    _conexao().execute("DELETE FROM busca")
+    return indexar_pendentes()
+
+
+def _consulta_fts(texto: str) -> str:
+    """ "João Silv" -> '"joão"* "silv"*' (todas as palavras, por prefixo)."""
+    palavras = re.findall(r"\w+", texto or "")
+    return " ".join(f'"{palavra}"*' for palavra in palavras)
+
+
+def pesquisar(texto: str, tipo: str = "", limite: int = 20) -> list:
+    """
+    Documentos que contêm todas as palavras (por prefixo, sem diferenciar
+    acentos), mais relevantes primeiro. Cada item é o registro do documento
+    com ``trecho``: o pedaço do texto em que as palavras aparecem, marcadas
+    entre ``**``.
+    """
+    consulta = _consulta_fts(texto)
+    if not consulta:
+        return []
+    with _LOCK:
+        _ESTATISTICAS["buscas"] += 1
+    filtro, parametros = "", [consulta]
+    if tipo:
+        filtro = " AND d.tipo = ?"
+        parametros.append(tipo)
+    linhas = _conexao().execute(
+        "SELECT d.*, b.extensao, b.tamanho, snippet(busca, -1, '**', '**', ' … ', 12) AS trecho"
+        " FROM busca JOIN documentos d ON d.id = busca.rowid JOIN blobs b ON b.sha256 = d.sha256"
+        f" WHERE busca MATCH ?{filtro} ORDER BY bm25(busca), d.atualizado_em DESC LIMIT ?",
+        (*parametros, int(limite)),
+    ).fetchall()
+    return [_como_dict(linha) for linha in linhas]
+
+
+def _primeiro(dados: dict, campos) -> str:
+    for campo in campos:
+        valor = dados.get(campo)
+        if isinstance(valor, (str, int)) and str(valor).strip():
+            return str(valor).strip()
+    return ""
+
+
+def _pedido_legado(caminho: Path) -> dict:
+    conteudo = caminho.read_bytes()
+    extensao = caminho.suffix.lower()
+    pedido = {
+        "conteudo": conteudo,
+        "tipo": "legado",
+        "nome_arquivo": caminho.name,
+        "mime": _MIMES[extensao],
+    }
+    payload = ler_dados_embutidos(conteudo) if extensao == ".pdf" else None
+    if payload:
+        dados = payload["dados"]
+        if isinstance(dados.get("data"), dict):  # permissões do GTA: {"data": ..., "permissoes": ...}
+            dados = dados["data"]
+        try:
+            tipo = dados_para_regerar(payload)[0]
+        except KeyError:
+            tipo = payload["tipo"]
+        pedido.update(
+            tipo=tipo,
+            pessoa=_primeiro(dados, CAMPOS_PESSOA),
+            numero=_primeiro(dados, CAMPOS_NUMERO),
+        )
+    return pedido
+
+
+def backfill(pasta=PASTA_LEGADA) -> dict:
+    """
+    Registra e indexa os PDF/DOCX soltos em ``pasta`` (sem subpastas). Rodar
+    de novo não duplica: conteúdo igual cai no mesmo registro.
+    """
+    arquivos = sorted(
+        caminho for caminho in Path(pasta).iterdir() if caminho.is_file() and caminho.suffix.lower() in _MIMES
+    )
+    falhas = []
+    for inicio in range(0, len(arquivos), LOTE_BACKFILL):
+        pedidos = []
+        for caminho in arquivos[inicio:inicio + LOTE_BACKFILL]:
+            try:
+                pedidos.append(_pedido_legado(caminho))
+            except OSError as exc:
+                falhas.append(f"{caminho.name}: {exc}")
+        if pedidos:
+            registrar_varios(pedidos)
+    return {"arquivos": len(arquivos) - len(falhas), "indexados": indexar_pendentes(), "falhas": falhas}
+
+
+def estatisticas_busca() -> dict:
+    total = _conexao().execute("SELECT COUNT(*) FROM busca").fetchone()[0]
+    with _LOCK:
+        return {**_ESTATISTICAS, "no_indice": total}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m services.busca_documentos", description=__doc__.split("\n\n")[0])
+    comandos = parser.add_subparsers(dest="comando", required=True)
+    comando_backfill = comandos.add_parser("backfill", help="registra e indexa os arquivos antigos de pdf/")
+    comando_backfill.add_argument("--pasta", type=Path, default=PASTA_LEGADA)
+    comandos.add_parser("indexar", help="indexa os documentos pendentes")
+    comandos.add_parser("reindexar", help="refaz o índice inteiro")
+    comando_buscar = comandos.add_parser("buscar", help="pesquisa no índice")
+    comando_buscar.add_argument("texto")
+    comando_buscar.add_argument("--tipo", default="")
+    opcoes = parser.parse_args(argv)
+
+    if opcoes.comando == "backfill":
+        resultado = backfill(opcoes.pasta)
+        print(f"{resultado['arquivos']} arquivo(s) registrados, {resultado['indexados']} indexado(s)")
+        for falha in resultado["falhas"]:
+            print(f"falhou: {falha}", file=sys.stderr)
+        return 1 if resultado["falhas"] else 0
+    if opcoes.comando == "indexar":
+        print(f"{indexar_pendentes()} documento(s) indexado(s)")
+    elif opcoes.comando == "reindexar":
+        print(f"{reindexar()} documento(s) indexado(s)")
+    else:
+        for item in pesquisar(opcoes.texto, opcoes.tipo):
+            print(f"#{item['id']} {item['tipo']} {item['pessoa']} {item['numero']} {item['atualizado_em']}")
+            print(f"    {item['trecho']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
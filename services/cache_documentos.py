@@ -0,0 +1,196 @@
+"""
+Cache de documentos gerados, compartilhado por todas as sessões do processo.
+
+Os geradores (``build_pdf_*``, ``gerar_*``) são funções puras dos argumentos:
+o mesmo dict de dados produz sempre o mesmo arquivo. ``em_cache`` guarda o
+resultado (``bytes``) sob um hash estável dos argumentos normalizados, do nome
+da função, da versão informada no decorator e de ``VERSAO_LAYOUT``. Arquivos
+passados como ``Path`` (logos) entram no hash com tamanho e data de
+modificação. O cache descarta os itens usados há mais tempo quando o total
+passa de ``LIMITE_BYTES``.
+
+Geradores que aceitam ``destino`` (caminho ou arquivo aberto) também usam o
+cache: o destino fica fora do hash, o documento é gerado em memória e os
+bytes (novos ou do cache) são escritos no destino.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, time
+from decimal import Decimal
+from functools import wraps
+from inspect import signature
+from pathlib import Path
+
+from pdf.modelo_pagina import VERSAO_LAYOUT
+
+
+LIMITE_BYTES = 64 * 1024 * 1024
+# itens maiores que isso não entram (um lote grande expulsaria todo o resto)
+LIMITE_ITEM = LIMITE_BYTES // 8
+
+_CACHE = OrderedDict()
+_LOCK = threading.Lock()
+_ESTATISTICAS = {"hits": 0, "misses": 0, "ignorados": 0, "descartes": 0}
+_TOTAL = {"bytes": 0}
+# se a última chamada em cache de cada thread foi atendida pelo cache
+_ULTIMA_CONSULTA = threading.local()
+
+
+def _normalizar(valor):
+    """Converte o valor numa estrutura JSON estável; TypeError se não souber."""
+    if valor is None or isinstance(valor, (bool, int, str)):
+        return valor
+    if isinstance(valor, float):
+        return ["float", repr(valor)]
+    if isinstance(valor, Decimal):
+        return ["decimal", str(valor)]
+    if isinstance(valor, (datetime, date, time)):
+        return [type(valor).__name__, valor.isoformat()]
+    if isinstance(valor, Path):
+        try:
+            info = valor.stat()
+            return ["path", str(valor.resolve()), info.st_size, info.st_mtime_ns]
+        except OSError:
+            return ["path", str(valor)]
+    if isinstance(valor, (bytes, bytearray)):
+        return ["bytes", hashlib.sha256(valor).hexdigest()]
+    if isinstance(valor, dict):
+        itens = [[_normalizar(chave), _normalizar(item)] for chave, item in valor.items()]
+        return ["dict", sorted(itens, key=_json)]
+    if isinstance(valor, (list, tuple, range)):
+        return [type(valor).__name__, [_normalizar(item) for item in valor]]
+    if isinstance(valor, (set, frozenset)):
+        return ["set", sorted((_normalizar(item) for item in valor), key=_json)]
+    raise TypeError(f"valor sem forma estável para o cache: {type(valor).__name__}")
+
+
+def _json(valor) -> str:
+    return json.dumps(valor, ensure_ascii=False, separators=(",", ":"))
+
+
+def chave_documento(nome: str, versao, argumentos: dict) -> str:
+    """Hash SHA-256 do gerador + versões + argumentos normalizados."""
+    conteudo = _json([nome, versao, VERSAO_LAYOUT, _normalizar(argumentos)])
+    return hashlib.sha256(conteudo.encode("utf-8")).hexdigest()
+
+
+def _obter(chave):
+    with _LOCK:
+        dados = _CACHE.get(chave)
+        if dados is None:
+            _ESTATISTICAS["misses"] += 1
+            return None
+        _CACHE.move_to_end(chave)
+        _ESTATISTICAS["hits"] += 1
+        return dados
+
+
+def _guardar(chave, dados: bytes) -> None:
+    if len(dados) > LIMITE_ITEM:
+        return
+    with _LOCK:
+        anterior = _CACHE.pop(chave, None)
+        if anterior is not None:
+            _TOTAL["bytes"] -= len(anterior)
+        _CACHE[chave] = dados
+        _TOTAL["bytes"] += len(dados)
+        while _TOTAL["bytes"] > LIMITE_BYTES and _CACHE:
+            _, removido = _CACHE.popitem(last=False)
+            _TOTAL["bytes"] -= len(removido)
+            _ESTATISTICAS["descartes"] += 1
+
+
+def em_cache(versao=1):
+    """
+    Decorator para geradores que devolvem ``bytes``.
+
+    Incremente ``versao`` quando o desenho da função mudar. Com ``destino``
+    a chamada devolve None, como o gerador; chamadas com argumentos que não
+    podem ser normalizados passam direto, sem cache.
+    """
+
+    def decorar(funcao):
+        assinatura = signature(funcao)
+        nome = f"{funcao.__module__}.{funcao.__qualname__}"
+
+        @wraps(funcao)
+        def envoltorio(*args, **kwargs):
+            argumentos = assinatura.bind(*args, **kwargs)
+            argumentos.apply_defaults()
+            destino = argumentos.arguments.get("destino")
+            try:
+                chave = chave_documento(
+                    nome, versao, {campo: valor for campo, valor in argumentos.arguments.items() if campo != "destino"}
+                )
+            except TypeError:
+                return _sem_cache(funcao, args, kwargs)
+
+            dados = _obter(chave)
+            if dados is not None:
+                _ULTIMA_CONSULTA.acerto = True
+            else:
+                if destino is not None:
+                    argumentos.arguments["destino"] = None
+                dados = funcao(*argumentos.args, **argumentos.kwargs)
+                _ULTIMA_CONSULTA.acerto = False
+                if not isinstance(dados, (bytes, bytearray)):
+                    return dados
+                _guardar(chave, bytes(dados))
+            if destino is None:
+                return dados
+            _escrever(destino, dados)
+            return None
+
+        return envoltorio
+
+    return decorar
+
+
+def _escrever(destino, dados: bytes) -> None:
+    if isinstance(destino, (str, os.PathLike)):
+        with open(destino, "wb") as arquivo:
+            arquivo.write(dados)
+    else:
+        destino.write(dados)
+
+
+def _sem_cache(funcao, args, kwargs):
+    with _LOCK:
+        _ESTATISTICAS["ignorados"] += 1
+    return funcao(*args, **kwargs)
+
+
+def ultima_consulta_no_cache():
+    """
+    True/False conforme a última chamada a um gerador em cache nesta thread
+    veio ou não do cache; None se nenhuma passou pelo cache desde a última
+    consulta (a marca é zerada a cada leitura).
+    """
+    acerto = getattr(_ULTIMA_CONSULTA, "acerto", None)
+    _ULTIMA_CONSULTA.acerto = None
+    return acerto
+
+
+def estatisticas_cache() -> dict:
+    """Acertos, falhas, taxa de acerto, itens descartados e ocupação do cache."""
+    with _LOCK:
+        consultas = _ESTATISTICAS["hits"] + _ESTATISTICAS["misses"]
+        return {
+            **_ESTATISTICAS,
+            "taxa_acerto": _ESTATISTICAS["hits"] / consultas if consultas else 0.0,
+            "itens": len(_CACHE),
+            "bytes": _TOTAL["bytes"],
+            "limite_bytes": LIMITE_BYTES,
+        }
+
+
+def limpar_cache() -> None:
+    with _LOCK:
+        _CACHE.clear()
+        _TOTAL["bytes"] = 0
+        for chave in _ESTATISTICAS:
+            _ESTATISTICAS[chave] = 0
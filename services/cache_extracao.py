@@ -0,0 +1,158 @@
+"""
+Cache do texto extraído (e dos campos interpretados) de arquivos enviados.
+
+A chave é o SHA-256 dos bytes mais a extensão do arquivo: reenviar a mesma
+folha, mesmo renomeada, em outra tela ou outra sessão do processo custa só o
+hash. Os campos ficam guardados por parser (``_parse_campos``,
+``_parse_autorizacao_viagem_manual_campos``...) junto do texto; PDFs gerados
+pelo próprio sistema são lidos pelos dados embutidos, sem extrair texto. Entradas
+expiram depois de ``TTL_SEGUNDOS`` e as usadas há mais tempo são descartadas
+quando o texto guardado passa de ``LIMITE_BYTES``.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from pdf.dados_embutidos import ler_dados_embutidos
+from services.extracao import extrair_texto
+
+
+LIMITE_BYTES = 16 * 1024 * 1024
+TTL_SEGUNDOS = 60 * 60
+# custo fixo contado por entrada (payload, campos, chave)
+_CUSTO_ENTRADA = 1024
+
+_CACHE = OrderedDict()
+_LOCK = threading.Lock()
+_ESTATISTICAS = {"hits": 0, "misses": 0, "expirados": 0, "descartes": 0}
+_TOTAL = {"bytes": 0}
+
+
+def chave_conteudo(nome_arquivo: str, dados: bytes) -> str:
+    extensao = os.path.splitext(nome_arquivo or "")[1].lower()
+    return f"{hashlib.sha256(dados).hexdigest()}{extensao}"
+
+
+def _entrada(chave):
+    """Entrada viva (já marcada como recente) ou None; conta hit/miss."""
+    with _LOCK:
+        entrada = _CACHE.get(chave)
+        if entrada is not None and time.monotonic() - entrada["quando"] > TTL_SEGUNDOS:
+            _remover(chave)
+            _ESTATISTICAS["expirados"] += 1
+            entrada = None
+        if entrada is None:
+            _ESTATISTICAS["misses"] += 1
+            return None
+        _CACHE.move_to_end(chave)
+        _ESTATISTICAS["hits"] += 1
+        return entrada
+
+
+def _remover(chave) -> None:
+    entrada = _CACHE.pop(chave)
+    _TOTAL["bytes"] -= entrada["tamanho"]
+
+
+def _guardar(chave, payload) -> dict:
+    entrada = {
+        "chave": chave,
+        "quando": time.monotonic(),
+        "payload": payload,
+        "texto": None,
+        "tamanho": _CUSTO_ENTRADA,
+        "campos": {},
+    }
+    with _LOCK:
+        if chave in _CACHE:
+            _remover(chave)
+        _CACHE[chave] = entrada
+        _TOTAL["bytes"] += entrada["tamanho"]
+        _descartar_excesso()
+    return entrada
+
+
+def _descartar_excesso() -> None:
+    while _TOTAL["bytes"] > LIMITE_BYTES and len(_CACHE) > 1:
+        _remover(next(iter(_CACHE)))
+        _ESTATISTICAS["descartes"] += 1
+
+
+def _obter_entrada(nome_arquivo: str, dados: bytes) -> dict:
+    chave = chave_conteudo(nome_arquivo, dados)
+    entrada = _entrada(chave)
+    if entrada is None:
+        # PDF gerado por nós traz os dados de entrada: nem chega a extrair texto
+        payload = ler_dados_embutidos(dados) if chave.endswith(".pdf") else None
+        entrada = _guardar(chave, payload)
+    return entrada
+
+
+def _texto(entrada: dict, nome_arquivo: str, dados: bytes) -> str:
+    if entrada["texto"] is None:
+        # RuntimeError (biblioteca ausente, DOCX inválido) sobe sem ir para o cache
+        texto = extrair_texto(nome_arquivo, dados)
+        tamanho = len(texto.encode("utf-8"))
+        with _LOCK:
+            if entrada["texto"] is None:
+                entrada["texto"] = texto
+                entrada["tamanho"] += tamanho
+                if _CACHE.get(entrada["chave"]) is entrada:  # ainda não foi descartada
+                    _TOTAL["bytes"] += tamanho
+                    _descartar_excesso()
+    return entrada["texto"]
+
+
+def texto_extraido(nome_arquivo: str, dados: bytes) -> str:
+    """Texto do PDF/DOCX, extraído só na primeira vez que o conteúdo aparece."""
+    return _texto(_obter_entrada(nome_arquivo, dados), nome_arquivo, dados)
+
+
+def dados_embutidos(nome_arquivo: str, dados: bytes):
+    """Payload de ``pdf.dados_embutidos`` do arquivo (None se não houver)."""
+    return _obter_entrada(nome_arquivo, dados)["payload"]
+
+
+def campos_extraidos(nome_arquivo: str, dados: bytes, parser, de_payload=None) -> dict:
+    """
+    Campos do arquivo segundo ``parser(texto)``, guardados no cache.
+
+    Se o PDF tiver dados embutidos e ``de_payload(payload)`` devolver um dict,
+    ele é usado no lugar do parser e o texto nem é extraído. Devolve {} quando
+    o arquivo não tem texto legível.
+    """
+    entrada = _obter_entrada(nome_arquivo, dados)
+    nome_parser = f"{parser.__module__}.{parser.__qualname__}"
+    campos = entrada["campos"].get(nome_parser)
+    if campos is None:
+        if entrada["payload"] is not None and de_payload is not None:
+            campos = de_payload(entrada["payload"])
+        if campos is None:
+            texto = _texto(entrada, nome_arquivo, dados)
+            campos = parser(texto) if texto.strip() else {}
+        entrada["campos"][nome_parser] = campos
+    return dict(campos)
+
+
+def estatisticas_extracao() -> dict:
+    """Acertos, falhas, taxa de acerto, itens expirados/descartados e ocupação."""
+    with _LOCK:
+        consultas = _ESTATISTICAS["hits"] + _ESTATISTICAS["misses"]
+        return {
+            **_ESTATISTICAS,
+            "taxa_acerto": _ESTATISTICAS["hits"] / consultas if consultas else 0.0,
+            "itens": len(_CACHE),
+            "bytes": _TOTAL["bytes"],
+            "limite_bytes": LIMITE_BYTES,
+        }
+
+
+def limpar_extracao() -> None:
+    with _LOCK:
+        _CACHE.clear()
+        _TOTAL["bytes"] = 0
+        for chave in _ESTATISTICAS:
+            _ESTATISTICAS[chave] = 0
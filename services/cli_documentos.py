@@ -0,0 +1,142 @@
+"""
+Linha de comando para gerar documentos sem abrir o Streamlit.
+
+    python -m services.cli_documentos listar
+    python -m services.cli_documentos campos folha
+    python -m services.cli_documentos gerar folha --dados folha.json --saida folha.pdf
+    cat dados.json | python -m services.cli_documentos gerar veiculo > veiculo.pdf
+    python -m services.cli_documentos lote pedidos.jsonl --pasta saida/
+    python -m services.cli_documentos servir --porta 8765
+
+No lote, cada linha é ``{"tipo": ..., "dados": {...}, "nome": opcional}``;
+linhas com erro são relatadas e não interrompem as demais (código de saída 1
+se alguma falhar).
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from services.documentos import formato_documento, gerar_documento_em, tipos_documento
+from services.servidor_documentos import HOST_PADRAO, PORTA_PADRAO, criar_servidor, descrever_campos
+
+
+def _ler_json(origem: str):
+    if origem == "-":
+        return json.load(sys.stdin)
+    return json.loads(Path(origem).read_text(encoding="utf-8"))
+
+
+def _listar(opcoes) -> int:
+    for item in tipos_documento():
+        print(f"{item['tipo']:<30} .{item['extensao']:<5} {item['descricao']}")
+    return 0
+
+
+def _campos(opcoes) -> int:
+    print(json.dumps(descrever_campos(opcoes.tipo), ensure_ascii=False, indent=2))
+    return 0
+
+
+def _gerar(opcoes) -> int:
+    dados = _ler_json(opcoes.dados)
+    if opcoes.saida == "-":
+        gerar_documento_em(opcoes.tipo, dados, sys.stdout.buffer)
+        sys.stdout.buffer.flush()
+    else:
+        saida = opcoes.saida or f"{opcoes.tipo}.{formato_documento(opcoes.tipo)[0]}"
+        gerar_documento_em(opcoes.tipo, dados, saida)
+        print(saida, file=sys.stderr)
+    return 0
+
+
+def _lote(opcoes) -> int:
+    pasta = Path(opcoes.pasta)
+    pasta.mkdir(parents=True, exist_ok=True)
+    falhas = 0
+    with open(opcoes.arquivo, encoding="utf-8") as entrada:
+        for numero, linha in enumerate(entrada, start=1):
+            if not linha.strip():
+                continue
+            try:
+                pedido = json.loads(linha)
+                tipo = pedido["tipo"]
+                nome = pedido.get("nome") or f"{numero:05d}_{tipo}"
+                destino = pasta / f"{nome}.{formato_documento(tipo)[0]}"
+            except KeyError as exc:
+                falhas += 1
+                print(f"linha {numero}: {exc.args[0]}", file=sys.stderr)
+                continue
+            except (ValueError, TypeError, AttributeError) as exc:
+                falhas += 1
+                print(f"linha {numero}: {exc}", file=sys.stderr)
+                continue
+            try:
+                gerar_documento_em(tipo, pedido.get("dados") or {}, destino)
+            except ValueError as exc:
+                falhas += 1
+                print(f"linha {numero}: {exc}", file=sys.stderr)
+                continue
+            except Exception as exc:
+                falhas += 1
+                print(f"linha {numero}: falha ao gerar: {type(exc).__name__}: {exc}", file=sys.stderr)
+                continue
+            print(destino)
+    return 1 if falhas else 0
+
+
+def _servir(opcoes) -> int:
+    servidor = criar_servidor(opcoes.host, opcoes.porta)
+    print(f"servindo em http://{opcoes.host}:{servidor.server_address[1]}/documentos", file=sys.stderr)
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+    return 0
+
+
+def _argumentos(argv):
+    parser = argparse.ArgumentParser(prog="python -m services.cli_documentos", description="Gera documentos sem o Streamlit.")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    comandos.add_parser("listar", help="lista os tipos de documento").set_defaults(executar=_listar)
+
+    campos = comandos.add_parser("campos", help="mostra os campos aceitos por um tipo (null = obrigatório)")
+    campos.add_argument("tipo")
+    campos.set_defaults(executar=_campos)
+
+    gerar = comandos.add_parser("gerar", help="gera um documento a partir de um JSON")
+    gerar.add_argument("tipo")
+    gerar.add_argument("--dados", default="-", help="arquivo JSON com os dados ('-' = entrada padrão)")
+    gerar.add_argument("--saida", help="arquivo de saída ('-' = saída padrão; padrão: <tipo>.<extensão>)")
+    gerar.set_defaults(executar=_gerar)
+
+    lote = comandos.add_parser("lote", help="gera os documentos de um arquivo JSONL")
+    lote.add_argument("arquivo")
+    lote.add_argument("--pasta", default=".", help="pasta onde os arquivos são gravados")
+    lote.set_defaults(executar=_lote)
+
+    servir = comandos.add_parser("servir", help="sobe o servidor HTTP local")
+    servir.add_argument("--host", default=HOST_PADRAO)
+    servir.add_argument("--porta", type=int, default=PORTA_PADRAO)
+    servir.set_defaults(executar=_servir)
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    opcoes = _argumentos(argv)
+    try:
+        return opcoes.executar(opcoes)
+    except KeyError as exc:
+        print(f"erro: {exc.args[0]}", file=sys.stderr)
+    except ValueError as exc:
+        print(f"erro: {exc}", file=sys.stderr)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
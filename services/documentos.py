@@ -0,0 +1,534 @@
+"""
+Geração de documentos sem Streamlit.
+
+``DOCUMENTOS`` registra cada tipo de documento: o gerador
+(``"modulo:funcao"``, importado só na primeira vez que o tipo é pedido), a
+forma de chamá-lo, os campos aceitos em ``dados`` e o formato da saída.
+``gerar_documento(tipo, dados)`` valida os dados e devolve os bytes;
+``gerar_documento_em`` escreve num caminho ou arquivo aberto. Nada aqui
+importa ``streamlit`` nem grava arquivos por conta própria: a CLI
+(``python -m services.cli_documentos``), o servidor HTTP
+(``services.servidor_documentos``), os lotes e os benchmarks usam só esta
+camada.
+
+Dados inválidos (campo obrigatório ausente, campo desconhecido, valor do tipo
+errado) levantam ``ValueError`` com a mensagem para o usuário; tipo
+desconhecido levanta ``KeyError``, e só na consulta ao tipo (``_documento``):
+qualquer outra exceção que sair do gerador é falha interna.
+"""
+
+import importlib
+import inspect
+import os
+import threading
+from pathlib import Path
+
+from services.feriados import feriados_do_mes
+from services.pdf_builders import CAMPOS_FOLHA, CAMPOS_RELATORIO
+
+
+ASSETS = Path(__file__).resolve().parents[1] / "assets"
+LOGO_IDARON = ASSETS / "logo_inferior_dir.jpg"
+LOGO_GTA = ASSETS / "logo_ro_horizontal.JPG"
+LOGO_SUGESP = ASSETS / "logo_sugesp.png"
+
+PDF = ("pdf", "application/pdf")
+DOCX = ("docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document")
+
+# marca, em ``campos_documento``, os campos sem valor padrão
+OBRIGATORIO = inspect.Parameter.empty
+
+# argumentos dos geradores que não vêm de ``dados``
+_ARGUMENTOS_INTERNOS = {"usar_modelo", "destino"}
+
+# campos (com o valor padrão, que também define o tipo) dos geradores que
+# recebem um dict ``data``, como as telas montam
+_CAMPOS_AUTORIZACAO_VIAGEM = dict.fromkeys(
+    (
+        "placa", "tipo_modelo", "objetivo", "destino", "servidor", "cargo_funcao", "matricula",
+        "habilitacao", "categoria", "validade", "saida_texto", "km_saida", "responsavel_transporte",
+        "chegada_texto", "km_chegada", "observacao",
+    ),
+    "",
+)
+_CAMPOS_GTA = dict.fromkeys(
+    (
+        "nome", "cargo", "formacao", "matricula", "rg", "cpf", "orgao_origem", "data_emissao", "regional",
+        "unidade_lotacao", "data_lotacao", "autorizado_transito", "municipio_estado", "especies",
+        "outros_documentos",
+    ),
+    "",
+)
+_CAMPOS_PERMISSOES_GTA = {
+    **dict.fromkeys(("nome", "cargo", "matricula", "cpf", "unidade_lotacao"), ""),
+    "permissoes": {},
+}
+_CAMPOS_SUINOS = {
+    **dict.fromkeys(
+        (
+            "ulsav", "numero_declaracao", "nome", "nacionalidade", "profissao", "rg", "orgao_emissor",
+            "cpf_cnpj", "endereco", "municipio", "uf", "cpf_cnpj_prop", "nome_prop_imovel",
+            "cod_propriedade_pga", "observacoes", "tipo_vinculo", "cod_exploracao_pga", "local_data_extenso",
+            "emitente_nome", "emitente_cargo", "emitente_matricula",
+        ),
+        "",
+    ),
+    **dict.fromkeys(("reprodutor", "matriz", "leitao_m", "leitao_f", "idade_sexo_nao_relevante", "total_animais"), 0),
+}
+_CAMPOS_NADA_CONSTA = {
+    **dict.fromkeys(
+        (
+            "destinatario", "vocativo", "nome_caps", "corpo", "servidor_nome", "servidor_cargo",
+            "servidor_matricula", "cpf", "rg",
+        ),
+        "",
+    ),
+    "incluir_assinatura_requerente": True,
+}
+_CAMPOS_RESIDENCIA = dict.fromkeys(
+    ("nome_declarante", "logradouro", "municipio", "complemento", "observacoes", "data"), ""
+)
+_CAMPOS_FAI = {
+    **dict.fromkeys(
+        (
+            "numero", "data_emissao", "responsavel", "produtor", "propriedade", "cod_propriedade", "logradouro",
+            "municipio", "area_propriedade", "area_soja_cadastrada", "cod_sisvegetal", "sojicultor", "cpf",
+            "email", "fone", "coord_s", "coord_w", "coord_confere", "uf", "ulsav_de", "regional",
+            "placa_veiculo", "hod_inicial", "hod_final", "dist_ulsav_km", "cultura", "area", "talhao",
+            "observacoes", "cadastro_idaron_status", "cadastro_prazo_status", "auto_infracao_numero",
+            "auto_infracao_data", "monitoramento_ferrugem_status", "cultiva_soja_safrinha_status",
+            "ocorrencia_ferrugem_status", "cadastro_safrinha_status", "ocorrencia_laboratorio_status",
+            "data_plantio", "laboratorio", "outros_cultivos_safrinha", "estimativa_perda", "assinatura_horario",
+            "assinatura_data", "assinatura_local", "assinatura_nome", "assinatura_cpf",
+        ),
+        "",
+    ),
+    "titulo": "FISCALIZAÇÃO DO VAZIO SANITÁRIO DA SOJA",
+    "subtitulo": "ESTABELECIDA PELA INSTRUÇÃO NORMATIVA",
+    **dict.fromkeys(
+        ("notificacao_produtor_checked", "irregularidade_checked", "origem_propria", "origem_empresa", "origem_outra"),
+        False,
+    ),
+}
+_CAMPOS_GUIA_MALOTE = {
+    **dict.fromkeys(
+        (
+            "supervisao_regional", "identificacao_guia", "origem_resumo", "destino_resumo", "data_envio",
+            "assinatura_nome", "assinatura_cargo", "assinatura_matricula",
+        ),
+        "",
+    ),
+    "itens": [],
+}
+_CAMPOS_RESTITUICAO = {
+    **dict.fromkeys(
+        (
+            "nome", "nacionalidade", "cpf_cnpj", "residente", "municipio", "propriedade", "vem_requerer",
+            "justificativa", "titular", "conta_cpf", "banco", "agencia", "conta_corrente", "numero_banco",
+            "tipo", "codigo_barras", "declaracao", "local", "data",
+        ),
+        "",
+    ),
+    **dict.fromkeys(("taxa_gta", "taxa_gta_presencial", "taxa_multa"), False),
+}
+_CAMPOS_VEICULO = {**dict.fromkeys(("mes", "unidade", "placa", "modelo"), ""), "ano": 0}
+
+
+def _dias(feriados) -> dict:
+    """
+    {dia: descrição} com dias inteiros (JSON só tem chaves texto); descrição
+    vazia/null vira None, que retira o feriado automático do dia.
+    """
+    if not isinstance(feriados, dict):
+        raise ValueError("feriados deve ser um objeto {dia: descrição}")
+    try:
+        return {int(dia): str(nome) if nome else None for dia, nome in feriados.items()}
+    except ValueError:
+        raise ValueError("feriados: os dias precisam ser números") from None
+
+
+def _mes(valor, campo: str = "mes") -> int:
+    if isinstance(valor, bool) or not isinstance(valor, int) or not 1 <= valor <= 12:
+        raise ValueError(f"{campo}: esperado número do mês, de 1 a 12")
+    return valor
+
+
+def _preparar_mensal(dados: dict) -> dict:
+    """Folha/relatório: normaliza ``feriados`` e aplica ``feriados_automaticos``."""
+    automaticos = dados.pop("feriados_automaticos", False)
+    dados["mes"] = _mes(dados["mes"])
+    feriados = _dias(dados.get("feriados") or {})
+    if automaticos:
+        feriados = feriados_do_mes(dados["ano"], dados["mes"], dados.get("municipio", ""), feriados)
+    dados["feriados"] = {dia: nome for dia, nome in feriados.items() if nome}
+    return dados
+
+
+def _preparar_periodo(dados: dict) -> dict:
+    automaticos = dados.pop("feriados_automaticos", False)
+    if not isinstance(dados["meses"], list):
+        raise ValueError("meses deve ser uma lista de números de 1 a 12")
+    dados["meses"] = [_mes(mes, "meses") for mes in dados["meses"]]
+    por_mes = dados.get("feriados_por_mes") or {}
+    if not isinstance(por_mes, dict):
+        raise ValueError("feriados_por_mes deve ser um objeto {mês: {dia: descrição}}")
+    try:
+        por_mes = {int(mes): feriados for mes, feriados in por_mes.items()}
+    except ValueError:
+        raise ValueError("feriados_por_mes: os meses precisam ser números") from None
+    por_mes = {_mes(mes, "feriados_por_mes"): _dias(feriados) for mes, feriados in por_mes.items()}
+    if automaticos:
+        municipio = dados.get("municipio", "")
+        por_mes = {
+            mes: feriados_do_mes(dados["ano"], mes, municipio, por_mes.get(mes)) for mes in dados["meses"]
+        }
+    dados["feriados_por_mes"] = {
+        mes: {dia: nome for dia, nome in feriados.items() if nome} for mes, feriados in por_mes.items()
+    }
+    return dados
+
+
+def _preparar_guia_malote(dados: dict) -> dict:
+    """Aceita itens como texto simples (uma descrição cada) ou {"descricao": ...}."""
+    itens = dados["itens"]
+    if not isinstance(itens, list):
+        raise ValueError("itens deve ser uma lista")
+    dados["itens"] = [item if isinstance(item, dict) else {"descricao": str(item)} for item in itens]
+    return dados
+
+
+def _secoes(secoes, campo: str) -> list:
+    if not isinstance(secoes, list) or not all(isinstance(secao, dict) for secao in secoes):
+        raise ValueError(f"{campo} deve ser uma lista de objetos {{month, year, text}}")
+    return secoes
+
+
+def _preparar_etiquetas(dados: dict) -> dict:
+    """``month_sections`` e ``label_cards`` (com as seções de cada etiqueta) como a tela monta."""
+    if dados.get("month_sections") is not None:
+        _secoes(dados["month_sections"], "month_sections")
+    cartoes = dados.get("label_cards")
+    if cartoes is not None:
+        if not isinstance(cartoes, list) or not all(isinstance(cartao, dict) for cartao in cartoes):
+            raise ValueError("label_cards deve ser uma lista de objetos {supervisao_regional, unidade, caixa, month_sections}")
+        for cartao in cartoes:
+            _secoes(cartao.get("month_sections") or [], "label_cards: month_sections")
+    return dados
+
+
+def _preparar_permissoes(dados: dict) -> dict:
+    """``permissoes`` com os itens como inteiros, como a tela monta."""
+    try:
+        dados["permissoes"] = {int(item): dict(valores) for item, valores in dados["permissoes"].items()}
+    except (AttributeError, TypeError, ValueError):
+        raise ValueError("permissoes deve ser um objeto {item: {novo, editar, cancelar, consultar}}") from None
+    return dados
+
+
+def _chamar_argumentos(funcao, dados, logo):
+    return funcao(**dados)
+
+
+def _chamar_dados(funcao, dados, logo):
+    return funcao(dados)
+
+
+def _chamar_dados_logo(funcao, dados, logo):
+    return funcao(dados, logo)
+
+
+def _chamar_permissoes(funcao, dados, logo):
+    dados = dict(dados)
+    permissoes = dados.pop("permissoes")
+    return funcao(dados, logo, permissoes)
+
+
+# tipo -> descrição, gerador, chamada, campos (None = os parâmetros do
+# gerador), preparo dos dados, logo, formato e se o gerador aceita ``destino``
+DOCUMENTOS = {
+    "folha": {
+        "descricao": "Folha de ponto do reeducando",
+        "gerador": "services.pdf_builders:gerar_pdf",
+        "chamada": _chamar_argumentos,
+        "campos": None,
+        "preparar": _preparar_mensal,
+        "formato": PDF,
+        "destino": True,
+    },
+    "relatorio": {
+        "descricao": "Relatório mensal de atividades do reeducando",
+        "gerador": "services.pdf_builders:gerar_relatorio_pdf",
+        "chamada": _chamar_argumentos,
+        "campos": None,
+        "preparar": _preparar_mensal,
+        "formato": PDF,
+        "destino": True,
+    },
+    "periodo": {
+        "descricao": "Folhas e relatórios de vários meses num único PDF",
+        "gerador": "services.pdf_builders:gerar_periodo_pdf",
+        "chamada": _chamar_argumentos,
+        "campos": None,
+        # recebidos em ``**campos``
+        "campos_extras": dict.fromkeys((*CAMPOS_FOLHA, *CAMPOS_RELATORIO), ""),
+        "preparar": _preparar_periodo,
+        "formato": PDF,
+        "destino": True,
+    },
+    "lista_presenca": {
+        "descricao": "Lista de presença",
+        "gerador": "services.pdf_builders:gerar_lista_presenca_pdf",
+        "chamada": _chamar_argumentos,
+        "campos": None,
+        "formato": PDF,
+    },
+    "veiculo": {
+        "descricao": "Controle mensal de veículo",
+        "gerador": "pdf.veiculos:build_pdf_veiculo",
+        "chamada": _chamar_dados_logo,
+        "campos": _CAMPOS_VEICULO,
+        "logo": LOGO_IDARON,
+        "formato": PDF,
+    },
+    "cadastro_gta": {
+        "descricao": "Cadastro de emissor de GTA (PDF)",
+        "gerador": "pdf.cadastro_emissao_gta:build_pdf_cadastro_gta",
+        "chamada": _chamar_dados_logo,
+        "campos": _CAMPOS_GTA,
+        "logo": LOGO_GTA,
+        "formato": PDF,
+    },
+    "cadastro_gta_docx": {
+        "descricao": "Cadastro de emissor de GTA (DOCX)",
+        "gerador": "pdf.cadastro_emissao_gta:build_docx_cadastro_gta",
+        "chamada": _chamar_dados_logo,
+        "campos": _CAMPOS_GTA,
+        "logo": LOGO_GTA,
+        "formato": DOCX,
+    },
+    "permissoes_gta": {
+        "descricao": "Permissões do emissor de GTA no sistema",
+        "gerador": "pdf.cadastro_emissao_gta:build_pdf_permissoes_gta",
+        "chamada": _chamar_permissoes,
+        "campos": _CAMPOS_PERMISSOES_GTA,
+        "preparar": _preparar_permissoes,
+        "logo": LOGO_GTA,
+        "formato": PDF,
+    },
+    "restituicao": {
+        "descricao": "Requerimento de restituição de valor recolhido indevidamente",
+        "gerador": "pdf.restituicao:build_pdf_restituicao",
+        "chamada": _chamar_dados_logo,
+        "campos": _CAMPOS_RESTITUICAO,
+        "logo": LOGO_IDARON,
+        "formato": PDF,
+    },
+    "declaracao_nada_consta": {
+        "descricao": "Declaração de nada consta",
+        "gerador": "pdf.declaracao_nada_consta:build_pdf_declaracao_nada_consta",
+        "chamada": _chamar_dados_logo,
+        "campos": _CAMPOS_NADA_CONSTA,
+        "logo": LOGO_IDARON,
+        "formato": PDF,
+    },
+    "declaracao_residencia": {
+        "descricao": "Declaração de residência",
+        "gerador": "pdf.declaracao_residencia:build_pdf_declaracao_residencia",
+        "chamada": _chamar_dados_logo,
+        "campos": _CAMPOS_RESIDENCIA,
+        "logo": LOGO_IDARON,
+        "formato": PDF,
+    },
+    "declaracao_cadastral_suinos": {
+        "descricao": "Declaração cadastral de suínos",
+        "gerador": "pdf.declaracao_cadastral_suinos:build_pdf_declaracao_cadastral_suinos",
+        "chamada": _chamar_dados_logo,
+        "campos": _CAMPOS_SUINOS,
+        "logo": LOGO_IDARON,
+        "formato": PDF,
+    },
+    "etiqueta_arquivo": {
+        "descricao": "Etiquetas de caixa de arquivo",
+        "gerador": "pdf.etiqueta_arquivo:build_pdf_etiqueta_arquivo",
+        "chamada": _chamar_argumentos,
+        "campos": None,
+        "preparar": _preparar_etiquetas,
+        "formato": PDF,
+    },
+    "guia_malote": {
+        "descricao": "Guia de malote",
+        "gerador": "pdf.guia_malote:build_pdf_guia_malote_v2",
+        "chamada": _chamar_dados_logo,
+        "campos": _CAMPOS_GUIA_MALOTE,
+        "preparar": _preparar_guia_malote,
+        "logo": LOGO_IDARON,
+        "formato": PDF,
+    },
+    "autorizacao_viagem_manual": {
+        "descricao": "Autorização de viagem manual",
+        "gerador": "pdf.autorizacao_viagem_manual:build_pdf_autorizacao_viagem_manual",
+        "chamada": _chamar_dados_logo,
+        "campos": _CAMPOS_AUTORIZACAO_VIAGEM,
+        "logo": LOGO_SUGESP,
+        "formato": PDF,
+    },
+    "fai_vazio_sanitario": {
+        "descricao": "FAI - fiscalização do vazio sanitário da soja",
+        "gerador": "pdf.fai_vazio_sanitario:build_pdf",
+        "chamada": _chamar_dados,
+        "campos": _CAMPOS_FAI,
+        "formato": PDF,
+    },
+}
+
+_GERADORES = {}
+_LOCK = threading.Lock()
+
+
+def _documento(tipo: str) -> dict:
+    try:
+        return DOCUMENTOS[tipo]
+    except KeyError:
+        raise KeyError(f"tipo de documento desconhecido: {tipo}") from None
+
+
+def gerador(tipo: str):
+    """Função geradora do tipo (importa o módulo na primeira vez)."""
+    with _LOCK:
+        if tipo not in _GERADORES:
+            nome_modulo, nome_funcao = _documento(tipo)["gerador"].split(":")
+            _GERADORES[tipo] = getattr(importlib.import_module(nome_modulo), nome_funcao)
+        return _GERADORES[tipo]
+
+
+def _parametros(tipo: str) -> dict:
+    """{nome: padrão} dos parâmetros do gerador (``OBRIGATORIO`` quando não tem padrão)."""
+    assinatura = inspect.signature(inspect.unwrap(gerador(tipo)))
+    return {
+        nome: parametro.default
+        for nome, parametro in assinatura.parameters.items()
+        if nome not in _ARGUMENTOS_INTERNOS and parametro.kind is not inspect.Parameter.VAR_KEYWORD
+    }
+
+
+def campos_documento(tipo: str) -> dict:
+    """{campo: padrão} aceitos em ``dados``; ``OBRIGATORIO`` marca os campos sem padrão."""
+    documento = _documento(tipo)
+    if documento["campos"] is not None:
+        return dict(documento["campos"])
+    return {**_parametros(tipo), **documento.get("campos_extras", {})}
+
+
+def _converter(campo: str, valor, padrao):
+    """Confere/converte ``valor`` para o tipo do padrão do campo."""
+    if isinstance(padrao, bool):
+        if isinstance(valor, bool):
+            return valor
+        raise ValueError(f"{campo}: esperado verdadeiro/falso")
+    if isinstance(padrao, int):
+        try:
+            return int(valor)
+        except (TypeError, ValueError):
+            raise ValueError(f"{campo}: esperado número inteiro") from None
+    if isinstance(padrao, str):
+        if isinstance(valor, (str, int, float)) and not isinstance(valor, bool):
+            return str(valor)
+        raise ValueError(f"{campo}: esperado texto")
+    if isinstance(padrao, (list, dict)) and not isinstance(valor, type(padrao)):
+        raise ValueError(f"{campo}: esperado {'lista' if isinstance(padrao, list) else 'objeto'}")
+    return valor
+
+
+def validar_dados(tipo: str, dados) -> dict:
+    """
+    Dados completos e convertidos para o gerador do tipo. Campos ausentes
+    recebem o padrão; obrigatórios ausentes e campos desconhecidos levantam
+    ``ValueError``.
+    """
+    documento = _documento(tipo)
+    if not isinstance(dados, dict):
+        raise ValueError("dados deve ser um objeto")
+    dados = dict(dados)
+    extras = {}
+    if documento.get("preparar") in (_preparar_mensal, _preparar_periodo) and "feriados_automaticos" in dados:
+        extras["feriados_automaticos"] = _converter("feriados_automaticos", dados.pop("feriados_automaticos"), False)
+
+    campos = campos_documento(tipo)
+    desconhecidos = sorted(set(dados) - set(campos))
+    if desconhecidos:
+        raise ValueError(f"campos desconhecidos: {', '.join(desconhecidos)}")
+    ausentes = sorted(campo for campo, padrao in campos.items() if padrao is OBRIGATORIO and campo not in dados)
+    if ausentes:
+        raise ValueError(f"campos obrigatórios ausentes: {', '.join(ausentes)}")
+
+    completos = {}
+    for campo, padrao in campos.items():
+        if campo in dados:
+            completos[campo] = dados[campo] if padrao is OBRIGATORIO else _converter(campo, dados[campo], padrao)
+        elif documento["campos"] is not None:
+            # cópia: os padrões mutáveis ({} e []) são compartilhados
+            completos[campo] = padrao.copy() if isinstance(padrao, (list, dict)) else padrao
+    completos.update(extras)
+    preparar = documento.get("preparar")
+    return preparar(completos) if preparar else completos
+
+
+# tipo gravado por ``embutir_dados`` -> tipo daqui, quando diferem
+_TIPOS_EMBUTIDOS = {"guia_malote_v2": "guia_malote"}
+
+
+def dados_para_regerar(payload: dict) -> tuple:
+    """
+    ``(tipo, dados)`` para ``gerar_documento`` a partir do dict embutido no PDF
+    (``pdf.dados_embutidos.ler_dados_embutidos``). Campos que o tipo não
+    aceita são descartados; tipo desconhecido levanta ``KeyError``.
+    """
+    tipo = _TIPOS_EMBUTIDOS.get(payload["tipo"], payload["tipo"])
+    dados = dict(payload["dados"])
+    if tipo == "permissoes_gta":
+        dados = {**dados.get("data", {}), "permissoes": dados.get("permissoes", {})}
+    campos = campos_documento(tipo)
+    return tipo, {campo: valor for campo, valor in dados.items() if campo in campos}
+
+
+def gerar_documento(tipo: str, dados) -> bytes:
+    """Bytes do documento ``tipo`` gerado a partir de ``dados``."""
+    documento = _documento(tipo)
+    dados = validar_dados(tipo, dados)
+    return documento["chamada"](gerador(tipo), dados, documento.get("logo"))
+
+
+def gerar_documento_em(tipo: str, dados, destino) -> None:
+    """
+    Escreve o documento em ``destino`` (caminho ou arquivo binário aberto).
+    Folha, relatório e período desenham direto no destino; os demais são
+    gerados em memória e copiados.
+    """
+    documento = _documento(tipo)
+    if documento.get("destino"):
+        gerador(tipo)(**validar_dados(tipo, dados), destino=destino)
+        return
+    conteudo = gerar_documento(tipo, dados)
+    if isinstance(destino, (str, os.PathLike)):
+        with open(destino, "wb") as arquivo:
+            arquivo.write(conteudo)
+    else:
+        destino.write(conteudo)
+
+
+def formato_documento(tipo: str) -> tuple:
+    """``(extensão, tipo MIME)`` da saída do tipo."""
+    return _documento(tipo)["formato"]
+
+
+def tipos_documento() -> list:
+    """Tipo, descrição, extensão e MIME de cada documento (para listagens)."""
+    return [
+        {
+            "tipo": tipo,
+            "descricao": documento["descricao"],
+            "extensao": documento["formato"][0],
+            "mime": documento["formato"][1],
+        }
+        for tipo, documento in DOCUMENTOS.items()
+    ]
@@ -0,0 +1,316 @@
+"""
+Extração de texto de PDFs e DOCX enviados, com backends intercambiáveis para PDF.
+
+O backend preferido é o PyMuPDF (``fitz``): mais rápido e, como remonta as
+linhas a partir das posições das palavras (de cima para baixo, da esquerda
+para a direita), mantém "RÓTULO: valor" na ordem que as regexes de
+``services.parsers`` esperam. O PyPDF2 fica como alternativa quando o
+PyMuPDF não está instalado ou falha no arquivo.
+
+``python -m services.extracao [arquivos.pdf ...]`` compara os backends
+(tempo e campos reconhecidos) nos PDFs de ``pdf/`` e em documentos gerados.
+"""
+
+import time
+import zipfile
+from io import BytesIO
+from xml.etree import ElementTree
+
+
+def _importar_fitz():
+    try:
+        import pymupdf as fitz
+    except ImportError:
+        import fitz  # nomes antigos do PyMuPDF
+    return fitz
+
+
+# folga (em pontos) para o valor começar um pouco antes do rótulo da coluna
+_TOLERANCIA_COLUNA = 2.0
+
+
+def _extrair_fitz(dados: bytes) -> str:
+    fitz = _importar_fitz()
+    paginas = []
+    with fitz.open(stream=dados, filetype="pdf") as doc:
+        for pagina in doc:
+            paginas.append(_texto_por_linhas(pagina.get_text("words")))
+    return "\n".join(paginas)
+
+
+def _texto_por_linhas(palavras) -> str:
+    """
+    Agrupa as palavras em linhas visuais: palavras cujo centro vertical fica
+    dentro da altura da linha corrente pertencem a ela. Cada linha é lida da
+    esquerda para a direita. Uma linha só de rótulos em colunas ("SAÍDA:
+    KM: Responsável Transporte:") seguida da linha dos valores, um embaixo de
+    cada rótulo, vira uma linha "RÓTULO: valor" por coluna, como no PyPDF2.
+    """
+    palavras = sorted(palavras, key=lambda p: ((p[1] + p[3]) / 2, p[0]))
+    linhas = []
+    for x0, y0, x1, y1, texto, *_ in palavras:
+        centro = (y0 + y1) / 2
+        if linhas and linhas[-1]["topo"] <= centro <= linhas[-1]["base"]:
+            linha = linhas[-1]
+            linha["topo"] = min(linha["topo"], y0)
+            linha["base"] = max(linha["base"], y1)
+        else:
+            linha = {"topo": y0, "base": y1, "palavras": []}
+            linhas.append(linha)
+        linha["palavras"].append((x0, x1, texto))
+
+    saida = []
+    trechos = [_trechos(linha) for linha in linhas]
+    indice = 0
+    while indice < len(trechos):
+        pares = _rotulos_e_valores(trechos[indice], trechos[indice + 1]) if indice + 1 < len(trechos) else None
+        if pares is None:
+            saida.append(" ".join(texto for _, texto in trechos[indice]))
+            indice += 1
+        else:
+            saida.extend(f"{rotulo} {valor}".strip() for rotulo, valor in pares)
+            indice += 2
+    return "\n".join(saida)
+
+
+def _trechos(linha: dict) -> list:
+    """``[(x0, texto)]`` da linha, separando onde o espaço entre palavras passa de uma altura de linha."""
+    palavras = sorted(linha["palavras"])
+    limite = linha["base"] - linha["topo"]
+    trechos = []
+    fim_anterior = None
+    for x0, x1, texto in palavras:
+        if fim_anterior is not None and x0 - fim_anterior <= limite:
+            inicio, anterior = trechos[-1]
+            trechos[-1] = (inicio, f"{anterior} {texto}")
+        else:
+            trechos.append((x0, texto))
+        fim_anterior = x1
+    return trechos
+
+
+def _rotulos_e_valores(rotulos: list, valores: list):
+    """
+    ``[(rótulo, valor)]`` quando ``rotulos`` é uma linha de duas ou mais
+    colunas terminadas em ":" e cada trecho de ``valores`` começa embaixo de
+    uma delas; None se não for esse o caso.
+    """
+    if len(rotulos) < 2 or not all(texto.endswith(":") for _, texto in rotulos):
+        return None
+    colunas = {indice: [] for indice in range(len(rotulos))}
+    for x0, texto in valores:
+        coluna = None
+        for indice, (inicio, _) in enumerate(rotulos):
+            if inicio <= x0 + _TOLERANCIA_COLUNA:
+                coluna = indice
+        if coluna is None:
+            return None
+        colunas[coluna].append(texto)
+    return [(rotulo, " ".join(colunas[indice])) for indice, (_, rotulo) in enumerate(rotulos)]
+
+
+def _extrair_pypdf2(dados: bytes) -> str:
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(BytesIO(dados))
+    return "\n".join(pagina.extract_text() or "" for pagina in reader.pages)
+
+
+BACKENDS_PDF = {
+    "fitz": _extrair_fitz,
+    "pypdf2": _extrair_pypdf2,
+}
+ORDEM_PADRAO = ("fitz", "pypdf2")
+
+
+def backends_disponiveis() -> list:
+    disponiveis = []
+    for nome in ORDEM_PADRAO:
+        try:
+            if nome == "fitz":
+                _importar_fitz()
+            else:
+                import PyPDF2  # noqa: F401
+        except ImportError:
+            continue
+        disponiveis.append(nome)
+    return disponiveis
+
+
+def extrair_texto_pdf(dados: bytes, backends=ORDEM_PADRAO):
+    """
+    Devolve ``(texto, backend_usado)`` usando o primeiro backend disponível
+    que produzir texto; ``("", None)`` se nenhum conseguir.
+    """
+    for nome in backends:
+        try:
+            texto = BACKENDS_PDF[nome](dados)
+        except ImportError:
+            continue
+        except Exception:
+            # PDF que o backend não entende: tenta o próximo
+            continue
+        if texto and texto.strip():
+            return texto, nome
+    return "", None
+
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+
+def extrair_texto_docx(dados: bytes) -> str:
+    """
+    Texto de um DOCX lido em fluxo de ``word/document.xml`` (sem montar o
+    modelo do python-docx): uma linha por parágrafo fora de tabela e uma por
+    célula, na ordem do documento. Células que só continuam uma mesclagem
+    vertical são puladas e as mescladas na horizontal já são uma célula só,
+    então nada sai repetido. Cada bloco processado é descartado da árvore.
+    """
+    linhas = []
+    celulas = []  # pilha de células abertas (tabelas aninhadas)
+    paragrafos = []  # pilha de parágrafos abertos (caixas de texto)
+    dentro_fallback = 0
+    pilha = []
+    with zipfile.ZipFile(BytesIO(dados)) as arquivo_zip, arquivo_zip.open("word/document.xml") as xml:
+        for evento, elemento in ElementTree.iterparse(xml, events=("start", "end")):
+            tag = elemento.tag
+            if evento == "start":
+                pilha.append(elemento)
+                if tag == _FALLBACK:
+                    # mc:Fallback repete o conteúdo de mc:Choice
+                    dentro_fallback += 1
+                elif dentro_fallback:
+                    pass
+                elif tag == f"{_W}p":
+                    paragrafos.append([])
+                elif tag == f"{_W}tc":
+                    celulas.append({"partes": [], "continua": False})
+                continue
+
+            pilha.pop()
+            if tag == _FALLBACK:
+                dentro_fallback -= 1
+            elif dentro_fallback:
+                pass
+            elif tag == f"{_W}t" and paragrafos:
+                paragrafos[-1].append(elemento.text or "")
+            elif tag == f"{_W}tab" and paragrafos:
+                paragrafos[-1].append("\t")
+            elif tag in (f"{_W}br", f"{_W}cr") and paragrafos:
+                paragrafos[-1].append("\n")
+            elif tag == f"{_W}vMerge" and celulas:
+                celulas[-1]["continua"] = elemento.get(f"{_W}val", "continue") == "continue"
+            elif tag == f"{_W}p":
+                texto = "".join(paragrafos.pop())
+                if celulas:
+                    celulas[-1]["partes"].append(texto)
+                elif texto.strip():
+                    linhas.append(texto)
+            elif tag == f"{_W}tc":
+                celula = celulas.pop()
+                texto = "\n".join(celula["partes"])
+                if not celula["continua"] and texto.strip():
+                    linhas.append(texto)
+
+            if tag in (f"{_W}p", f"{_W}tbl") and pilha:
+                # bloco já lido: solta da árvore para a memória não crescer
+                pilha[-1].remove(elemento)
+    return "\n".join(linhas)
+
+
+def extrair_texto(nome_arquivo: str, dados: bytes) -> str:
+    """
+    Texto de um PDF ou DOCX (pelo nome do arquivo); "" para outros tipos.
+    Levanta RuntimeError com a mensagem para o usuário quando falta a
+    biblioteca de PDF ou o DOCX não pode ser lido.
+    """
+    nome = (nome_arquivo or "").lower()
+    if nome.endswith(".pdf"):
+        if not backends_disponiveis():
+            raise RuntimeError("Instale PyMuPDF ou PyPDF2 (pip install pymupdf) para ler PDFs.")
+        texto, _ = extrair_texto_pdf(dados)
+        return texto
+    if nome.endswith(".docx"):
+        try:
+            return extrair_texto_docx(dados)
+        except (KeyError, zipfile.BadZipFile, ElementTree.ParseError) as exc:
+            raise RuntimeError(f"Erro ao ler DOCX: {exc}") from exc
+    return ""
+
+
+def comparar_backends(arquivos, repeticoes: int = 3) -> list:
+    """
+    Para cada (nome, bytes) em ``arquivos`` mede o tempo médio de cada backend
+    e quantos campos de ``_parse_campos`` e de
+    ``_parse_autorizacao_viagem_manual_campos`` foram reconhecidos.
+    """
+    from services.parsers import _parse_autorizacao_viagem_manual_campos, _parse_campos
+
+    resultados = []
+    for nome_arquivo, dados in arquivos:
+        for backend in backends_disponiveis():
+            funcao = BACKENDS_PDF[backend]
+            inicio = time.perf_counter()
+            for _ in range(repeticoes):
+                texto = funcao(dados)
+            tempo = (time.perf_counter() - inicio) / repeticoes
+            campos = {**_parse_campos(texto), **_parse_autorizacao_viagem_manual_campos(texto)}
+            resultados.append(
+                {
+                    "arquivo": nome_arquivo,
+                    "backend": backend,
+                    "ms": tempo * 1000,
+                    "campos": sum(1 for valor in campos.values() if valor and valor != "__/__/____"),
+                    "caracteres": len(texto),
+                }
+            )
+    return resultados
+
+
+def _arquivos_exemplo() -> list:
+    from pathlib import Path
+
+    from benchmarks.casos import AUTORIZACAO_VIAGEM, LOGO_IDARON
+    from pdf.autorizacao_viagem_manual import build_pdf_autorizacao_viagem_manual
+    from services.pdf_builders import CAMPOS_FOLHA, CAMPOS_RELATORIO, gerar_pdf, gerar_relatorio_pdf
+
+    arquivos = [(caminho.name, caminho.read_bytes()) for caminho in sorted(Path("pdf").glob("*.pdf"))]
+    campos = {campo: "" for campo in CAMPOS_FOLHA}
+    campos.update(
+        secretaria="SEJUS",
+        reeducando="JOÃO DA SILVA",
+        funcao="AUXILIAR DE SERVIÇOS GERAIS",
+        data_inclusao="10/01/2025",
+        municipio="SÃO MIGUEL DO GUAPORÉ",
+        cpf="123.456.789-00",
+        banco="001",
+        agencia="1234-5",
+        conta="12345-6",
+        tipo_conta="Corrente",
+        endereco="RUA DAS FLORES, 100",
+        cep="76.932-000",
+        telefone="69 99999-0000",
+        data_preenchimento="01/02/2026",
+    )
+    arquivos.append(("folha gerada", gerar_pdf(ano=2026, mes=3, he="07:30", hs="13:30", **campos)))
+    relatorio = {campo: campos.get(campo, "") for campo in CAMPOS_RELATORIO}
+    arquivos.append(("relatório gerado", gerar_relatorio_pdf(ano=2026, mes=3, **relatorio)))
+    arquivos.append(("autorização gerada", build_pdf_autorizacao_viagem_manual(AUTORIZACAO_VIAGEM, LOGO_IDARON)))
+    return arquivos
+
+
+if __name__ == "__main__":
+    import sys
+    from pathlib import Path
+
+    if len(sys.argv) > 1:
+        entrada = [(Path(caminho).name, Path(caminho).read_bytes()) for caminho in sys.argv[1:]]
+    else:
+        entrada = _arquivos_exemplo()
+    print(f"{'arquivo':<32} {'backend':<8} {'ms':>8} {'campos':>7} {'chars':>7}")
+    for linha in comparar_backends(entrada):
+        print(
+            f"{linha['arquivo'][:32]:<32} {linha['backend']:<8} {linha['ms']:>8.2f} "
+            f"{linha['campos']:>7} {linha['caracteres']:>7}"
+        )
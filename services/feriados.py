@@ -0,0 +1,137 @@
+"""
+Calendário de feriados: nacionais, de Rondônia e municipais.
+
+Os feriados são declarados como dados (tabelas abaixo); os móveis saem da
+data da Páscoa. ``calendario_ano(ano, municipio)`` calcula o ano inteiro uma
+vez e guarda um bitmap por mês (bit ``dia - 1`` ligado = feriado) e o nome de
+cada feriado; ``feriados_do_mes`` aplica por cima os ajustes manuais da tela.
+``indice_mes`` guarda quantos dias o mês tem e o dia da semana de cada um,
+usado pelas linhas de dias da folha e do relatório.
+"""
+
+import calendar
+from datetime import date, timedelta
+from functools import lru_cache
+from unicodedata import combining, normalize
+
+
+# (mês, dia, nome, primeiro ano em vigor)
+FERIADOS_NACIONAIS = (
+    (1, 1, "Confraternização Universal", None),
+    (4, 21, "Tiradentes", None),
+    (5, 1, "Dia do Trabalho", None),
+    (9, 7, "Independência do Brasil", None),
+    (10, 12, "Nossa Senhora Aparecida", None),
+    (11, 2, "Finados", None),
+    (11, 15, "Proclamação da República", None),
+    (11, 20, "Dia Nacional de Zumbi e da Consciência Negra", 2024),  # Lei 14.759/2023
+    (12, 25, "Natal", None),
+)
+
+# (dias a partir do domingo de Páscoa, nome, ponto facultativo?)
+FERIADOS_MOVEIS = (
+    (-48, "Carnaval", True),
+    (-47, "Carnaval", True),
+    (-2, "Sexta-feira Santa", False),
+    (60, "Corpus Christi", True),
+)
+
+FERIADOS_ESTADUAIS = {
+    "RO": (
+        (1, 4, "Criação do Estado de Rondônia", None),
+        (6, 18, "Dia do Evangélico", None),
+    ),
+}
+
+# chave: nome do município sem acentos, em maiúsculas (veja ``chave_municipio``);
+# cada entrada segue a lei municipal correspondente
+FERIADOS_MUNICIPAIS = {
+    "PORTO VELHO": (
+        (10, 2, "Aniversário de Porto Velho", None),
+    ),
+}
+
+UF_PADRAO = "RO"
+
+
+def pascoa(ano: int) -> date:
+    """Domingo de Páscoa (algoritmo de Meeus/Jones/Butcher, calendário gregoriano)."""
+    a = ano % 19
+    b, c = divmod(ano, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7  # noqa: E741
+    m = (a + 11 * h + 22 * l) // 451
+    mes, dia = divmod(h + l - 7 * m + 114, 31)
+    return date(ano, mes, dia + 1)
+
+
+def chave_municipio(municipio) -> str:
+    """ "São Miguel do Guaporé/RO" -> "SAO MIGUEL DO GUAPORE"."""
+    texto = "".join(ch for ch in normalize("NFKD", str(municipio or "")) if not combining(ch))
+    texto = texto.upper().replace("-", " ").replace("/", " ").split()
+    if texto and texto[-1] == UF_PADRAO:
+        texto = texto[:-1]
+    return " ".join(texto)
+
+
+@lru_cache(maxsize=256)
+def calendario_ano(ano: int, municipio: str = "", facultativos: bool = False) -> tuple:
+    """
+    ``(bitmaps, nomes)`` do ano: ``bitmaps[mes - 1]`` tem o bit ``dia - 1``
+    ligado para cada feriado e ``nomes[(mes, dia)]`` a descrição. Guardado
+    por (ano, município, facultativos).
+    """
+    ano = int(ano)
+    nomes = {}
+
+    def incluir(dia: date, nome: str) -> None:
+        nomes.setdefault((dia.month, dia.day), nome)
+
+    fixos = FERIADOS_NACIONAIS + FERIADOS_ESTADUAIS.get(UF_PADRAO, ())
+    fixos += FERIADOS_MUNICIPAIS.get(chave_municipio(municipio), ())
+    for mes, dia, nome, desde in fixos:
+        if desde is None or ano >= desde:
+            incluir(date(ano, mes, dia), nome)
+    domingo_pascoa = pascoa(ano)
+    for deslocamento, nome, facultativo in FERIADOS_MOVEIS:
+        if facultativos or not facultativo:
+            incluir(domingo_pascoa + timedelta(days=deslocamento), nome)
+
+    bitmaps = [0] * 12
+    for mes, dia in nomes:
+        bitmaps[mes - 1] |= 1 << (dia - 1)
+    return tuple(bitmaps), nomes
+
+
+def feriados_do_mes(ano, mes, municipio="", ajustes=None, facultativos=False) -> dict:
+    """
+    {dia: descrição} dos feriados do mês, com ``ajustes`` ({dia: descrição},
+    como o de ``parse_feriados_text``) por cima: acrescentam ou renomeiam
+    dias; descrição vazia/None retira o feriado automático daquele dia.
+    """
+    bitmaps, nomes = calendario_ano(int(ano), chave_municipio(municipio), facultativos)
+    bitmap = bitmaps[int(mes) - 1]
+    feriados = {}
+    dia = 1
+    while bitmap:
+        if bitmap & 1:
+            feriados[dia] = nomes[(int(mes), dia)]
+        bitmap >>= 1
+        dia += 1
+    for dia, nome in (ajustes or {}).items():
+        if nome:
+            feriados[int(dia)] = nome
+        else:
+            feriados.pop(int(dia), None)
+    return dict(sorted(feriados.items()))
+
+
+@lru_cache(maxsize=512)
+def indice_mes(ano: int, mes: int) -> tuple:
+    """``(dias_no_mes, dias_da_semana)``; ``dias_da_semana[dia - 1]`` vai de 0 (segunda) a 6."""
+    primeiro, dias_no_mes = calendar.monthrange(int(ano), int(mes))
+    return dias_no_mes, tuple((primeiro + deslocamento) % 7 for deslocamento in range(dias_no_mes))
@@ -0,0 +1,192 @@
+"""
+Gravação em segundo plano dos documentos gerados pelas telas.
+
+O clique em "Gerar" não espera mais o disco: a tela entrega os bytes a
+``agendar`` (que devolve um código da tarefa na hora), mostra a prévia e o
+download, e uma thread dedicada grava no registro (``services.registro_documentos``).
+A thread junta o que estiver na fila num lote: um fsync por arquivo e por
+pasta e uma transação no banco para o lote inteiro, com gravação atômica
+(temporário + rename). Depois de cada lote os documentos novos entram no
+índice de busca (``services.busca_documentos``).
+
+A fila é limitada (``CAPACIDADE``): se o disco não acompanhar, ``agendar``
+espera vaga em vez de acumular PDFs na memória. ``mostrar_situacao`` exibe na
+tela "Salvando..." até a tarefa terminar e depois onde o arquivo ficou.
+"""
+
+import atexit
+import queue
+import threading
+import uuid
+from collections import OrderedDict
+
+from services.busca_documentos import indexar_pendentes
+from services.registro_documentos import registrar_varios
+
+
+CAPACIDADE = 64
+LOTE_MAXIMO = 16
+# quantas tarefas concluídas ficam consultáveis por ``situacao``
+HISTORICO = 1000
+ESPERA_SAIDA = 10.0
+
+_FILA = queue.Queue(CAPACIDADE)
+_TAREFAS = OrderedDict()
+_LOCK = threading.Lock()
+_THREAD = {"gravador": None}
+_ESTATISTICAS = {"agendadas": 0, "gravadas": 0, "erros": 0, "lotes": 0, "maior_lote": 0}
+
+
+def _iniciar() -> None:
+    with _LOCK:
+        gravador = _THREAD["gravador"]
+        if gravador is not None and gravador.is_alive():
+            return
+        gravador = threading.Thread(target=_trabalhar, name="gravador-documentos", daemon=True)
+        _THREAD["gravador"] = gravador
+    gravador.start()
+
+
+def agendar(
+    conteudo: bytes,
+    tipo: str,
+    nome_arquivo: str,
+    mime: str = "application/pdf",
+    pessoa: str = "",
+    numero: str = "",
+    data: str = "",
+) -> str:
+    """Põe o documento na fila de gravação e devolve o código da tarefa."""
+    _iniciar()
+    tarefa = uuid.uuid4().hex
+    pedido = {
+        "conteudo": conteudo,
+        "tipo": tipo,
+        "nome_arquivo": nome_arquivo,
+        "mime": mime,
+        "pessoa": pessoa,
+        "numero": numero,
+        "data": data,
+    }
+    with _LOCK:
+        _TAREFAS[tarefa] = {"estado": "pendente", "nome_arquivo": nome_arquivo}
+        while len(_TAREFAS) > HISTORICO:
+            _TAREFAS.popitem(last=False)
+        _ESTATISTICAS["agendadas"] += 1
+    _FILA.put((tarefa, pedido))
+    return tarefa
+
+
+def _concluir(tarefas, registros=None, erro=None) -> None:
+    with _LOCK:
+        for indice, tarefa in enumerate(tarefas):
+            if tarefa not in _TAREFAS:
+                continue
+            if erro is None:
+                registro = registros[indice]
+                _TAREFAS[tarefa] = {
+                    "estado": "gravada",
+                    "nome_arquivo": registro["nome_arquivo"],
+                    "id": registro["id"],
+                    "caminho": registro["caminho"],
+                }
+            else:
+                _TAREFAS[tarefa] = {**_TAREFAS[tarefa], "estado": "erro", "erro": erro}
+        if erro is None:
+            _ESTATISTICAS["gravadas"] += len(tarefas)
+        else:
+            _ESTATISTICAS["erros"] += len(tarefas)
+        _ESTATISTICAS["lotes"] += 1
+        _ESTATISTICAS["maior_lote"] = max(_ESTATISTICAS["maior_lote"], len(tarefas))
+
+
+def _trabalhar() -> None:
+    while True:
+        lote = [_FILA.get()]
+        while len(lote) < LOTE_MAXIMO:
+            try:
+                lote.append(_FILA.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            _gravar_lote(lote)
+        finally:
+            for _ in lote:
+                _FILA.task_done()
+
+
+def _gravar_lote(lote) -> None:
+    tarefas = [tarefa for tarefa, _ in lote]
+    try:
+        registros = registrar_varios([pedido for _, pedido in lote])
+    except Exception as exc:
+        if len(lote) == 1:
+            _concluir(tarefas, erro=f"{type(exc).__name__}: {exc}")
+            return
+        # um pedido com problema não derruba os outros do lote
+        for item in lote:
+            _gravar_lote([item])
+    else:
+        _concluir(tarefas, registros)
+        try:
+            indexar_pendentes()
+        except Exception:
+            # o índice se recupera no próximo lote (ou com ``indexar``); o arquivo já está salvo
+            pass
+
+
+def situacao(tarefa: str) -> dict:
+    """``{"estado": "pendente" | "gravada" | "erro" | "desconhecida", ...}``."""
+    with _LOCK:
+        return dict(_TAREFAS.get(tarefa) or {"estado": "desconhecida"})
+
+
+def aguardar(timeout: float = ESPERA_SAIDA) -> bool:
+    """Espera a fila esvaziar (até ``timeout`` segundos); True se esvaziou."""
+    fim = threading.Event()
+
+    def _esperar():
+        _FILA.join()
+        fim.set()
+
+    threading.Thread(target=_esperar, daemon=True).start()
+    return fim.wait(timeout)
+
+
+def estatisticas_gravacao() -> dict:
+    with _LOCK:
+        return {**_ESTATISTICAS, "na_fila": _FILA.qsize(), "capacidade": CAPACIDADE}
+
+
+def mostrar_situacao(tarefa, rotulo: str = "Salvo em") -> None:
+    """
+    Legenda com o andamento da gravação. Enquanto a tarefa está pendente, um
+    fragmento consulta a situação a cada meio segundo e, ao terminar, refaz a
+    página uma vez para trocar a legenda.
+    """
+    import streamlit as st  # lazy import: o gravador também roda fora da UI
+
+    if not tarefa:
+        return
+    if situacao(tarefa)["estado"] != "pendente":
+        _legenda(st, situacao(tarefa), rotulo)
+        return
+
+    @st.fragment(run_every=0.5)
+    def _acompanhar():
+        if situacao(tarefa)["estado"] == "pendente":
+            st.caption("Salvando no registro de documentos...")
+        else:
+            st.rerun()
+
+    _acompanhar()
+
+
+def _legenda(st, estado: dict, rotulo: str) -> None:
+    if estado["estado"] == "gravada":
+        st.caption(f"{rotulo}: {estado['caminho']}")
+    elif estado["estado"] == "erro":
+        st.warning(f"Não foi possível salvar {estado['nome_arquivo']}: {estado['erro']}")
+
+
+atexit.register(aguardar)
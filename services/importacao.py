@@ -0,0 +1,136 @@
+"""
+Importação em massa das folhas do mês anterior.
+
+Recebe vários PDFs/DOCX (ou ZIPs com eles), extrai e interpreta cada arquivo
+em paralelo num ``ProcessPoolExecutor`` e devolve uma linha por arquivo com
+os dados do reeducando, o tempo gasto e o status. As linhas alimentam a
+tabela editável da tela, de onde sai o lote de folhas (``services.lote``).
+"""
+
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from services.lote import CONTEXTO_PROCESSOS, workers_padrao
+from services.parsers import _campos_arquivo, _parse_campos
+
+
+EXTENSOES = (".pdf", ".docx")
+
+# colunas do reeducando levadas para a tabela; mês, ano e data de
+# preenchimento são do mês anterior e vêm da tela na hora de gerar
+COLUNAS_DADOS = (
+    "reeducando", "funcao", "data_inclusao", "municipio", "cpf", "banco", "agencia",
+    "conta", "tipo_conta", "endereco", "cep", "telefone", "secretaria",
+)
+COLUNAS_ROSTER = ("gerar", *COLUNAS_DADOS, "arquivo", "status", "ms")
+
+# abaixo disso o custo de subir o pool é maior que o ganho
+_MINIMO_PARALELO = 4
+
+
+def expandir_arquivos(arquivos) -> tuple:
+    """
+    Recebe ``(nome, bytes)`` enviados e devolve ``(entradas, erros)``:
+    PDFs/DOCX passam direto e os ZIPs são abertos (entradas "zip/arquivo").
+    """
+    entradas = []
+    erros = []
+    for nome, dados in arquivos:
+        minusculo = nome.lower()
+        if minusculo.endswith(EXTENSOES):
+            entradas.append((nome, dados))
+            continue
+        if not minusculo.endswith(".zip"):
+            erros.append(f"{nome}: tipo de arquivo não suportado")
+            continue
+        try:
+            with zipfile.ZipFile(BytesIO(dados)) as arquivo_zip:
+                for info in arquivo_zip.infolist():
+                    caminho = PurePosixPath(info.filename)
+                    if info.is_dir() or "__MACOSX" in caminho.parts or caminho.name.startswith("."):
+                        continue
+                    if caminho.suffix.lower() in EXTENSOES:
+                        entradas.append((f"{nome}/{info.filename}", arquivo_zip.read(info)))
+        except zipfile.BadZipFile:
+            erros.append(f"{nome}: ZIP inválido")
+    return entradas, erros
+
+
+def processar_arquivo(nome: str, dados: bytes) -> dict:
+    """
+    Extrai e interpreta um arquivo (executado nos processos do pool).
+    Devolve a linha da tabela; ``status`` é "ok" ou a descrição do erro.
+    """
+    inicio = time.perf_counter()
+    linha = {coluna: "" for coluna in COLUNAS_DADOS}
+    try:
+        campos = _campos_arquivo(nome, dados, _parse_campos)
+    except RuntimeError as exc:
+        campos, status = {}, str(exc)
+    else:
+        status = "ok" if campos else "sem texto legível"
+    if campos:
+        linha.update({coluna: str(campos.get(coluna) or "") for coluna in COLUNAS_DADOS})
+        if not linha["reeducando"]:
+            status = "reeducando não encontrado"
+    linha.update(
+        gerar=status == "ok",
+        arquivo=nome,
+        status=status,
+        ms=round((time.perf_counter() - inicio) * 1000, 1),
+    )
+    return linha
+
+
+def importar_arquivos(entradas, workers=None, progresso=None) -> list:
+    """
+    Processa as entradas ``(nome, bytes)`` em paralelo e devolve as linhas na
+    ordem de envio. ``progresso(concluidos, total)`` é chamado a cada arquivo.
+    """
+    total = len(entradas)
+    workers = max(1, int(workers or workers_padrao()))
+    if workers == 1 or total < _MINIMO_PARALELO:
+        linhas = []
+        for indice, (nome, dados) in enumerate(entradas):
+            linhas.append(processar_arquivo(nome, dados))
+            if progresso:
+                progresso(indice + 1, total)
+        return linhas
+
+    linhas = [None] * total
+    with ProcessPoolExecutor(max_workers=min(workers, total), mp_context=CONTEXTO_PROCESSOS) as executor:
+        futuros = {
+            executor.submit(processar_arquivo, nome, dados): indice
+            for indice, (nome, dados) in enumerate(entradas)
+        }
+        for concluidos, futuro in enumerate(as_completed(futuros), start=1):
+            indice = futuros[futuro]
+            try:
+                linhas[indice] = futuro.result()
+            except Exception as exc:
+                # processo do pool caiu (arquivo que derruba a biblioteca)
+                linhas[indice] = {
+                    **{coluna: "" for coluna in COLUNAS_DADOS},
+                    "gerar": False,
+                    "arquivo": entradas[indice][0],
+                    "status": f"falha: {exc}",
+                    "ms": 0.0,
+                }
+            if progresso:
+                progresso(concluidos, total)
+    return linhas
+
+
+def linhas_para_lote(linhas) -> list:
+    """
+    Linhas marcadas em "gerar" no formato de ``ler_roster`` (para
+    ``preparar_lote``), com ``"_linha"`` = posição na tabela.
+    """
+    return [
+        {**{coluna: str(linha.get(coluna) or "").strip() for coluna in COLUNAS_DADOS}, "_linha": numero}
+        for numero, linha in enumerate(linhas, start=1)
+        if linha.get("gerar")
+    ]
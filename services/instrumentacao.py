@@ -0,0 +1,205 @@
+"""
+Medição de tempo e memória dos geradores e leitores de documentos.
+
+``medido(tipo)`` envolve os ``build_pdf_*``/``gerar_*`` (por fora de
+``em_cache``, para medir o que o usuário espera), ``_ler_upload`` e os
+``_parse_*``. Cada chamada amostrada vira um registro com tempo de relógio,
+tempo de CPU da thread, tamanho da saída e se veio do cache de documentos;
+uma fração delas também roda sob ``tracemalloc`` e registra o pico de
+memória. Os registros ficam num buffer circular (os ``CAPACIDADE`` mais
+recentes), resumidos por tipo em ``resumo_medicoes`` (página oculta de
+diagnóstico) e exportados em JSON lines por ``exportar_jsonl``.
+
+O ``tracemalloc`` deixa a chamada várias vezes mais lenta, então as chamadas
+com memória medida não entram nos percentis de tempo. Ele é global ao
+processo: só uma chamada por vez é medida, e alocações de outras sessões que
+rodarem ao mesmo tempo entram no pico (que é, portanto, aproximado).
+"""
+
+import json
+import math
+import os
+import random
+import threading
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime
+from functools import wraps
+
+from pdf.modelo_pagina import VERSAO_LAYOUT
+from services.cache_documentos import ultima_consulta_no_cache
+
+
+CAPACIDADE = 2000
+# fração das chamadas registradas e, delas, fração com pico de memória
+AMOSTRAGEM = {"tempo": 1.0, "memoria": 0.05}
+
+_REGISTROS = deque(maxlen=CAPACIDADE)
+_LOCK = threading.Lock()
+# só uma medição de memória por vez (tracemalloc é do processo inteiro)
+_LOCK_MEMORIA = threading.Lock()
+_ESTATISTICAS = {"chamadas": 0, "registradas": 0, "com_memoria": 0}
+
+
+def configurar_amostragem(tempo=None, memoria=None) -> None:
+    """Ajusta as frações amostradas (0 a 1)."""
+    with _LOCK:
+        if tempo is not None:
+            AMOSTRAGEM["tempo"] = min(1.0, max(0.0, float(tempo)))
+        if memoria is not None:
+            AMOSTRAGEM["memoria"] = min(1.0, max(0.0, float(memoria)))
+
+
+def _tamanho(resultado, destino):
+    """Bytes do documento (ou do arquivo em ``destino``), caracteres do texto, itens do resto."""
+    if resultado is None and isinstance(destino, (str, os.PathLike)):
+        try:
+            return os.path.getsize(destino)
+        except OSError:
+            return None
+    try:
+        return len(resultado)
+    except TypeError:
+        return None
+
+
+def _registrar(registro: dict) -> None:
+    with _LOCK:
+        _REGISTROS.append(registro)
+        _ESTATISTICAS["registradas"] += 1
+        if registro["pico_kb"] is not None:
+            _ESTATISTICAS["com_memoria"] += 1
+
+
+def medido(tipo: str):
+    """Decorator que registra as chamadas de ``funcao`` sob ``tipo``."""
+
+    def decorar(funcao):
+        nome = f"{funcao.__module__}.{funcao.__qualname__}"
+
+        @wraps(funcao)
+        def envoltorio(*args, **kwargs):
+            with _LOCK:
+                _ESTATISTICAS["chamadas"] += 1
+            if random.random() >= AMOSTRAGEM["tempo"]:
+                return funcao(*args, **kwargs)
+
+            # tracemalloc já ligado = outra medição (ou ferramenta externa) em curso
+            memoria = (
+                random.random() < AMOSTRAGEM["memoria"]
+                and not tracemalloc.is_tracing()
+                and _LOCK_MEMORIA.acquire(blocking=False)
+            )
+            erro = None
+            pico = None
+            ultima_consulta_no_cache()  # descarta a marca de uma chamada anterior
+            quando = time.time()
+            if memoria:
+                tracemalloc.start()
+            inicio_cpu = time.thread_time()
+            inicio = time.perf_counter()
+            try:
+                resultado = funcao(*args, **kwargs)
+                return resultado
+            except Exception as exc:
+                resultado = None
+                erro = type(exc).__name__
+                raise
+            finally:
+                segundos = time.perf_counter() - inicio
+                segundos_cpu = time.thread_time() - inicio_cpu
+                if memoria:
+                    pico = tracemalloc.get_traced_memory()[1]
+                    tracemalloc.stop()
+                    _LOCK_MEMORIA.release()
+                _registrar(
+                    {
+                        "tipo": tipo,
+                        "funcao": nome,
+                        "quando": datetime.fromtimestamp(quando).isoformat(timespec="milliseconds"),
+                        "layout": VERSAO_LAYOUT,
+                        "ms": round(segundos * 1000, 3),
+                        "cpu_ms": round(segundos_cpu * 1000, 3),
+                        "pico_kb": None if pico is None else round(pico / 1024, 1),
+                        "tamanho": None if erro else _tamanho(resultado, kwargs.get("destino")),
+                        "cache": ultima_consulta_no_cache(),
+                        "erro": erro,
+                    }
+                )
+
+        return envoltorio
+
+    return decorar
+
+
+def registros() -> list:
+    """Cópia dos registros do buffer, do mais antigo ao mais recente."""
+    with _LOCK:
+        return [dict(registro) for registro in _REGISTROS]
+
+
+def _percentil(valores: list, fracao: float):
+    """Percentil pelo posto mais próximo (valores já ordenados)."""
+    if not valores:
+        return None
+    return valores[max(0, math.ceil(fracao * len(valores)) - 1)]
+
+
+def resumo_medicoes() -> list:
+    """
+    Uma linha por tipo: chamadas, acertos de cache, erros, p50/p95/máximo do
+    tempo e do CPU (só chamadas geradas de fato, sem cache nem tracemalloc),
+    maior pico de memória e tamanho mediano da saída.
+    """
+    por_tipo = {}
+    for registro in registros():
+        por_tipo.setdefault(registro["tipo"], []).append(registro)
+
+    linhas = []
+    for tipo, itens in sorted(por_tipo.items()):
+        gerados = [r for r in itens if not r["cache"] and r["pico_kb"] is None and not r["erro"]]
+        tempos = sorted(r["ms"] for r in gerados)
+        cpu = sorted(r["cpu_ms"] for r in gerados)
+        picos = [r["pico_kb"] for r in itens if r["pico_kb"] is not None]
+        tamanhos = sorted(r["tamanho"] for r in itens if r["tamanho"] is not None)
+        linhas.append(
+            {
+                "tipo": tipo,
+                "chamadas": len(itens),
+                "cache": sum(1 for r in itens if r["cache"]),
+                "erros": sum(1 for r in itens if r["erro"]),
+                "p50_ms": _percentil(tempos, 0.50),
+                "p95_ms": _percentil(tempos, 0.95),
+                "max_ms": tempos[-1] if tempos else None,
+                "p50_cpu_ms": _percentil(cpu, 0.50),
+                "p95_cpu_ms": _percentil(cpu, 0.95),
+                "max_pico_kb": max(picos) if picos else None,
+                "p50_tamanho": _percentil(tamanhos, 0.50),
+            }
+        )
+    return linhas
+
+
+def exportar_jsonl() -> bytes:
+    """Registros do buffer em JSON lines (um objeto por chamada)."""
+    return "".join(json.dumps(registro, ensure_ascii=False) + "\n" for registro in registros()).encode("utf-8")
+
+
+def estatisticas_instrumentacao() -> dict:
+    """Chamadas vistas, registradas, com memória medida e ocupação do buffer."""
+    with _LOCK:
+        return {
+            **_ESTATISTICAS,
+            "itens": len(_REGISTROS),
+            "capacidade": CAPACIDADE,
+            "amostragem_tempo": AMOSTRAGEM["tempo"],
+            "amostragem_memoria": AMOSTRAGEM["memoria"],
+        }
+
+
+def limpar_instrumentacao() -> None:
+    with _LOCK:
+        _REGISTROS.clear()
+        for chave in _ESTATISTICAS:
+            _ESTATISTICAS[chave] = 0
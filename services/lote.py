@@ -0,0 +1,334 @@
+"""
+Geração em lote de folhas de ponto e relatórios de atividades.
+
+Uma planilha (CSV ou XLSX) traz uma linha por reeducando, com as mesmas
+colunas de ``services.constants.DEFAULTS``; colunas ausentes ou vazias usam o
+valor padrão (ou o mês/ano/horários escolhidos na tela). Os PDFs são gerados
+em paralelo num ``ProcessPoolExecutor``, direto em arquivos temporários, e
+entregues num PDF único ou num ZIP com um arquivo por pessoa escrito em disco
+(veja ``services.saida``).
+"""
+
+import csv
+import multiprocessing
+import os
+import re
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from io import BytesIO, StringIO
+from unicodedata import normalize
+
+from services.constants import DEFAULTS, MESES
+from services.feriados import feriados_do_mes
+from services.instrumentacao import medido
+from services.pdf_builders import (
+    CAMPOS_FOLHA,
+    CAMPOS_RELATORIO,
+    gerar_pdf,
+    gerar_periodo_pdf,
+    gerar_relatorio_pdf,
+)
+
+
+TIPOS_DOCUMENTO = {
+    "folha": "Folha de ponto",
+    "relatorio": "Relatório de atividades",
+}
+
+# campos da planilha que não fazem sentido por pessoa
+_CAMPOS_IGNORADOS = {"feriados_texto"}
+
+# quantos PDFs o PdfMerger mantém abertos de uma vez
+_MAX_ABERTOS = 200
+# os pools de processos nascem dentro do servidor do Streamlit, que tem várias
+# threads rodando: um fork copiaria um lock preso (cache, instrumentação) e o
+# processo filho travaria nele; com "spawn" cada filho importa tudo de novo
+CONTEXTO_PROCESSOS = multiprocessing.get_context("spawn")
+
+
+def workers_padrao() -> int:
+    return max(1, min(os.cpu_count() or 1, 8))
+
+
+def _normaliza_coluna(nome) -> str:
+    """"Data da inclusão" -> "data_da_inclusao"; "Mês" -> "mes"."""
+    texto = normalize("NFKD", str(nome or "")).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^a-z0-9]+", "_", texto.strip().lower()).strip("_")
+
+
+# apelidos aceitos no cabeçalho da planilha, além dos próprios nomes de DEFAULTS
+_APELIDOS = {
+    "nome": "reeducando",
+    "funcao_cargo": "funcao",
+    "data_da_inclusao": "data_inclusao",
+    "data": "data_preenchimento",
+    "bco": "banco",
+    "ag": "agencia",
+    "tipo_da_conta": "tipo_conta",
+    "mes": "mes_label",
+}
+
+
+def _linhas_csv(dados: bytes) -> list:
+    try:
+        texto = dados.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        texto = dados.decode("latin-1")
+    try:
+        dialeto = csv.Sniffer().sniff(texto[:4096], delimiters=";,\t")
+    except csv.Error:
+        dialeto = csv.excel
+    return list(csv.DictReader(StringIO(texto), dialect=dialeto))
+
+
+def _linhas_xlsx(dados: bytes) -> list:
+    try:
+        import pandas as pd  # lazy import: pesado e só necessário para XLSX
+    except ImportError:
+        raise RuntimeError("Instale pandas e openpyxl (pip install pandas openpyxl) para ler XLSX.") from None
+    try:
+        tabela = pd.read_excel(BytesIO(dados), dtype=str)
+    except ImportError as exc:
+        raise RuntimeError("Instale openpyxl (pip install openpyxl) para ler XLSX.") from exc
+    return tabela.fillna("").to_dict(orient="records")
+
+
+def ler_roster(nome_arquivo: str, dados: bytes) -> list:
+    """
+    Lê a planilha e devolve uma lista de dicts com as chaves de ``DEFAULTS``
+    (só as colunas reconhecidas; valores já sem espaços nas pontas) e o
+    número da linha na planilha em ``"_linha"``. Linhas vazias são descartadas.
+    """
+    nome = (nome_arquivo or "").lower()
+    if nome.endswith((".xlsx", ".xls")):
+        brutas = _linhas_xlsx(dados)
+    else:
+        brutas = _linhas_csv(dados)
+
+    linhas = []
+    for numero, bruta in enumerate(brutas, start=2):  # linha 1 = cabeçalho
+        linha = {}
+        for coluna, valor in bruta.items():
+            chave = _normaliza_coluna(coluna)
+            chave = _APELIDOS.get(chave, chave)
+            if chave in DEFAULTS and chave not in _CAMPOS_IGNORADOS:
+                linha[chave] = str(valor if valor is not None else "").strip()
+        if any(linha.values()):
+            linha["_linha"] = numero
+            linhas.append(linha)
+    return linhas
+
+
+def _mes_numero(valor, padrao: int):
+    """Aceita "MARÇO", "marco" ou "3"; devolve None se não reconhecer."""
+    if not valor:
+        return padrao
+    texto = str(valor).strip()
+    if texto.isdigit():
+        mes = int(texto)
+        return mes if 1 <= mes <= 12 else None
+    alvo = _normaliza_coluna(texto)
+    for label, numero in MESES.items():
+        if _normaliza_coluna(label) == alvo:
+            return numero
+    return None
+
+
+def preparar_lote(linhas, ano, mes, he, hs, feriados=None, feriados_automaticos=False):
+    """
+    Completa cada linha com os padrões da tela e valida mês/ano.
+    Com ``feriados_automaticos`` cada pessoa recebe os feriados do seu
+    mês/município (``services.feriados``) mais os ``feriados`` informados.
+    Devolve ``(pessoas, erros)``; ``erros`` traz mensagens "Linha N: ...".
+    """
+    pessoas = []
+    erros = []
+    for numero, linha in enumerate(linhas, start=2):
+        numero = linha.get("_linha", numero)
+        if not linha.get("reeducando"):
+            erros.append(f"Linha {numero}: reeducando em branco")
+            continue
+        dados = {chave: valor for chave, valor in DEFAULTS.items() if chave not in _CAMPOS_IGNORADOS}
+        dados.update({"he": he, "hs": hs})
+        dados.update({chave: valor for chave, valor in linha.items() if valor and chave in dados})
+
+        mes_linha = _mes_numero(linha.get("mes_label"), mes)
+        if mes_linha is None:
+            erros.append(f'Linha {numero}: mês "{linha.get("mes_label")}" inválido')
+            continue
+        try:
+            ano_linha = int(linha.get("ano") or ano)
+        except ValueError:
+            erros.append(f'Linha {numero}: ano "{linha.get("ano")}" inválido')
+            continue
+
+        if feriados_automaticos:
+            feriados_pessoa = feriados_do_mes(ano_linha, mes_linha, dados["municipio"], feriados)
+        else:
+            feriados_pessoa = {dia: nome for dia, nome in (feriados or {}).items() if nome}
+        dados.update({"mes": mes_linha, "ano": ano_linha, "feriados": feriados_pessoa})
+        dados.pop("mes_label", None)
+        pessoas.append(dados)
+    return pessoas, erros
+
+
+def nome_arquivo_pessoa(pessoa: dict, tipo: str) -> str:
+    base = _normaliza_coluna(pessoa.get("reeducando")) or "reeducando"
+    return f"{tipo}_{base}_{pessoa['ano']}_{pessoa['mes']:02d}.pdf"
+
+
+@medido("lote_pessoa")
+def gerar_documentos_pessoa(pessoa: dict, tipos, pasta: str, separados: bool = True) -> dict:
+    """
+    Gera os PDFs de uma pessoa direto em arquivos dentro de ``pasta``
+    (executado nos processos do pool) e devolve {tipo: caminho}.
+    Com ``separados=False`` folha e relatório saem num único arquivo
+    (chave "pessoa"), com o brasão e as fontes embutidos uma vez.
+    """
+    base = os.path.join(pasta, f"{pessoa['_indice']:05d}")
+    if not separados:
+        caminho = f"{base}_pessoa.pdf"
+        gerar_periodo_pdf(
+            pessoa["ano"],
+            [pessoa["mes"]],
+            pessoa["he"],
+            pessoa["hs"],
+            feriados_por_mes={pessoa["mes"]: pessoa["feriados"]},
+            tipos=tipos,
+            destino=caminho,
+            **{campo: pessoa[campo] for campo in {*CAMPOS_FOLHA, *CAMPOS_RELATORIO}},
+        )
+        return {"pessoa": caminho}
+
+    documentos = {}
+    comum = {"ano": pessoa["ano"], "mes": pessoa["mes"], "feriados": pessoa["feriados"]}
+    if "folha" in tipos:
+        documentos["folha"] = f"{base}_folha.pdf"
+        gerar_pdf(
+            he=pessoa["he"],
+            hs=pessoa["hs"],
+            destino=documentos["folha"],
+            **comum,
+            **{campo: pessoa[campo] for campo in CAMPOS_FOLHA},
+        )
+    if "relatorio" in tipos:
+        documentos["relatorio"] = f"{base}_relatorio.pdf"
+        gerar_relatorio_pdf(
+            destino=documentos["relatorio"],
+            **comum,
+            **{campo: pessoa[campo] for campo in CAMPOS_RELATORIO},
+        )
+    return documentos
+
+
+def gerar_lote(pessoas, pasta, tipos=("folha", "relatorio"), workers=None, progresso=None, separados=True):
+    """
+    Gera os documentos de todas as pessoas em arquivos dentro de ``pasta`` e
+    os devolve um a um, na ordem da planilha, como ``(pessoa, {tipo: caminho})``.
+
+    ``workers`` define o tamanho do pool de processos (1 = no próprio processo).
+    No máximo ``2 x workers`` pessoas ficam em andamento ao mesmo tempo, então
+    a memória não cresce com o tamanho do lote. ``progresso(concluidos, total)``
+    é chamado a cada pessoa finalizada.
+    """
+    tipos = tuple(tipos)
+    total = len(pessoas)
+    workers = max(1, int(workers or workers_padrao()))
+    pessoas = [{**pessoa, "_indice": indice} for indice, pessoa in enumerate(pessoas)]
+
+    if workers == 1 or total <= 1:
+        for indice, pessoa in enumerate(pessoas):
+            documentos = gerar_documentos_pessoa(pessoa, tipos, pasta, separados)
+            if progresso:
+                progresso(indice + 1, total)
+            yield pessoa, documentos
+        return
+
+    janela = 2 * workers
+    with ProcessPoolExecutor(max_workers=min(workers, total), mp_context=CONTEXTO_PROCESSOS) as executor:
+        pendentes = {}
+        prontos = {}
+        proximo_envio = 0
+        proximo_entregue = 0
+        concluidos = 0
+        while proximo_entregue < total:
+            while proximo_envio < total and len(pendentes) + len(prontos) < janela:
+                futuro = executor.submit(gerar_documentos_pessoa, pessoas[proximo_envio], tipos, pasta, separados)
+                pendentes[futuro] = proximo_envio
+                proximo_envio += 1
+
+            feitos, _ = wait(pendentes, return_when=FIRST_COMPLETED)
+            for futuro in feitos:
+                prontos[pendentes.pop(futuro)] = futuro.result()
+                concluidos += 1
+                if progresso:
+                    progresso(concluidos, total)
+
+            while proximo_entregue in prontos:
+                yield pessoas[proximo_entregue], prontos.pop(proximo_entregue)
+                proximo_entregue += 1
+
+
+def _juntar_arquivos(caminhos, destino) -> None:
+    """Junta PDFs do disco em ``destino``, abrindo no máximo ``_MAX_ABERTOS`` por vez."""
+    try:
+        from PyPDF2 import PdfMerger  # lazy import: só para o PDF único
+    except ImportError:
+        raise RuntimeError("Instale PyPDF2 (pip install PyPDF2) para juntar os PDFs.") from None
+    caminhos = list(caminhos)
+    intermediarios = []
+    try:
+        while len(caminhos) > _MAX_ABERTOS:
+            parcial = f"{destino}.parte{len(intermediarios)}"
+            _juntar_arquivos(caminhos[:_MAX_ABERTOS], parcial)
+            intermediarios.append(parcial)
+            caminhos = [parcial, *caminhos[_MAX_ABERTOS:]]
+
+        merger = PdfMerger()
+        for caminho in caminhos:
+            merger.append(caminho)
+        merger.write(destino)
+        merger.close()
+    finally:
+        for parcial in intermediarios:
+            _remover(parcial)
+
+
+def escrever_pdf_unico(resultados, destino) -> None:
+    """Um único PDF em ``destino``: cada pessoa com a folha seguida do relatório."""
+    caminhos = []
+    try:
+        for _, documentos in resultados:
+            caminhos.extend(documentos[tipo] for tipo in ("pessoa", *TIPOS_DOCUMENTO) if tipo in documentos)
+        _juntar_arquivos(caminhos, destino)
+    finally:
+        for caminho in caminhos:
+            _remover(caminho)
+
+
+def escrever_zip(resultados, destino) -> None:
+    """
+    ZIP em ``destino`` com um PDF por pessoa e tipo de documento; cada PDF
+    entra no ZIP assim que fica pronto e é apagado em seguida.
+    """
+    usados = set()
+    with zipfile.ZipFile(destino, "w", compression=zipfile.ZIP_DEFLATED) as arquivo_zip:
+        for pessoa, documentos in resultados:
+            for tipo in TIPOS_DOCUMENTO:
+                if tipo not in documentos:
+                    continue
+                nome = nome_arquivo_pessoa(pessoa, tipo)
+                base, sufixo, contador = nome[:-4], ".pdf", 2
+                while nome in usados:
+                    nome = f"{base}_{contador}{sufixo}"
+                    contador += 1
+                usados.add(nome)
+                arquivo_zip.write(documentos[tipo], nome)
+                _remover(documentos[tipo])
+
+
+def _remover(caminho) -> None:
+    try:
+        os.remove(caminho)
+    except OSError:
+        pass
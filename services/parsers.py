@@ -1,20 +1,12 @@
 import re
-from io import BytesIO
-from unicodedata import normalize
-
-import streamlit as st
-
-try:
-    from PyPDF2 import PdfReader
-except ImportError:
-    PdfReader = None  # type: ignore
-
-try:
-    from docx import Document
-except ImportError:
-    Document = None  # type: ignore
+from calendar import monthrange
+from unicodedata import combining, normalize
 
 from services.constants import MESES
+from services.cache_extracao import campos_extraidos, chave_conteudo, texto_extraido
+from services.instrumentacao import medido
+from services.rotulos import extrair_rotulos
+
 
 def _safe_index(options, value, default=0):
     try:
@@ -24,6 +16,10 @@ def _safe_index(options, value, default=0):
 
 
 def parse_feriados_text(texto):
+    """
+    ``"1-Feriado, 15-"`` -> ``({1: "Feriado", 15: None}, erros)``: o dia sem
+    descrição retira o feriado automático daquele dia (veja ``feriados_do_mes``).
+    """
     feriados_dict = {}
     erros = []
     for raw_bloco in texto.split(","):
@@ -44,18 +40,96 @@ def parse_feriados_text(texto):
         if not (1 <= dia <= 31):
             erros.append(f'"{bloco}" (dia fora de 1-31)')
             continue
-        if not nome:
-            erros.append(f'"{bloco}" (descrição vazia)')
-            continue
-        feriados_dict[dia] = nome
+        feriados_dict[dia] = nome or None
     return feriados_dict, erros
 
 
+def parse_calendario_feriados(registros, ano):
+    """
+    Monta o calendário {mes: {dia: descrição}} a partir de registros com as
+    chaves "mes" (nome de MESES ou número), "dia" e "descricao". Mês e dia
+    sem descrição viram ``None`` (retira o feriado automático do dia);
+    registros totalmente vazios são ignorados. Devolve (calendario, erros).
+    """
+    calendario = {}
+    erros = []
+    for posicao, registro in enumerate(registros, start=1):
+        mes_bruto = registro.get("mes")
+        dia_bruto = registro.get("dia")
+        nome = str(registro.get("descricao") or "").strip()
+        if _vazio(mes_bruto) and _vazio(dia_bruto) and not nome:
+            continue
+
+        mes = MESES.get(str(mes_bruto or "").strip().upper())
+        if mes is None:
+            try:
+                mes = int(mes_bruto)
+            except (TypeError, ValueError):
+                mes = None
+        if mes is None or not (1 <= mes <= 12):
+            erros.append(f"linha {posicao} (mês inválido)")
+            continue
+        try:
+            dia = int(dia_bruto)
+        except (TypeError, ValueError):
+            erros.append(f"linha {posicao} (dia inválido)")
+            continue
+        if not (1 <= dia <= monthrange(int(ano), mes)[1]):
+            erros.append(f"linha {posicao} (dia {dia} não existe no mês {mes})")
+            continue
+        calendario.setdefault(mes, {})[dia] = nome or None
+    return calendario, erros
+
+
+def _vazio(valor) -> bool:
+    # o data_editor devolve None/NaN para células não preenchidas
+    return valor is None or valor != valor or str(valor).strip() == ""
+
+
 def _clean_text(texto: str) -> str:
     # normaliza espaços e sobe para maiúsculas para regex
     return re.sub(r"\s+", " ", texto).strip()
 
 
+# rótulos da folha de ponto / relatório de atividades (texto em maiúsculas)
+ESQUEMA_FOLHA = (
+    ("secretaria", r"SECRETARIA:", None),
+    ("ano", r"ANO:", r"\d{4}"),
+    ("reeducando", r"REEDUCANDO:", None),
+    ("mes_label", r"M[ÊE]S:", r"[A-ZÇÃÕ]+"),
+    ("funcao", r"FUNÇÃO:", None),
+    ("data_inclusao", r"DATA DA INCLUS[ÃA]O:", r"[\d/]+"),
+    ("municipio", r"MUNIC[IÍ]PIO:", None),
+    ("cpf", r"CPF:", r"[\d.\-]+"),
+    ("banco", r"BCO:", r"[A-Z0-9]+"),
+    ("agencia", r"AG:", r"[A-Z0-9.\-]+"),
+    ("conta", r"CONTA:", r"[A-Z0-9.\-]+"),
+    ("tipo_conta", r"TIPO DE CONTA:", None),
+    ("endereco", r"ENDEREÇO:", None),
+    ("cep", r"CEP:", r"[\d.\-]+"),
+    ("telefone", r"TELEFONE:", r"[0-9\s\-]+"),
+    ("data_preenchimento", r"DATA:", r"[0-9_/]+"),
+    (None, r"DIA HE ENTRADA", None),
+    (None, r"ASSINATURA DO REEDUCANDO", None),
+)
+
+# rótulos da autorização de viagem manual (texto sem acentos, em maiúsculas)
+ESQUEMA_AUTORIZACAO_VIAGEM_MANUAL = (
+    ("avm_servidor", r"SERVIDOR:", None),
+    ("avm_cargo_funcao", r"CARGO/FUN\S*:", None),
+    ("avm_matricula", r"MATR\S*CULA:", None),
+    ("avm_habilitacao", r"HABILITA\S*:", None),
+    ("avm_categoria", r"CATEGORIA:", None),
+    ("avm_validade", r"VALIDADE:", None),
+    ("avm_responsavel_transporte", r"RESPONS\S*VEL\s+TRANSPORTE:", None),
+    (None, r"SAIDA:", None),
+    (None, r"CHEGADA:", None),
+    (None, r"KM:", None),
+    (None, r"OBS:", None),
+)
+
+
+@medido("parse_folha")
 def _parse_campos(texto: str) -> dict:
     """Extrai campos do texto plano (PDF ou DOCX)."""
     norm = _clean_text(texto).upper()
@@ -91,42 +165,9 @@ def _parse_campos(texto: str) -> dict:
             return "Corrente"
         return txt
 
-    def pega(padrao, grupo=1):
-        m = re.search(padrao, norm)
-        return m.group(grupo).strip() if m else ""
-
-    campos["secretaria"] = pega(r"SECRETARIA:\s*(.+?)(?:\s+ANO:|$)")
-    campos["ano"] = pega(r"ANO:\s*(\d{4})")
-    campos["reeducando"] = pega(r"REEDUCANDO:\s*(.+?)(?:\s+M[ÊE]S:|$)")
-    campos["mes_label"] = pega(r"M[ÊE]S:\s*([A-ZÇÃÕ]+)")
-    campos["funcao"] = pega(r"FUNÇÃO:\s*(.+?)(?:\s+DATA DA INCLUSÃO:|$)")
-    campos["data_inclusao"] = pega(r"DATA DA INCLUS[ÃA]O:\s*([\d/]+)")
-    campos["municipio"] = pega(r"MUNIC[IÍ]PIO:\s*(.+?)(?:\s+CPF:|$)")
-    campos["cpf"] = pega(r"CPF:\s*([\d.\-]+)")
-    campos["banco"] = pega(r"BCO:\s*([A-Z0-9]+)")
-    campos["agencia"] = pega(r"AG:\s*([A-Z0-9.\-]+)")
-    campos["conta"] = pega(r"CONTA:\s*([A-Z0-9.\-]+)")
-    campos["tipo_conta"] = normaliza_tipo_conta(pega(r"TIPO DE CONTA:\s*(.+)"))
-    campos["endereco"] = pega(r"ENDEREÇO:\s*(.+?)(?:\s+CEP:|$)")
-    campos["cep"] = pega(r"CEP:\s*([\d.\-]+)")
-    campos["telefone"] = pega(r"TELEFONE:\s*([0-9\s\-]+)")
-    campos["data_preenchimento"] = normaliza_data(pega(r"DATA:\s*([0-9_/]+)"))
-
-    # remove repetições quando o texto veio duplicado no DOCX/PDF
-    repetidos = {
-        "secretaria": "SECRETARIA:",
-        "reeducando": "REEDUCANDO:",
-        "funcao": "FUNÇÃO:",
-        "municipio": "MUNICÍPIO:",
-        "endereco": "ENDEREÇO:",
-    }
-    for chave, marcador in repetidos.items():
-        val = campos.get(chave, "")
-        if val:
-            up = val.upper()
-            idx = up.find(marcador, len(marcador))  # procura segunda ocorrência
-            if idx > 0:
-                campos[chave] = val[:idx].strip()
+    campos.update(extrair_rotulos(norm, ESQUEMA_FOLHA))
+    campos["tipo_conta"] = normaliza_tipo_conta(campos["tipo_conta"])
+    campos["data_preenchimento"] = normaliza_data(campos["data_preenchimento"])
 
     # ano para inteiro, se possível
     try:
@@ -149,68 +190,90 @@ def _parse_campos(texto: str) -> dict:
 
 
 def _strip_accents(texto: str) -> str:
-    return "".join(
-        char for char in normalize("NFD", texto or "") if not re.match(r"[\u0300-\u036f]", char)
-    )
+    return "".join(char for char in normalize("NFD", texto or "") if not combining(char))
 
 
+@medido("parse_autorizacao_viagem_manual")
 def _parse_autorizacao_viagem_manual_campos(texto: str) -> dict:
     """Extrai dados do servidor de uma autorizacao de viagem manual ja emitida."""
     norm = _clean_text(texto)
     norm_upper = _strip_accents(norm).upper()
-    campos = {}
+    return extrair_rotulos(norm_upper, ESQUEMA_AUTORIZACAO_VIAGEM_MANUAL)
 
-    def pega(padrao: str, grupo=1) -> str:
-        m = re.search(padrao, norm_upper)
-        return m.group(grupo).strip() if m else ""
-
-    campos["avm_servidor"] = pega(r"SERVIDOR:\s*(.+?)(?:\s+CARGO/FUN|$)")
-    campos["avm_cargo_funcao"] = pega(r"CARGO/FUN\S*:\s*(.+?)(?:\s+MATR|$)")
-    campos["avm_matricula"] = pega(r"MATR\S*CULA:\s*(.+?)(?:\s+HABILITA|$)")
-    campos["avm_habilitacao"] = pega(r"HABILITA\S*:\s*(.+?)(?:\s+-\s*CATEGORIA:|$)")
-    campos["avm_categoria"] = pega(r"CATEGORIA:\s*(.+?)(?:\s+-\s*VALIDADE:|$)")
-    campos["avm_validade"] = pega(r"VALIDADE:\s*(.+?)(?:\s+SA|$)")
-    campos["avm_responsavel_transporte"] = pega(
-        r"RESPONS\S*VEL\s+TRANSPORTE:\s*(.+?)(?:\s+CHEGADA:|\s+OBS:|$)"
-    )
 
+def _campos_folha_de_payload(payload: dict):
+    """Dados embutidos numa folha/relatório/período -> formato de ``_parse_campos``."""
+    if payload.get("tipo") not in ("folha", "relatorio", "periodo"):
+        return None
+    dados = payload["dados"]
+    mes = dados.get("mes") if payload["tipo"] != "periodo" else (dados.get("meses") or [None])[-1]
+    nomes_meses = {numero: nome for nome, numero in MESES.items()}
+    campos = {campo: str(dados.get(campo) or "") for campo, _, _ in ESQUEMA_FOLHA if campo}
+    campos["ano"] = dados.get("ano") if isinstance(dados.get("ano"), int) else ""
+    campos["mes_label"] = nomes_meses.get(mes, "")
+    campos["data_preenchimento"] = campos["data_preenchimento"] or "__/__/____"
+    # o que o texto não traz de forma confiável, mas os dados embutidos sim
+    for campo in ("he", "hs", "rodape_titulo", "rodape_endereco", "rodape_fone", "rodape_cep", "rodape_email"):
+        if dados.get(campo):
+            campos[campo] = str(dados[campo])
     return campos
 
 
+def _campos_autorizacao_de_payload(payload: dict):
+    """Dados embutidos numa autorização de viagem -> campos ``avm_*`` do servidor."""
+    if payload.get("tipo") != "autorizacao_viagem_manual":
+        return None
+    dados = payload["dados"]
+    return {
+        campo: str(dados.get(campo[len("avm_"):]) or "")
+        for campo, _, _ in ESQUEMA_AUTORIZACAO_VIAGEM_MANUAL
+        if campo
+    }
+
+
+_CONVERSORES_PAYLOAD = {
+    _parse_campos: _campos_folha_de_payload,
+    _parse_autorizacao_viagem_manual_campos: _campos_autorizacao_de_payload,
+}
+
+
+def _campos_arquivo(nome_arquivo: str, dados: bytes, parser) -> dict:
+    """
+    Campos de um PDF/DOCX segundo ``parser``: dos dados embutidos quando o
+    PDF foi gerado por nós, senão do texto extraído (ambos em cache).
+    """
+    return campos_extraidos(nome_arquivo, dados, parser, _CONVERSORES_PAYLOAD.get(parser))
+
+
+def _avisar_erro_upload(exc) -> None:
+    import streamlit as st  # lazy import: o parser também roda nos processos de importação
+
+    st.error(str(exc))
+
+
+def _chave_upload(arquivo) -> str:
+    """Identifica o conteúdo enviado (o mesmo arquivo renomeado tem a mesma chave)."""
+    return chave_conteudo(arquivo.name, arquivo.getvalue())
+
+
+@medido("upload")
 def _ler_upload(arquivo) -> str:
     """Lê PDF ou DOCX enviado e devolve texto contínuo."""
     if not arquivo:
         return ""
-    nome = arquivo.name.lower()
-    dados = arquivo.read()
-    if nome.endswith(".pdf"):
-        if PdfReader is None:
-            st.error("Instale PyPDF2 (pip install PyPDF2) para ler PDFs.")
-            return ""
-        reader = PdfReader(BytesIO(dados))
-        textos = []
-        for pagina in reader.pages:
-            textos.append(pagina.extract_text() or "")
-        return "\n".join(textos)
-    if nome.endswith(".docx"):
-        if Document is None:
-            st.error("Instale python-docx (pip install python-docx) para ler DOCX.")
-            return ""
-        try:
-            doc = Document(BytesIO(dados))
-            linhas = []
-            # parágrafos soltos
-            for p in doc.paragraphs:
-                if p.text and p.text.strip():
-                    linhas.append(p.text)
-            # textos das tabelas
-            for tabela in doc.tables:
-                for linha in tabela.rows:
-                    for celula in linha.cells:
-                        if celula.text and celula.text.strip():
-                            linhas.append(celula.text)
-            return "\n".join(linhas)
-        except Exception as e:
-            st.error(f"Erro ao ler DOCX: {e}")
-            return ""
-    return ""
+    try:
+        return texto_extraido(arquivo.name, arquivo.getvalue())
+    except RuntimeError as exc:
+        _avisar_erro_upload(exc)
+        return ""
+
+
+def _campos_upload(arquivo, parser) -> dict:
+    """Campos do PDF/DOCX enviado segundo ``parser``; {} se não houver texto."""
+    if not arquivo:
+        return {}
+    try:
+        return _campos_arquivo(arquivo.name, arquivo.getvalue(), parser)
+    except RuntimeError as exc:
+        _avisar_erro_upload(exc)
+        return {}
@@ -3,13 +3,53 @@ from io import BytesIO
 from reportlab.lib.pagesizes import A4
 from reportlab.pdfgen import canvas
 
+from pdf import bookman_font
 from pdf.cabecalho import desenhar_cabecalho
-from pdf.corpo import desenhar_tabela
+from pdf.corpo import desenhar_estrutura_tabela, desenhar_tabela
+from pdf.dados_embutidos import embutir_dados
 from pdf.lista_presenca import gerar_pdf_lista_presenca
-from pdf.relatorio import gerar_relatorio_cabecalho
+from pdf.modelo_pagina import desenhar_modelo
+from pdf.relatorio import (
+    desenhar_cabecalho_tabela_relatorio,
+    gerar_relatorio_cabecalho,
+    posicoes_titulo_relatorio,
+)
 from pdf.rodape import desenhar_rodape
+from services.cache_documentos import em_cache
+from services.constants import MESES
+from services.instrumentacao import medido
 
-def gerar_pdf(
+
+def _desenhar_fixos_folha(c):
+    """Brasão + grade da folha de ponto; devolve o topo da tabela."""
+    y_top = desenhar_cabecalho(c)
+    desenhar_estrutura_tabela(c, y_top=y_top)
+    return y_top
+
+
+def _desenhar_fixos_relatorio(c, rodape):
+    """Brasão, linha "Dia | Atividade" e rodapé do relatório; devolve o fim do brasão."""
+    y_base = desenhar_cabecalho(c)
+    desenhar_cabecalho_tabela_relatorio(c, posicoes_titulo_relatorio(y_base)[2])
+    desenhar_rodape(c, **rodape)
+    return y_base
+
+
+CAMPOS_FOLHA = (
+    "endereco", "cep", "telefone", "data_preenchimento", "secretaria", "reeducando",
+    "funcao", "data_inclusao", "municipio", "cpf", "banco", "agencia", "conta", "tipo_conta",
+)
+CAMPOS_RELATORIO = (
+    "secretaria", "reeducando", "funcao", "municipio", "endereco", "cep", "telefone",
+    "data_preenchimento", "rodape_titulo", "rodape_endereco", "rodape_fone", "rodape_cep",
+    "rodape_email",
+)
+# parâmetros de execução, que não fazem parte dos dados do documento
+_FORA_DOS_DADOS = {"usar_modelo", "destino"}
+
+
+def _pagina_folha(
+    c,
     ano,
     mes,
     he,
@@ -29,15 +69,16 @@ def gerar_pdf(
     conta,
     tipo_conta,
     feriados=None,
+    usar_modelo=True,
 ):
-    buffer = BytesIO()
-    c = canvas.Canvas(buffer, pagesize=A4)
-
-    # Define título interno do PDF
-    c.setTitle("Folha de ponto")
-
-    # Cabeçalho oficial
-    y_top = desenhar_cabecalho(c)
+    """Desenha uma página de folha de ponto no canvas e fecha a página."""
+    # Cabeçalho oficial + grade fixa (do modelo de página em cache, por padrão)
+    bookman_font.ensure_bookman_fonts()
+    if usar_modelo:
+        chave = ("folha", bookman_font.FONT_REGULAR, bookman_font.FONT_BOLD)
+        y_top = desenhar_modelo(c, chave, _desenhar_fixos_folha)
+    else:
+        y_top = _desenhar_fixos_folha(c)
 
     # Corpo
     desenhar_tabela(
@@ -62,15 +103,79 @@ def gerar_pdf(
         agencia=agencia,
         conta=conta,
         tipo_conta=tipo_conta,
+        estrutura=False,
     )
 
     c.showPage()
+
+
+@medido("folha")
+@em_cache()
+def gerar_pdf(
+    ano,
+    mes,
+    he,
+    hs,
+    endereco,
+    cep,
+    telefone,
+    data_preenchimento,
+    secretaria,
+    reeducando,
+    funcao,
+    data_inclusao,
+    municipio,
+    cpf,
+    banco,
+    agencia,
+    conta,
+    tipo_conta,
+    feriados=None,
+    usar_modelo=True,
+    destino=None,
+):
+    # argumentos recebidos, embutidos no PDF para reimportação
+    entrada = {chave: valor for chave, valor in locals().items() if chave not in _FORA_DOS_DADOS}
+    buffer = BytesIO() if destino is None else destino
+    c = canvas.Canvas(buffer, pagesize=A4)
+
+    # Define título interno do PDF
+    c.setTitle("Folha de ponto")
+
+    _pagina_folha(
+        c,
+        ano=ano,
+        mes=mes,
+        he=he,
+        hs=hs,
+        endereco=endereco,
+        cep=cep,
+        telefone=telefone,
+        data_preenchimento=data_preenchimento,
+        secretaria=secretaria,
+        reeducando=reeducando,
+        funcao=funcao,
+        data_inclusao=data_inclusao,
+        municipio=municipio,
+        cpf=cpf,
+        banco=banco,
+        agencia=agencia,
+        conta=conta,
+        tipo_conta=tipo_conta,
+        feriados=feriados,
+        usar_modelo=usar_modelo,
+    )
+    embutir_dados(c, "folha", entrada)
     c.save()
 
+    if destino is not None:
+        return None
     buffer.seek(0)
     return buffer.getvalue()
 
 
+@medido("lista_presenca")
+@em_cache()
 def gerar_lista_presenca_pdf(
     mes,
     ano,
@@ -113,7 +218,8 @@ def gerar_lista_presenca_pdf(
     )
 
 
-def gerar_relatorio_pdf(
+def _pagina_relatorio(
+    c,
     ano,
     mes,
     secretaria,
@@ -130,11 +236,25 @@ def gerar_relatorio_pdf(
     rodape_fone=None,
     rodape_cep=None,
     rodape_email=None,
+    usar_modelo=True,
 ):
-    buffer = BytesIO()
-    c = canvas.Canvas(buffer, pagesize=A4)
+    """Desenha uma página de relatório de atividades no canvas e fecha a página."""
+    # partes fixas: brasão, linha de títulos da tabela e rodapé
+    rodape = {
+        "titulo": rodape_titulo or "ULSAV - UNIDADE LOCAL DE SANIDADE ANIMAL E VEGETAL",
+        "linha_endereco": rodape_endereco or "Av. São Paulo, 436 – Bairro Centro",
+        "linha_fone": rodape_fone or "Fone/Fax: (69) 3642-1026/8479-9229",
+        "linha_cep": rodape_cep or "CEP 76.932-000 – São Miguel do Guaporé/RO",
+        "linha_email": rodape_email or "saomiguel@idaron.ro.gov.br",
+    }
+    bookman_font.ensure_bookman_fonts()
+    if usar_modelo:
+        chave = ("relatorio", bookman_font.FONT_BOLD, tuple(rodape.values()))
+        y_cabecalho = desenhar_modelo(c, chave, lambda cv: _desenhar_fixos_relatorio(cv, rodape))
+    else:
+        y_cabecalho = _desenhar_fixos_relatorio(c, rodape)
 
-    # cabeçalho oficial com logo e título
+    # título do relatório
     y_base = gerar_relatorio_cabecalho(
         c,
         secretaria=secretaria,
@@ -147,6 +267,7 @@ def gerar_relatorio_pdf(
         cep=cep,
         telefone=telefone,
         data_preenchimento=data_preenchimento,
+        y_base=y_cabecalho,
     )
 
     # tabela de atividades (dias do mês)
@@ -164,20 +285,144 @@ def gerar_relatorio_pdf(
         atividade_base=atividade_base,
         feriados=feriados or {},
         y_top=y_base,
+        cabecalho=False,
     )
 
-    # rodapé
-    desenhar_rodape(
+    c.showPage()
+
+
+@medido("relatorio")
+@em_cache()
+def gerar_relatorio_pdf(
+    ano,
+    mes,
+    secretaria,
+    reeducando,
+    funcao,
+    municipio,
+    endereco,
+    cep,
+    telefone,
+    data_preenchimento,
+    feriados=None,
+    rodape_titulo=None,
+    rodape_endereco=None,
+    rodape_fone=None,
+    rodape_cep=None,
+    rodape_email=None,
+    usar_modelo=True,
+    destino=None,
+):
+    entrada = {chave: valor for chave, valor in locals().items() if chave not in _FORA_DOS_DADOS}
+    buffer = BytesIO() if destino is None else destino
+    c = canvas.Canvas(buffer, pagesize=A4)
+
+    _pagina_relatorio(
         c,
-        titulo=rodape_titulo or "ULSAV - UNIDADE LOCAL DE SANIDADE ANIMAL E VEGETAL",
-        linha_endereco=rodape_endereco or "Av. São Paulo, 436 – Bairro Centro",
-        linha_fone=rodape_fone or "Fone/Fax: (69) 3642-1026/8479-9229",
-        linha_cep=rodape_cep or "CEP 76.932-000 – São Miguel do Guaporé/RO",
-        linha_email=rodape_email or "saomiguel@idaron.ro.gov.br",
+        ano=ano,
+        mes=mes,
+        secretaria=secretaria,
+        reeducando=reeducando,
+        funcao=funcao,
+        municipio=municipio,
+        endereco=endereco,
+        cep=cep,
+        telefone=telefone,
+        data_preenchimento=data_preenchimento,
+        feriados=feriados,
+        rodape_titulo=rodape_titulo,
+        rodape_endereco=rodape_endereco,
+        rodape_fone=rodape_fone,
+        rodape_cep=rodape_cep,
+        rodape_email=rodape_email,
+        usar_modelo=usar_modelo,
     )
+    embutir_dados(c, "relatorio", entrada)
+    c.save()
 
-    c.showPage()
+    if destino is not None:
+        return None
+    buffer.seek(0)
+    return buffer.getvalue()
+
+
+def rotulo_periodo(ano, meses) -> str:
+    """Ex.: "JANEIRO–DEZEMBRO 2026" (ou só "MARÇO 2026" para um mês)."""
+    nomes = {numero: nome for nome, numero in MESES.items()}
+    meses = list(meses)
+    if not meses:
+        return str(ano)
+    if len(meses) == 1:
+        return f"{nomes[meses[0]]} {ano}"
+    return f"{nomes[meses[0]]}–{nomes[meses[-1]]} {ano}"
+
+
+@medido("periodo")
+@em_cache()
+def gerar_periodo_pdf(
+    ano,
+    meses,
+    he,
+    hs,
+    feriados_por_mes=None,
+    tipos=("folha", "relatorio"),
+    usar_modelo=True,
+    destino=None,
+    **campos,
+):
+    """
+    Gera num único PDF (um só canvas) as folhas e/ou relatórios de vários meses
+    do mesmo reeducando: para cada mês de ``meses``, a folha seguida do relatório.
+
+    ``feriados_por_mes`` é o calendário {mes: {dia: descrição}}; ``campos`` são
+    os dados do reeducando (nomes de ``CAMPOS_FOLHA``/``CAMPOS_RELATORIO``).
+    Fontes, brasão e modelos de página entram uma vez só no arquivo.
+
+    Com ``destino`` (caminho ou arquivo aberto) o PDF é escrito lá e a função
+    devolve None; sem ele, devolve os bytes.
+    """
+    feriados_por_mes = feriados_por_mes or {}
+    meses = list(meses)
+    entrada = {
+        "ano": ano,
+        "meses": meses,
+        "he": he,
+        "hs": hs,
+        "feriados_por_mes": feriados_por_mes,
+        "tipos": list(tipos),
+        **campos,
+    }
+    buffer = BytesIO() if destino is None else destino
+    c = canvas.Canvas(buffer, pagesize=A4)
+    c.setTitle(f"Folha de ponto - {rotulo_periodo(ano, meses)}")
+
+    for mes in meses:
+        feriados = feriados_por_mes.get(mes) or {}
+        if "folha" in tipos:
+            _pagina_folha(
+                c,
+                ano=ano,
+                mes=mes,
+                he=he,
+                hs=hs,
+                feriados=feriados,
+                usar_modelo=usar_modelo,
+                **{campo: campos.get(campo, "") for campo in CAMPOS_FOLHA},
+            )
+        if "relatorio" in tipos:
+            _pagina_relatorio(
+                c,
+                ano=ano,
+                mes=mes,
+                feriados=feriados,
+                usar_modelo=usar_modelo,
+                **{campo: campos.get(campo, "") for campo in CAMPOS_RELATORIO},
+            )
+
+    embutir_dados(c, "periodo", entrada)
     c.save()
 
+    if destino is not None:
+        return None
     buffer.seek(0)
     return buffer.getvalue()
@@ -0,0 +1,308 @@
+"""
+Cadastro dos reeducandos, para não redigitar os mesmos dados todo mês.
+
+Cada pessoa fica em ``dados/pessoas.sqlite3`` com os campos de
+``CAMPOS_PESSOA`` (as chaves de ``services.constants.DEFAULTS``) e o histórico
+dos meses já emitidos. A busca da tela (autocompletar) não vai ao banco: um
+índice em memória, montado na primeira consulta e atualizado a cada
+``salvar_pessoa``, guarda
+
+- a lista ordenada das palavras de cada nome e secretaria (prefixo de
+  qualquer palavra por ``bisect``: "sil" acha "João da Silva");
+- os trigramas do nome (trecho no meio da palavra: "ilva");
+- a lista ordenada dos CPFs só com dígitos (prefixo de CPF).
+
+Com alguns milhares de cadastros a consulta fica abaixo de 1 ms. O índice é
+por processo; alterações feitas por outro processo aparecem depois de
+``limpar_indice_pessoas``.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+from bisect import bisect_left
+from datetime import datetime
+from pathlib import Path
+from unicodedata import combining, normalize
+
+
+BANCO = Path(__file__).resolve().parents[1] / "dados" / "pessoas.sqlite3"
+CAMPOS_PESSOA = (
+    "secretaria",
+    "reeducando",
+    "funcao",
+    "data_inclusao",
+    "municipio",
+    "cpf",
+    "banco",
+    "agencia",
+    "conta",
+    "tipo_conta",
+    "endereco",
+    "cep",
+    "telefone",
+    "he",
+    "hs",
+)
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS pessoas (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nome TEXT NOT NULL,
+    chave_nome TEXT NOT NULL,
+    cpf TEXT NOT NULL DEFAULT '',
+    chave_secretaria TEXT NOT NULL DEFAULT '',
+    campos TEXT NOT NULL,
+    atualizado_em TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pessoas_nome ON pessoas (chave_nome);
+CREATE INDEX IF NOT EXISTS pessoas_cpf ON pessoas (cpf);
+CREATE INDEX IF NOT EXISTS pessoas_secretaria ON pessoas (chave_secretaria);
+CREATE TABLE IF NOT EXISTS emissoes (
+    pessoa_id INTEGER NOT NULL REFERENCES pessoas(id) ON DELETE CASCADE,
+    ano INTEGER NOT NULL,
+    mes INTEGER NOT NULL,
+    tipo TEXT NOT NULL,
+    emitido_em TEXT NOT NULL,
+    PRIMARY KEY (pessoa_id, ano, mes, tipo)
+);
+"""
+
+_LOCAL = threading.local()
+_LOCK = threading.Lock()
+_INDICE = {"pronto": False}
+_ESTATISTICAS = {"buscas": 0, "montagens": 0}
+
+
+def chave_texto(texto) -> str:
+    """ "João  da Silva" -> "joao da silva" (sem acento, minúsculo, espaços simples)."""
+    texto = "".join(ch for ch in normalize("NFKD", str(texto or "")) if not combining(ch))
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", texto.lower()).split())
+
+
+def so_digitos(texto) -> str:
+    return re.sub(r"\D", "", str(texto or ""))
+
+
+def _trigramas(chave: str) -> set:
+    return {chave[i:i + 3] for i in range(len(chave) - 2)}
+
+
+def _conexao() -> sqlite3.Connection:
+    conexao = getattr(_LOCAL, "conexao", None)
+    if conexao is None or getattr(_LOCAL, "banco", None) != BANCO:
+        BANCO.parent.mkdir(parents=True, exist_ok=True)
+        conexao = sqlite3.connect(BANCO, timeout=30, isolation_level=None)
+        conexao.row_factory = sqlite3.Row
+        conexao.execute("PRAGMA journal_mode=WAL")
+        conexao.execute("PRAGMA foreign_keys=ON")
+        conexao.executescript(_ESQUEMA)
+        _LOCAL.conexao = conexao
+        _LOCAL.banco = BANCO
+    return conexao
+
+
+def _entrada(linha) -> dict:
+    return {
+        "id": linha["id"],
+        "chave_nome": linha["chave_nome"],
+        "cpf": linha["cpf"],
+        "chave_secretaria": linha["chave_secretaria"],
+        "campos": json.loads(linha["campos"]),
+        "atualizado_em": linha["atualizado_em"],
+    }
+
+
+def _indexar(indice: dict, entrada: dict) -> None:
+    identificador = entrada["id"]
+    indice["pessoas"][identificador] = entrada
+    for palavra in set(entrada["chave_nome"].split() + entrada["chave_secretaria"].split()):
+        indice["palavras"].append((palavra, identificador))
+    for trigrama in _trigramas(entrada["chave_nome"]):
+        indice["trigramas"].setdefault(trigrama, set()).add(identificador)
+    if entrada["cpf"]:
+        indice["cpfs"].append((entrada["cpf"], identificador))
+
+
+def _desindexar(indice: dict, identificador: int) -> None:
+    entrada = indice["pessoas"].pop(identificador, None)
+    if entrada is None:
+        return
+    indice["palavras"] = [par for par in indice["palavras"] if par[1] != identificador]
+    indice["cpfs"] = [par for par in indice["cpfs"] if par[1] != identificador]
+    for trigrama in _trigramas(entrada["chave_nome"]):
+        indice["trigramas"].get(trigrama, set()).discard(identificador)
+
+
+def _indice() -> dict:
+    """Índice em memória (montado a partir do banco na primeira chamada)."""
+    if _INDICE["pronto"]:
+        return _INDICE
+    linhas = _conexao().execute("SELECT * FROM pessoas").fetchall()
+    with _LOCK:
+        if not _INDICE["pronto"]:
+            novo = {"pessoas": {}, "palavras": [], "trigramas": {}, "cpfs": []}
+            for linha in linhas:
+                _indexar(novo, _entrada(linha))
+            novo["palavras"].sort()
+            novo["cpfs"].sort()
+            _INDICE.update(novo, pronto=True)
+            _ESTATISTICAS["montagens"] += 1
+    return _INDICE
+
+
+def limpar_indice_pessoas() -> None:
+    with _LOCK:
+        _INDICE.clear()
+        _INDICE["pronto"] = False
+
+
+def _por_prefixo(palavras: list, prefixo: str) -> set:
+    encontrados = set()
+    posicao = bisect_left(palavras, (prefixo,))
+    while posicao < len(palavras) and palavras[posicao][0].startswith(prefixo):
+        encontrados.add(palavras[posicao][1])
+        posicao += 1
+    return encontrados
+
+
+def buscar_pessoas(texto: str, secretaria: str = "", limite: int = 10) -> list:
+    """
+    Cadastros que casam com ``texto`` (nome, secretaria ou CPF), melhores
+    primeiro: nome começando pelo texto, depois todas as palavras com
+    prefixo, depois trecho do nome (trigramas). ``secretaria`` filtra pelo
+    começo do nome da secretaria.
+    """
+    chave = chave_texto(texto)
+    digitos = so_digitos(texto)
+    if not chave:
+        return []
+    indice = _indice()
+    with _LOCK:
+        _ESTATISTICAS["buscas"] += 1
+        pessoas = indice["pessoas"]
+        pontos = {}
+        if digitos and len(digitos) == len(chave.replace(" ", "")):
+            for identificador in _por_prefixo(indice["cpfs"], digitos):
+                pontos[identificador] = 3
+        else:
+            tokens = chave.split()
+            candidatos = _por_prefixo(indice["palavras"], tokens[0])
+            for token in tokens[1:]:
+                candidatos &= _por_prefixo(indice["palavras"], token)
+            for identificador in candidatos:
+                pontos[identificador] = 3 if pessoas[identificador]["chave_nome"].startswith(chave) else 2
+            trigramas = _trigramas(chave)
+            if trigramas:
+                conjuntos = sorted((indice["trigramas"].get(t, set()) for t in trigramas), key=len)
+                for identificador in set.intersection(*conjuntos):
+                    if chave in pessoas[identificador]["chave_nome"]:
+                        pontos.setdefault(identificador, 1)
+        chave_secretaria = chave_texto(secretaria)
+        if chave_secretaria:
+            pontos = {
+                identificador: valor
+                for identificador, valor in pontos.items()
+                if pessoas[identificador]["chave_secretaria"].startswith(chave_secretaria)
+            }
+        # mais recentes primeiro dentro do mesmo peso
+        melhores = sorted(pontos, key=lambda i: pessoas[i]["atualizado_em"], reverse=True)
+        melhores.sort(key=lambda i: -pontos[i])
+        return [
+            {"id": i, "campos": dict(pessoas[i]["campos"]), "atualizado_em": pessoas[i]["atualizado_em"]}
+            for i in melhores[:limite]
+        ]
+
+
+def obter_pessoa(identificador: int):
+    """``{"id", "campos", "atualizado_em", "emissoes"}`` ou None."""
+    entrada = _indice()["pessoas"].get(identificador)
+    if entrada is None:
+        return None
+    return {
+        "id": identificador,
+        "campos": dict(entrada["campos"]),
+        "atualizado_em": entrada["atualizado_em"],
+        "emissoes": historico(identificador),
+    }
+
+
+def salvar_pessoa(campos: dict) -> int:
+    """
+    Grava os campos da pessoa e devolve o id. Procura o cadastro pelo CPF e,
+    sem CPF, pelo nome; campos vazios não apagam o que já estava gravado.
+    """
+    nome = str(campos.get("reeducando") or "").strip()
+    if not nome:
+        raise ValueError("informe o nome do reeducando")
+    cpf = so_digitos(campos.get("cpf"))
+    chave_nome = chave_texto(nome)
+    novos = {campo: str(campos.get(campo) or "").strip() for campo in CAMPOS_PESSOA}
+    agora = datetime.now().isoformat(timespec="seconds")
+    conexao = _conexao()
+    with conexao:
+        conexao.execute("BEGIN IMMEDIATE")
+        existente = None
+        if cpf:
+            existente = conexao.execute("SELECT * FROM pessoas WHERE cpf = ?", (cpf,)).fetchone()
+        if existente is None:
+            existente = conexao.execute(
+                "SELECT * FROM pessoas WHERE chave_nome = ? AND (cpf = '' OR ? = '')", (chave_nome, cpf)
+            ).fetchone()
+        if existente is not None:
+            anteriores = json.loads(existente["campos"])
+            novos = {campo: novos[campo] or anteriores.get(campo, "") for campo in CAMPOS_PESSOA}
+            cpf = cpf or existente["cpf"]
+        valores = (
+            nome,
+            chave_nome,
+            cpf,
+            chave_texto(novos["secretaria"]),
+            json.dumps(novos, ensure_ascii=False),
+            agora,
+        )
+        if existente is not None:
+            identificador = existente["id"]
+            conexao.execute(
+                "UPDATE pessoas SET nome = ?, chave_nome = ?, cpf = ?, chave_secretaria = ?, campos = ?,"
+                " atualizado_em = ? WHERE id = ?",
+                (*valores, identificador),
+            )
+        else:
+            identificador = conexao.execute(
+                "INSERT INTO pessoas (nome, chave_nome, cpf, chave_secretaria, campos, atualizado_em)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                valores,
+            ).lastrowid
+        linha = conexao.execute("SELECT * FROM pessoas WHERE id = ?", (identificador,)).fetchone()
+    if _INDICE["pronto"]:
+        with _LOCK:
+            _desindexar(_INDICE, identificador)
+            _indexar(_INDICE, _entrada(linha))
+            _INDICE["palavras"].sort()
+            _INDICE["cpfs"].sort()
+    return identificador
+
+
+def registrar_emissao(identificador: int, ano: int, mes: int, tipo: str) -> None:
+    """Marca o mês como emitido (``tipo`` = "folha", "relatorio"...)."""
+    _conexao().execute(
+        "INSERT INTO emissoes (pessoa_id, ano, mes, tipo, emitido_em) VALUES (?, ?, ?, ?, ?)"
+        " ON CONFLICT (pessoa_id, ano, mes, tipo) DO UPDATE SET emitido_em = excluded.emitido_em",
+        (identificador, int(ano), int(mes), tipo, datetime.now().isoformat(timespec="seconds")),
+    )
+
+
+def historico(identificador: int) -> list:
+    """Meses emitidos, do mais recente para o mais antigo."""
+    linhas = _conexao().execute(
+        "SELECT ano, mes, tipo, emitido_em FROM emissoes WHERE pessoa_id = ? ORDER BY ano DESC, mes DESC, tipo",
+        (identificador,),
+    ).fetchall()
+    return [dict(linha) for linha in linhas]
+
+
+def estatisticas_pessoas() -> dict:
+    with _LOCK:
+        return {**_ESTATISTICAS, "pessoas": len(_INDICE.get("pessoas", {})), "indice_pronto": _INDICE["pronto"]}
@@ -0,0 +1,390 @@
+"""
+Registro dos documentos gerados pelas telas (SQLite + arquivos por hash).
+
+Antes cada tela gravava em ``pdf/`` com nome fixo (``requerimento_restituicao.pdf``
+etc.): usuários simultâneos sobrescreviam o arquivo um do outro e a pasta só
+crescia. Agora o conteúdo vai para ``dados/registro/blobs/<aa>/<sha256>``
+(gravado uma vez só: saídas idênticas compartilham o arquivo, qualquer que seja
+a extensão do nome) e cada geração
+vira uma linha em ``registro.sqlite3`` com tipo, pessoa, número e data,
+indexados para consulta.
+
+O banco roda em modo WAL (leitores não bloqueiam o gravador) com uma conexão
+por thread. ``aplicar_retencao`` apaga registros mais velhos que
+``RETENCAO["dias"]`` e os mais antigos além de ``RETENCAO["max_bytes"]``, e
+remove os arquivos que ficaram sem registro; roda sozinha no máximo uma vez
+por hora depois de ``registrar``.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+DIRETORIO = Path(__file__).resolve().parents[1] / "dados" / "registro"
+BANCO = DIRETORIO / "registro.sqlite3"
+BLOBS = DIRETORIO / "blobs"
+RETENCAO = {"dias": 365, "max_bytes": 2 * 1024 * 1024 * 1024}
+_INTERVALO_RETENCAO = 60 * 60
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    sha256 TEXT PRIMARY KEY,
+    extensao TEXT NOT NULL,
+    tamanho INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS documentos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tipo TEXT NOT NULL,
+    pessoa TEXT NOT NULL DEFAULT '',
+    numero TEXT NOT NULL DEFAULT '',
+    data TEXT NOT NULL DEFAULT '',
+    nome_arquivo TEXT NOT NULL,
+    mime TEXT NOT NULL,
+    sha256 TEXT NOT NULL REFERENCES blobs(sha256),
+    criado_em TEXT NOT NULL,
+    atualizado_em TEXT NOT NULL,
+    geracoes INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS documentos_tipo ON documentos (tipo, atualizado_em);
+CREATE INDEX IF NOT EXISTS documentos_pessoa ON documentos (pessoa COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS documentos_numero ON documentos (numero);
+CREATE INDEX IF NOT EXISTS documentos_data ON documentos (data);
+CREATE INDEX IF NOT EXISTS documentos_atualizado ON documentos (atualizado_em);
+CREATE UNIQUE INDEX IF NOT EXISTS documentos_conteudo ON documentos (tipo, sha256, pessoa, numero);
+-- busca de texto (services.busca_documentos); rowid = documentos.id
+CREATE VIRTUAL TABLE IF NOT EXISTS busca USING fts5(
+    pessoa, numero, nome_arquivo, dados, texto, tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+_LOCAL = threading.local()
+_LOCK = threading.Lock()
+_ULTIMA_RETENCAO = {"quando": 0.0}
+_BLOBS_MIGRADOS = {"pasta": None}
+_ESTATISTICAS = {"registrados": 0, "deduplicados": 0, "removidos": 0}
+
+
+def _agora() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _conexao() -> sqlite3.Connection:
+    """Conexão da thread atual (criada, em WAL e com o esquema, na primeira vez)."""
+    conexao = getattr(_LOCAL, "conexao", None)
+    if conexao is None or getattr(_LOCAL, "banco", None) != BANCO:
+        BANCO.parent.mkdir(parents=True, exist_ok=True)
+        conexao = sqlite3.connect(BANCO, timeout=30, isolation_level=None)
+        conexao.row_factory = sqlite3.Row
+        conexao.execute("PRAGMA journal_mode=WAL")
+        conexao.execute("PRAGMA synchronous=NORMAL")
+        colunas_busca = {linha[1] for linha in conexao.execute("PRAGMA table_info(busca)")}
+        if colunas_busca and "nome_arquivo" not in colunas_busca:
+            # índice de busca de versão anterior: recriado e refeito por ``indexar_pendentes``
+            conexao.execute("DROP TABLE IF EXISTS busca")
+        conexao.executescript(_ESQUEMA)
+        _migrar_blobs()
+        _LOCAL.conexao = conexao
+        _LOCAL.banco = BANCO
+    return conexao
+
+
+def caminho_blob(sha256: str) -> Path:
+    return BLOBS / sha256[:2] / sha256
+
+
+def _migrar_blobs() -> None:
+    """
+    Versão anterior gravava ``<sha256>.<ext>``: renomeia para ``<sha256>`` e
+    apaga as cópias com outra extensão (que nenhum registro referenciava).
+    Roda uma vez por processo e pasta.
+    """
+    with _LOCK:
+        if _BLOBS_MIGRADOS["pasta"] == BLOBS:
+            return
+        _BLOBS_MIGRADOS["pasta"] = BLOBS
+    for antigo in BLOBS.glob("*/*.*"):
+        if antigo.name.startswith("."):
+            continue  # temporário de uma gravação em andamento
+        novo = antigo.with_name(antigo.name.split(".", 1)[0])
+        try:
+            if novo.exists():
+                antigo.unlink()
+            else:
+                os.replace(antigo, novo)
+        except OSError:
+            pass
+
+
+def _gravar_blobs(itens) -> None:
+    """
+    Grava os blobs que ainda não existem: escreve todos em temporários, faz
+    o fsync de cada um, renomeia e sincroniza cada pasta uma vez só (um lote
+    com vários arquivos paga uma rodada de fsync, não uma por arquivo).
+    """
+    novos = {}
+    for item in itens:
+        caminho = caminho_blob(item["sha256"])
+        if caminho not in novos and not caminho.exists():
+            novos[caminho] = item["conteudo"]
+    temporarios = []
+    try:
+        for caminho, conteudo in novos.items():
+            caminho.parent.mkdir(parents=True, exist_ok=True)
+            temporario = caminho.with_name(f".{caminho.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            descritor = os.open(temporario, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            temporarios.append((temporario, caminho))
+            with os.fdopen(descritor, "wb") as arquivo:
+                arquivo.write(conteudo)
+                arquivo.flush()
+                os.fsync(arquivo.fileno())
+        for temporario, caminho in temporarios:
+            os.replace(temporario, caminho)
+    except BaseException:
+        for temporario, _ in temporarios:
+            try:
+                temporario.unlink()
+            except OSError:
+                pass
+        raise
+    for pasta in {caminho.parent for caminho in novos}:
+        _sincronizar_pasta(pasta)
+
+
+def _sincronizar_pasta(pasta: Path) -> None:
+    """fsync da pasta para o rename sobreviver a uma queda (no Windows não há)."""
+    try:
+        descritor = os.open(pasta, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(descritor)
+    except OSError:
+        pass
+    finally:
+        os.close(descritor)
+
+
+def _como_dict(linha) -> dict:
+    registro = dict(linha)
+    registro["caminho"] = str(caminho_blob(registro["sha256"]))
+    # a do próprio registro (o blob guarda a do primeiro que gravou aqueles bytes)
+    registro["extensao"] = Path(registro["nome_arquivo"]).suffix.lower()
+    return registro
+
+
+_SELECT = (
+    "SELECT d.*, b.extensao, b.tamanho FROM documentos d JOIN blobs b ON b.sha256 = d.sha256"
+)
+
+
+def registrar(
+    conteudo: bytes,
+    tipo: str,
+    nome_arquivo: str,
+    mime: str = "application/pdf",
+    pessoa: str = "",
+    numero: str = "",
+    data: str = "",
+) -> dict:
+    """
+    Guarda ``conteudo`` e devolve o registro (dict com ``id``, ``caminho``...).
+    Gerar de novo o mesmo conteúdo para o mesmo tipo/pessoa/número não cria
+    linha nova: só atualiza ``atualizado_em`` e soma em ``geracoes``.
+    """
+    return registrar_varios(
+        [
+            {
+                "conteudo": conteudo,
+                "tipo": tipo,
+                "nome_arquivo": nome_arquivo,
+                "mime": mime,
+                "pessoa": pessoa,
+                "numero": numero,
+                "data": data,
+            }
+        ]
+    )[0]
+
+
+def registrar_varios(pedidos) -> list:
+    """
+    ``registrar`` de vários documentos numa transação só (usado pelo gravador
+    em segundo plano); cada pedido é um dict com os argumentos de ``registrar``.
+    """
+    itens = []
+    for pedido in pedidos:
+        item = {"mime": "application/pdf", "pessoa": "", "numero": "", "data": "", **pedido}
+        for campo in ("pessoa", "numero", "data"):
+            item[campo] = (item[campo] or "").strip()
+        item["sha256"] = hashlib.sha256(item["conteudo"]).hexdigest()
+        item["extensao"] = Path(item["nome_arquivo"]).suffix.lower()
+        itens.append(item)
+    agora = _agora()
+    identificadores = []
+    deduplicados = 0
+    conexao = _conexao()
+    with conexao:
+        # os arquivos são gravados com o banco travado para a retenção não apagá-los no meio
+        conexao.execute("BEGIN IMMEDIATE")
+        _gravar_blobs(itens)
+        for item in itens:
+            conexao.execute(
+                "INSERT OR IGNORE INTO blobs (sha256, extensao, tamanho) VALUES (?, ?, ?)",
+                (item["sha256"], item["extensao"], len(item["conteudo"])),
+            )
+            chave = (item["tipo"], item["sha256"], item["pessoa"], item["numero"])
+            existente = conexao.execute(
+                "SELECT id FROM documentos WHERE tipo = ? AND sha256 = ? AND pessoa = ? AND numero = ?", chave
+            ).fetchone()
+            if existente:
+                conexao.execute(
+                    "UPDATE documentos SET atualizado_em = ?, geracoes = geracoes + 1, nome_arquivo = ?, data = ?"
+                    " WHERE id = ?",
+                    (agora, item["nome_arquivo"], item["data"], existente["id"]),
+                )
+                identificadores.append(existente["id"])
+                deduplicados += 1
+            else:
+                identificadores.append(
+                    conexao.execute(
+                        "INSERT INTO documentos (tipo, pessoa, numero, data, nome_arquivo, mime, sha256,"
+                        " criado_em, atualizado_em) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            item["tipo"],
+                            item["pessoa"],
+                            item["numero"],
+                            item["data"],
+                            item["nome_arquivo"],
+                            item["mime"],
+                            item["sha256"],
+                            agora,
+                            agora,
+                        ),
+                    ).lastrowid
+                )
+    with _LOCK:
+        _ESTATISTICAS["registrados"] += len(itens) - deduplicados
+        _ESTATISTICAS["deduplicados"] += deduplicados
+    _aplicar_retencao_se_preciso()
+    return [obter(identificador) for identificador in identificadores]
+
+
+def obter(identificador: int):
+    """Registro pelo ``id`` (ou None)."""
+    linha = _conexao().execute(f"{_SELECT} WHERE d.id = ?", (identificador,)).fetchone()
+    return _como_dict(linha) if linha else None
+
+
+def buscar(
+    tipo: str = "",
+    pessoa: str = "",
+    numero: str = "",
+    desde: str = "",
+    ate: str = "",
+    limite: int = 50,
+) -> list:
+    """
+    Registros mais recentes primeiro. ``pessoa`` casa pelo começo do nome (sem
+    diferenciar maiúsculas); ``desde``/``ate`` comparam ``atualizado_em`` (ISO).
+    """
+    condicoes, parametros = [], []
+    if tipo:
+        condicoes.append("d.tipo = ?")
+        parametros.append(tipo)
+    if pessoa:
+        condicoes.append("d.pessoa LIKE ? COLLATE NOCASE")
+        parametros.append(pessoa.strip().replace("%", "").replace("_", "") + "%")
+    if numero:
+        condicoes.append("d.numero = ?")
+        parametros.append(numero.strip())
+    if desde:
+        condicoes.append("d.atualizado_em >= ?")
+        parametros.append(desde)
+    if ate:
+        condicoes.append("d.atualizado_em <= ?")
+        parametros.append(ate)
+    onde = f" WHERE {' AND '.join(condicoes)}" if condicoes else ""
+    linhas = _conexao().execute(
+        f"{_SELECT}{onde} ORDER BY d.atualizado_em DESC, d.id DESC LIMIT ?", (*parametros, int(limite))
+    ).fetchall()
+    return [_como_dict(linha) for linha in linhas]
+
+
+def ler_conteudo(registro: dict) -> bytes:
+    return Path(registro["caminho"]).read_bytes()
+
+
+def _aplicar_retencao_se_preciso() -> None:
+    agora = time.time()
+    with _LOCK:
+        if agora - _ULTIMA_RETENCAO["quando"] < _INTERVALO_RETENCAO:
+            return
+        _ULTIMA_RETENCAO["quando"] = agora
+    aplicar_retencao()
+
+
+def aplicar_retencao(dias=None, max_bytes=None) -> int:
+    """
+    Remove registros vencidos (mais velhos que ``dias``) e, se o total ainda
+    passar de ``max_bytes``, os menos recentes até caber. Apaga os arquivos
+    sem registro. Devolve quantos registros saíram.
+    """
+    dias = RETENCAO["dias"] if dias is None else dias
+    max_bytes = RETENCAO["max_bytes"] if max_bytes is None else max_bytes
+    conexao = _conexao()
+    with conexao:
+        conexao.execute("BEGIN IMMEDIATE")
+        removidos = 0
+        if dias:
+            limite = (datetime.now() - timedelta(days=dias)).isoformat(timespec="seconds")
+            removidos += conexao.execute("DELETE FROM documentos WHERE atualizado_em < ?", (limite,)).rowcount
+        if max_bytes:
+            total = conexao.execute(
+                "SELECT COALESCE(SUM(tamanho), 0) FROM blobs WHERE sha256 IN (SELECT sha256 FROM documentos)"
+            ).fetchone()[0]
+            if total > max_bytes:
+                # o blob sai quando o último registro que o usa sai
+                linhas = conexao.execute(
+                    "SELECT d.id, d.sha256, b.tamanho FROM documentos d JOIN blobs b ON b.sha256 = d.sha256"
+                    " ORDER BY d.atualizado_em, d.id"
+                ).fetchall()
+                restantes = {}
+                for linha in linhas:
+                    restantes[linha["sha256"]] = restantes.get(linha["sha256"], 0) + 1
+                apagar = []
+                for linha in linhas:
+                    if total <= max_bytes:
+                        break
+                    apagar.append((linha["id"],))
+                    restantes[linha["sha256"]] -= 1
+                    if not restantes[linha["sha256"]]:
+                        total -= linha["tamanho"]
+                conexao.executemany("DELETE FROM documentos WHERE id = ?", apagar)
+                removidos += len(apagar)
+        conexao.execute("DELETE FROM busca WHERE rowid NOT IN (SELECT id FROM documentos)")
+        orfaos = conexao.execute(
+            "SELECT sha256 FROM blobs WHERE sha256 NOT IN (SELECT sha256 FROM documentos)"
+        ).fetchall()
+        conexao.executemany("DELETE FROM blobs WHERE sha256 = ?", [(linha["sha256"],) for linha in orfaos])
+        for linha in orfaos:
+            try:
+                caminho_blob(linha["sha256"]).unlink()
+            except OSError:
+                pass
+    with _LOCK:
+        _ESTATISTICAS["removidos"] += removidos
+    return removidos
+
+
+def estatisticas_registro() -> dict:
+    """Contadores da execução mais totais do banco (registros, arquivos, bytes)."""
+    documentos, blobs, total = _conexao().execute(
+        "SELECT (SELECT COUNT(*) FROM documentos), COUNT(*), COALESCE(SUM(tamanho), 0) FROM blobs"
+    ).fetchone()
+    with _LOCK:
+        return {**_ESTATISTICAS, "documentos": documentos, "arquivos": blobs, "bytes": total}
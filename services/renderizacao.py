@@ -0,0 +1,270 @@
+"""
+Fila de renderização em segundo plano, compartilhada por todas as sessões.
+
+As telas não geram mais os documentos pesados dentro do script do Streamlit
+(onde uma geração lenta trava a página e qualquer clique no meio recomeça
+tudo): ``submeter`` entrega a função a um pool de threads do processo e
+devolve na hora o código do trabalho, e ``acompanhar`` mostra o andamento
+num fragmento que consulta a situação a cada meio segundo.
+
+O código é o hash da função e dos argumentos (``chave_documento``): pedir de
+novo o mesmo trabalho, na mesma sessão ou em outra, enquanto ele está na fila
+ou rodando devolve o mesmo código em vez de gerar outra vez, e depois de
+pronto devolve o resultado guardado. Os resultados ficam na memória até
+``LIMITE_BYTES`` (os trabalhos concluídos há mais tempo saem primeiro; um
+resultado maior que o limite inteiro vira erro). ``cancelar`` tira da fila um
+trabalho que ainda não começou, para as telas que submetem de novo a cada
+alteração do formulário não deixarem versões velhas ocupando o pool.
+
+Dentro do trabalho, ``informar_progresso(feito, total, etapa)`` atualiza a
+barra de andamento; fora de um trabalho a chamada não faz nada.
+"""
+
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from services.cache_documentos import chave_documento
+
+
+TRABALHADORES = max(2, min(4, os.cpu_count() or 1))
+LIMITE_BYTES = 128 * 1024 * 1024
+# trabalhos guardados (com ou sem resultado) para ``situacao``
+HISTORICO = 500
+PENDENTES = ("na_fila", "executando")
+
+_TRABALHOS = OrderedDict()
+_LOCK = threading.Lock()
+_POOL = {"executor": None}
+_TOTAL = {"bytes": 0}
+_ESTATISTICAS = {"submetidos": 0, "reaproveitados": 0, "concluidos": 0, "erros": 0, "descartes": 0, "cancelados": 0}
+# código do trabalho rodando em cada thread do pool
+_ATUAL = threading.local()
+
+
+def _executor() -> ThreadPoolExecutor:
+    with _LOCK:
+        if _POOL["executor"] is None:
+            _POOL["executor"] = ThreadPoolExecutor(TRABALHADORES, thread_name_prefix="renderizacao")
+        return _POOL["executor"]
+
+
+def _tamanho(resultado) -> int:
+    if isinstance(resultado, (bytes, bytearray)):
+        return len(resultado)
+    if isinstance(resultado, dict):
+        return sum(_tamanho(valor) for valor in resultado.values())
+    if isinstance(resultado, (list, tuple)):
+        return sum(_tamanho(valor) for valor in resultado)
+    return 0
+
+
+def _codigo(funcao, args, kwargs) -> str:
+    nome = f"{funcao.__module__}.{funcao.__qualname__}"
+    try:
+        return chave_documento(nome, "renderizacao", {"args": list(args), "kwargs": kwargs})
+    except TypeError:
+        # argumentos sem forma estável: trabalho avulso, sem reaproveitamento
+        return uuid.uuid4().hex
+
+
+def submeter(funcao, *args, rotulo: str = "", **kwargs) -> str:
+    """
+    Põe ``funcao(*args, **kwargs)`` na fila (se o mesmo trabalho ainda não
+    estiver nela, rodando ou pronto) e devolve o código do trabalho.
+    """
+    codigo = _codigo(funcao, args, kwargs)
+    with _LOCK:
+        trabalho = _TRABALHOS.get(codigo)
+        if trabalho is not None and trabalho["estado"] != "erro":
+            _TRABALHOS.move_to_end(codigo)
+            _ESTATISTICAS["reaproveitados"] += 1
+            return codigo
+        _TRABALHOS[codigo] = {
+            "estado": "na_fila",
+            "rotulo": rotulo or funcao.__name__,
+            "progresso": 0.0,
+            "etapa": "",
+            "submetido_em": time.time(),
+        }
+        _ESTATISTICAS["submetidos"] += 1
+        _descartar()
+    futuro = _executor().submit(_executar, codigo, funcao, args, kwargs)
+    _atualizar(codigo, futuro=futuro)
+    return codigo
+
+
+def cancelar(codigo) -> bool:
+    """
+    Tira da fila o trabalho que ainda não começou (True se saiu). Como o
+    trabalho é compartilhado pelo código, só cancele trabalhos que a própria
+    tela submete de novo a cada execução.
+    """
+    with _LOCK:
+        trabalho = _TRABALHOS.get(codigo)
+        if trabalho is None or trabalho["estado"] != "na_fila" or "futuro" not in trabalho:
+            return False
+        if not trabalho["futuro"].cancel():
+            return False
+        del _TRABALHOS[codigo]
+        _ESTATISTICAS["cancelados"] += 1
+        return True
+
+
+def _executar(codigo: str, funcao, args, kwargs) -> None:
+    _atualizar(codigo, estado="executando", iniciado_em=time.time())
+    _ATUAL.codigo = codigo
+    try:
+        resultado = funcao(*args, **kwargs)
+    except Exception as exc:
+        _atualizar(codigo, estado="erro", erro=f"{type(exc).__name__}: {exc}", concluido_em=time.time())
+        with _LOCK:
+            _ESTATISTICAS["erros"] += 1
+        return
+    finally:
+        _ATUAL.codigo = None
+    tamanho = _tamanho(resultado)
+    with _LOCK:
+        trabalho = _TRABALHOS.get(codigo)
+        if trabalho is None:
+            _ESTATISTICAS["concluidos"] += 1
+            return  # descartado enquanto rodava (histórico cheio)
+        if tamanho > LIMITE_BYTES:
+            # não cabe nem sozinho: seria descartado antes de a tela buscar
+            trabalho.update(
+                estado="erro",
+                erro=f"resultado grande demais para a memória do servidor ({tamanho // (1024 * 1024)} MB)",
+                concluido_em=time.time(),
+            )
+            _ESTATISTICAS["erros"] += 1
+            return
+        _ESTATISTICAS["concluidos"] += 1
+        trabalho.update(
+            estado="concluido",
+            progresso=1.0,
+            etapa="",
+            resultado=resultado,
+            bytes=tamanho,
+            concluido_em=time.time(),
+        )
+        _TOTAL["bytes"] += tamanho
+        _TRABALHOS.move_to_end(codigo)
+        _descartar(manter=codigo)
+
+
+def _atualizar(codigo: str, **campos) -> None:
+    with _LOCK:
+        trabalho = _TRABALHOS.get(codigo)
+        if trabalho is not None:
+            trabalho.update(campos)
+
+
+def _descartar(manter=None) -> None:
+    """
+    Tira os trabalhos terminados mais antigos até caber nos limites (com o
+    lock); ``manter`` é o trabalho que acabou de terminar e ainda não foi lido.
+    """
+    for codigo in list(_TRABALHOS):
+        if _TOTAL["bytes"] <= LIMITE_BYTES and len(_TRABALHOS) <= HISTORICO:
+            return
+        trabalho = _TRABALHOS[codigo]
+        if trabalho["estado"] in PENDENTES or codigo == manter:
+            continue
+        del _TRABALHOS[codigo]
+        _TOTAL["bytes"] -= trabalho.get("bytes", 0)
+        _ESTATISTICAS["descartes"] += 1
+
+
+def informar_progresso(feito: int, total: int, etapa: str = "") -> None:
+    """Andamento do trabalho que roda nesta thread (nada fora de um trabalho)."""
+    codigo = getattr(_ATUAL, "codigo", None)
+    if codigo:
+        _atualizar(codigo, progresso=min(1.0, feito / total) if total else 0.0, etapa=etapa)
+
+
+def situacao(codigo: str) -> dict:
+    """``{"estado": "na_fila" | "executando" | "concluido" | "erro" | "desconhecido", ...}`` sem o resultado."""
+    with _LOCK:
+        trabalho = _TRABALHOS.get(codigo)
+        if trabalho is None:
+            return {"estado": "desconhecido"}
+        return {chave: valor for chave, valor in trabalho.items() if chave not in ("resultado", "futuro")}
+
+
+def resultado(codigo: str):
+    """Resultado do trabalho concluído (None se não terminou, falhou ou saiu da memória)."""
+    with _LOCK:
+        trabalho = _TRABALHOS.get(codigo)
+        if trabalho is None or trabalho["estado"] != "concluido":
+            return None
+        _TRABALHOS.move_to_end(codigo)
+        return trabalho["resultado"]
+
+
+def estatisticas_renderizacao() -> dict:
+    with _LOCK:
+        estados = [trabalho["estado"] for trabalho in _TRABALHOS.values()]
+        return {
+            **_ESTATISTICAS,
+            "na_fila": estados.count("na_fila"),
+            "executando": estados.count("executando"),
+            "guardados": len(estados),
+            "bytes": _TOTAL["bytes"],
+            "trabalhadores": TRABALHADORES,
+        }
+
+
+def limpar_renderizacao() -> None:
+    """Esquece os trabalhos terminados (os pendentes continuam)."""
+    with _LOCK:
+        for codigo in [codigo for codigo, trabalho in _TRABALHOS.items() if trabalho["estado"] not in PENDENTES]:
+            _TOTAL["bytes"] -= _TRABALHOS.pop(codigo).get("bytes", 0)
+        for chave in _ESTATISTICAS:
+            _ESTATISTICAS[chave] = 0
+
+
+def acompanhar(codigo, mensagem: str = "Gerando...") -> tuple:
+    """
+    ``(estado, resultado)`` lidos numa única consulta à fila. Com o trabalho
+    pendente mostra a barra de andamento num fragmento que se atualiza a cada
+    meio segundo (e refaz a página uma vez quando o trabalho termina); o
+    resultado só vem com ``estado == "concluido"``. Erros aparecem na tela.
+    A tela deve decidir tudo por esse ``estado`` (e não por outra chamada a
+    ``situacao``), senão um trabalho que termina entre as duas leituras perde
+    o resultado.
+    """
+    import streamlit as st  # lazy import: a fila também roda fora da UI
+
+    if not codigo:
+        return "desconhecido", None
+    with _LOCK:
+        trabalho = _TRABALHOS.get(codigo)
+        atual = dict(trabalho) if trabalho is not None else {"estado": "desconhecido"}
+        if atual["estado"] == "concluido":
+            _TRABALHOS.move_to_end(codigo)
+    estado = atual["estado"]
+    if estado == "concluido":
+        return estado, atual["resultado"]
+    if estado == "erro":
+        st.error(f"Não foi possível gerar: {atual['erro']}")
+        return estado, None
+    if estado == "desconhecido":
+        st.warning("O resultado não está mais na memória do servidor. Gere de novo.")
+        return estado, None
+
+    @st.fragment(run_every=0.5)
+    def _andamento():
+        atual = situacao(codigo)
+        if atual["estado"] in PENDENTES:
+            texto = mensagem if atual["estado"] == "executando" else f"{mensagem} (na fila)"
+            if atual.get("etapa"):
+                texto = f"{texto} {atual['etapa']}"
+            st.progress(atual["progresso"], text=texto)
+        else:
+            st.rerun()
+
+    _andamento()
+    return estado, None
@@ -0,0 +1,84 @@
+"""
+Extração de campos "RÓTULO: valor" numa única passada pelo texto.
+
+Cada formulário declara um esquema: uma sequência de
+``(campo, rótulo, valor)`` em que ``rótulo`` é a regex do rótulo e ``valor``
+(opcional) a regex que o valor precisa casar logo no início do trecho.
+Entradas com ``campo`` None só delimitam o campo anterior (cabeçalhos de
+tabela, linhas de assinatura...).
+
+Todos os rótulos do esquema viram um único padrão alternado; o texto é
+percorrido uma vez e dividido em trechos: o valor de um rótulo vai do fim
+dele até o início do próximo rótulo encontrado. Vale a primeira ocorrência
+de cada campo, então textos repetidos (células mescladas do DOCX) não
+contaminam o valor.
+"""
+
+import re
+from functools import lru_cache
+
+
+# separador " - " entre campos na mesma linha ("HABILITAÇÃO: 123 - CATEGORIA: B")
+_SEPARADOR_FINAL = re.compile(r"\s+-$")
+
+
+@lru_cache(maxsize=None)
+def compilar_esquema(esquema: tuple):
+    """
+    Padrão único com todos os rótulos, os rótulos compilados um a um (para
+    saber qual casou), a lista de campos na mesma ordem e as regexes de
+    valor. Esquemas são tuplas (hasháveis), compilados uma vez por processo.
+    """
+    # sem grupos nomeados nem lookbehind o sre consegue pular direto para as
+    # posições que começam com a primeira letra de algum rótulo
+    padrao = re.compile("|".join(f"(?:{rotulo})" for _, rotulo, _ in esquema))
+    rotulos = [re.compile(rotulo) for _, rotulo, _ in esquema]
+    campos = [campo for campo, _, _ in esquema]
+    valores = {campo: re.compile(valor) for campo, _, valor in esquema if campo and valor}
+    return padrao, rotulos, campos, valores
+
+
+def dividir_rotulos(texto: str, esquema: tuple) -> dict:
+    """Trecho bruto de cada campo (primeira ocorrência do rótulo)."""
+    padrao, rotulos, campos, _ = compilar_esquema(esquema)
+    trechos = {}
+    identificados = {}
+    campo_aberto = None
+    inicio_valor = 0
+    for marca in padrao.finditer(texto):
+        inicio = marca.start()
+        if inicio and texto[inicio - 1].isalnum():
+            continue  # rótulo no meio de outra palavra ("PAG:" não é "AG:")
+        encontrado = marca.group(0)
+        if encontrado not in identificados:
+            identificados[encontrado] = next(
+                indice for indice, rotulo in enumerate(rotulos) if rotulo.fullmatch(encontrado)
+            )
+        if campo_aberto is not None:
+            trechos[campo_aberto] = texto[inicio_valor:inicio]
+        campo = campos[identificados[encontrado]]
+        campo_aberto = campo if campo is not None and campo not in trechos else None
+        inicio_valor = marca.end()
+    if campo_aberto is not None:
+        trechos[campo_aberto] = texto[inicio_valor:]
+    return trechos
+
+
+def extrair_rotulos(texto: str, esquema: tuple) -> dict:
+    """
+    Valor de cada campo do esquema ("" quando o rótulo não aparece ou o
+    valor não casa com a regex declarada).
+    """
+    _, _, _, regex_valores = compilar_esquema(esquema)
+    trechos = dividir_rotulos(texto, esquema)
+    campos = {}
+    for campo, _, _ in esquema:
+        if campo is None:
+            continue
+        valor = trechos.get(campo, "").strip()
+        regex = regex_valores.get(campo)
+        if regex is not None:
+            encontrado = regex.match(valor)
+            valor = encontrado.group(0).strip() if encontrado else ""
+        campos[campo] = _SEPARADOR_FINAL.sub("", valor)
+    return campos
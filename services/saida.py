@@ -0,0 +1,114 @@
+"""
+Arquivos gerados guardados em disco em vez de ``bytes`` na sessão.
+
+Os geradores escrevem direto num arquivo temporário; a sessão guarda só o
+"handle" (dict com caminho, nome, mime e tamanho) e o download lê o arquivo
+do disco quando o botão é clicado. Arquivos antigos são apagados depois de
+``TTL_SEGUNDOS``.
+"""
+
+import os
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+
+DIRETORIO = Path(tempfile.gettempdir()) / "folha_reeducandos"
+TTL_SEGUNDOS = 6 * 60 * 60
+TAMANHO_BLOCO = 1024 * 1024
+
+
+def novo_arquivo(nome: str, mime: str) -> dict:
+    """Reserva um caminho novo em ``DIRETORIO`` (o arquivo ainda não existe)."""
+    DIRETORIO.mkdir(parents=True, exist_ok=True)
+    limpar_antigos()
+    sufixo = Path(nome).suffix
+    return {
+        "caminho": str(DIRETORIO / f"{uuid.uuid4().hex}{sufixo}"),
+        "nome": nome,
+        "mime": mime,
+        "tamanho": 0,
+    }
+
+
+def finalizar(handle: dict) -> dict:
+    """Atualiza o tamanho depois que o arquivo foi escrito."""
+    handle["tamanho"] = os.path.getsize(handle["caminho"])
+    return handle
+
+
+def gravar_bytes(dados: bytes, nome: str, mime: str) -> dict:
+    handle = novo_arquivo(nome, mime)
+    Path(handle["caminho"]).write_bytes(dados)
+    return finalizar(handle)
+
+
+def existe(handle) -> bool:
+    return bool(handle) and os.path.isfile(handle["caminho"])
+
+
+def abrir(handle):
+    return open(handle["caminho"], "rb")
+
+
+def ler_bytes(handle) -> bytes:
+    """Conteúdo inteiro (só para pré-visualização de arquivos pequenos)."""
+    return Path(handle["caminho"]).read_bytes()
+
+
+def ler_em_blocos(handle, tamanho_bloco: int = TAMANHO_BLOCO):
+    with abrir(handle) as arquivo:
+        while True:
+            bloco = arquivo.read(tamanho_bloco)
+            if not bloco:
+                break
+            yield bloco
+
+
+def remover(handle) -> None:
+    if not handle:
+        return
+    try:
+        os.remove(handle["caminho"])
+    except OSError:
+        pass
+
+
+def limpar_antigos(ttl: float = TTL_SEGUNDOS) -> None:
+    if not DIRETORIO.is_dir():
+        return
+    limite = time.time() - ttl
+    for caminho in DIRETORIO.iterdir():
+        try:
+            if caminho.stat().st_mtime < limite:
+                caminho.unlink()
+        except OSError:
+            pass
+
+
+def guardar_na_sessao(chave: str, handle: dict) -> None:
+    """Guarda o handle em ``st.session_state[chave]``, apagando o arquivo anterior."""
+    import streamlit as st  # lazy import: os processos do lote não usam streamlit
+
+    anterior = st.session_state.get(chave)
+    if isinstance(anterior, dict) and anterior.get("caminho") != handle.get("caminho"):
+        remover(anterior)
+    st.session_state[chave] = handle
+
+
+def botao_download(label: str, handle: dict, key=None):
+    """``st.download_button`` que só lê o arquivo do disco quando clicado."""
+    import streamlit as st  # lazy import: os processos do lote não usam streamlit
+
+    if not existe(handle):
+        st.info("O arquivo gerado expirou; gere novamente.")
+        return False
+    return st.download_button(
+        f"{label} ({handle['tamanho'] / 1024:.0f} KB)",
+        data=lambda: abrir(handle),
+        file_name=handle["nome"],
+        mime=handle["mime"],
+        key=key,
+        on_click="ignore",
+    )
@@ -0,0 +1,109 @@
+"""
+Servidor HTTP local para gerar documentos sem passar pelo Streamlit.
+
+    GET  /documentos          -> JSON com os tipos disponíveis
+    GET  /documentos/<tipo>   -> JSON com os campos aceitos pelo tipo
+    POST /documentos/<tipo>   -> corpo JSON com os dados; resposta é o arquivo
+
+Erros voltam como JSON ``{"erro": "..."}`` (400 dados inválidos, 404 tipo ou
+rota desconhecidos, 413 corpo grande demais, 500 falha do gerador). Escuta só em 127.0.0.1 por
+padrão: não há autenticação, é para outros sistemas da mesma máquina/rede
+interna. Iniciado por ``python -m services.cli_documentos servir``.
+"""
+
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from services.documentos import OBRIGATORIO, campos_documento, formato_documento, gerar_documento, tipos_documento
+
+
+HOST_PADRAO = "127.0.0.1"
+PORTA_PADRAO = 8765
+LIMITE_CORPO = 5 * 1024 * 1024
+_PREFIXO = "/documentos"
+
+
+def descrever_campos(tipo: str) -> dict:
+    """{campo: padrão} em JSON; campos obrigatórios aparecem como null."""
+    return {
+        campo: None if padrao is OBRIGATORIO else padrao
+        for campo, padrao in campos_documento(tipo).items()
+    }
+
+
+class _Tratador(BaseHTTPRequestHandler):
+    server_version = "Documentos/1"
+
+    def _responder(self, status: int, corpo: bytes, tipo_conteudo: str, cabecalhos=None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", tipo_conteudo)
+        self.send_header("Content-Length", str(len(corpo)))
+        for nome, valor in (cabecalhos or {}).items():
+            self.send_header(nome, valor)
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def _json(self, status: int, conteudo) -> None:
+        corpo = json.dumps(conteudo, ensure_ascii=False, default=str).encode("utf-8")
+        self._responder(status, corpo, "application/json; charset=utf-8")
+
+    def _tipo(self):
+        """Tipo pedido na rota ("" = listagem, None = rota desconhecida)."""
+        caminho = self.path.split("?", 1)[0].rstrip("/")
+        if caminho == _PREFIXO:
+            return ""
+        if caminho.startswith(_PREFIXO + "/") and "/" not in caminho[len(_PREFIXO) + 1:]:
+            return caminho[len(_PREFIXO) + 1:]
+        return None
+
+    def do_GET(self):
+        tipo = self._tipo()
+        if tipo == "":
+            self._json(200, tipos_documento())
+            return
+        try:
+            self._json(200, descrever_campos(tipo or ""))
+        except KeyError:
+            self._json(404, {"erro": f"rota desconhecida: {self.path}"})
+
+    def do_POST(self):
+        tipo = self._tipo()
+        if not tipo:
+            self._json(404, {"erro": f"rota desconhecida: {self.path}"})
+            return
+        try:
+            tamanho = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            tamanho = -1
+        if tamanho < 0 or tamanho > LIMITE_CORPO:
+            self._json(413, {"erro": f"corpo deve ter até {LIMITE_CORPO} bytes"})
+            return
+        try:
+            dados = json.loads(self.rfile.read(tamanho) or b"{}")
+        except ValueError:
+            self._json(400, {"erro": "corpo não é JSON válido"})
+            return
+        try:
+            extensao, mime = formato_documento(tipo)
+        except KeyError as exc:
+            self._json(404, {"erro": exc.args[0]})
+            return
+        try:
+            conteudo = gerar_documento(tipo, dados)
+        except ValueError as exc:
+            self._json(400, {"erro": str(exc)})
+            return
+        except Exception as exc:
+            self._json(500, {"erro": f"falha ao gerar o documento: {type(exc).__name__}: {exc}"})
+            return
+        self._responder(
+            200, conteudo, mime, {"Content-Disposition": f'attachment; filename="{tipo}.{extensao}"'}
+        )
+
+    def log_message(self, formato, *args):
+        pass
+
+
+def criar_servidor(host: str = HOST_PADRAO, porta: int = PORTA_PADRAO) -> ThreadingHTTPServer:
+    """Servidor pronto (``serve_forever`` para atender); cada requisição roda numa thread."""
+    return ThreadingHTTPServer((host, porta), _Tratador)
@@ -0,0 +1,114 @@
+from pathlib import Path
+
+import streamlit as st
+
+from pdf.dados_embutidos import ler_dados_embutidos
+from services.busca_documentos import pesquisar
+from services.documentos import dados_para_regerar, formato_documento, gerar_documento, tipos_documento
+from services.registro_documentos import ler_conteudo
+
+
+TIPO_LEGADO = "legado"
+
+
+def _descricoes() -> dict:
+    descricoes = {item["tipo"]: item["descricao"] for item in tipos_documento()}
+    descricoes[TIPO_LEGADO] = "Arquivo antigo da pasta pdf/"
+    return descricoes
+
+
+def _regerar(item: dict) -> None:
+    """Gera de novo, com o layout atual, a partir dos dados embutidos no PDF."""
+    chave = f"busca_regerado_{item['id']}"
+    payload = ler_dados_embutidos(ler_conteudo(item))
+    if payload is None:
+        st.session_state[chave] = {"erro": "O PDF não tem os dados de entrada embutidos."}
+        return
+    try:
+        tipo, dados = dados_para_regerar(payload)
+        st.session_state[chave] = {"tipo": tipo, "conteudo": gerar_documento(tipo, dados)}
+    except (KeyError, ValueError) as exc:
+        st.session_state[chave] = {"erro": f"Não foi possível gerar de novo: {exc}"}
+
+
+def _mostrar_resultado(item: dict, descricoes: dict) -> None:
+    with st.container(border=True):
+        titulo = [descricoes.get(item["tipo"], item["tipo"]), item["pessoa"], item["numero"]]
+        st.markdown(" · ".join(f"**{parte}**" if i == 0 else parte for i, parte in enumerate(titulo) if parte))
+        st.caption(
+            f"{item['nome_arquivo']} · gerado em {item['atualizado_em'].replace('T', ' ')}"
+            + (f" · {item['geracoes']} vezes" if item["geracoes"] > 1 else "")
+        )
+        if item["trecho"]:
+            st.markdown(" ".join(item["trecho"].split()))
+
+        if not Path(item["caminho"]).is_file():
+            st.info("O arquivo já foi removido pela retenção do registro.")
+            return
+        col_baixar, col_regerar = st.columns(2)
+        with col_baixar:
+            st.download_button(
+                "Baixar",
+                data=lambda caminho=item["caminho"]: open(caminho, "rb"),
+                file_name=item["nome_arquivo"],
+                mime=item["mime"],
+                key=f"busca_baixar_{item['id']}",
+                on_click="ignore",
+            )
+        if item["extensao"] != ".pdf":
+            return
+        with col_regerar:
+            st.button(
+                "Gerar novamente",
+                key=f"busca_regerar_{item['id']}",
+                on_click=_regerar,
+                args=(item,),
+                help="Gera o documento de novo com o layout atual, a partir dos dados embutidos no PDF.",
+            )
+        regerado = st.session_state.get(f"busca_regerado_{item['id']}")
+        if regerado and "erro" in regerado:
+            st.warning(regerado["erro"])
+        elif regerado:
+            extensao, mime = formato_documento(regerado["tipo"])
+            st.download_button(
+                "Baixar versão gerada agora",
+                data=regerado["conteudo"],
+                file_name=f"{Path(item['nome_arquivo']).stem}_novo.{extensao}",
+                mime=mime,
+                key=f"busca_baixar_regerado_{item['id']}",
+            )
+
+
+def render_busca_documentos():
+    st.title("🔎 Buscar documentos emitidos")
+    descricoes = _descricoes()
+
+    col_texto, col_tipo = st.columns([3, 2])
+    with col_texto:
+        texto = st.text_input(
+            "Pesquisar",
+            key="busca_texto",
+            placeholder="Nome, CPF, número, placa, trecho do documento...",
+        )
+    with col_tipo:
+        tipo = st.selectbox(
+            "Tipo",
+            [""] + list(descricoes),
+            format_func=lambda chave: descricoes.get(chave, "Todos"),
+            key="busca_tipo",
+        )
+
+    if not texto.strip():
+        st.caption(
+            "Os documentos gerados nas telas entram na busca automaticamente. Para incluir os PDFs antigos "
+            "da pasta pdf/, rode uma vez: python -m services.busca_documentos backfill"
+        )
+        return
+
+    resultados = pesquisar(texto, tipo)
+    if not resultados:
+        st.info("Nenhum documento encontrado.")
+        return
+    st.caption(f"{len(resultados)} documento(s) encontrados.")
+    for item in resultados:
+        _mostrar_resultado(item, descricoes)
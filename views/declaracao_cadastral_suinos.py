@@ -1,83 +1,15 @@
-from datetime import date, datetime
-from io import BytesIO
+from datetime import date
 from pathlib import Path
 
 import streamlit as st
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import mm
-from reportlab.lib.utils import ImageReader
-from reportlab.pdfbase.pdfmetrics import stringWidth
-from reportlab.pdfgen import canvas
 from streamlit.errors import StreamlitAPIException
 
-
-def _wrap_text(text: str, font_name: str, font_size: int, max_width: float):
-    linhas = []
-    for paragrafo in text.splitlines():
-        palavras = paragrafo.split()
-        if not palavras:
-            linhas.append("")
-            continue
-        linha = palavras[0]
-        for palavra in palavras[1:]:
-            tentativa = f"{linha} {palavra}"
-            if stringWidth(tentativa, font_name, font_size) <= max_width:
-                linha = tentativa
-            else:
-                linhas.append(linha)
-                linha = palavra
-        linhas.append(linha)
-    return linhas
-
-
-def _draw_restituicao_header(
-    c: canvas.Canvas, page_width: float, page_height: float, logo_path: Path
-) -> float:
-    margin = 20 * mm
-    rect_h = 30 * mm
-    rect_w = page_width - 2 * margin
-    rect_x = margin
-    rect_y = page_height - margin - rect_h
-
-    if logo_path.exists():
-        logo = ImageReader(str(logo_path))
-        img_w, img_h = logo.getSize()
-        max_w = rect_w * 0.8
-        max_h = 32 * mm
-        scale = min(max_w / img_w, max_h / img_h)
-        draw_w = img_w * scale
-        draw_h = img_h * scale
-        img_x = rect_x + (rect_w - draw_w) / 2
-        img_y = rect_y + (rect_h - draw_h) / 2 - 2 * mm
-        c.drawImage(logo, img_x, img_y, width=draw_w, height=draw_h, mask="auto")
-
-    return rect_y
-
-
-def _draw_label_value(c: canvas.Canvas, x: float, y: float, label: str, value: str) -> float:
-    c.setFont("Helvetica-Bold", 10)
-    label_text = f"{label} "
-    c.drawString(x, y, label_text)
-    c.setFont("Helvetica", 10)
-    c.drawString(x + stringWidth(label_text, "Helvetica-Bold", 10), y, value)
-    return y - 6 * mm
-
-
-def _safe_int(value) -> int:
-    try:
-        return int(value or 0)
-    except (TypeError, ValueError):
-        return 0
-
-
-def _fmt_date(value) -> str:
-    if isinstance(value, datetime):
-        return value.strftime("%d/%m/%Y")
-    if isinstance(value, date):
-        return value.strftime("%d/%m/%Y")
-    if value:
-        return str(value)
-    return ""
+from pdf.declaracao_cadastral_suinos import (
+    _fmt_date,
+    _safe_int,
+    build_pdf_declaracao_cadastral_suinos,
+)
+from services.gravacao import agendar, mostrar_situacao
 
 
 def _sync_field_from_source(source_key: str, target_key: str):
@@ -92,233 +24,6 @@ def _sync_field_from_source(source_key: str, target_key: str):
     st.session_state[prev_source_key] = source_value
 
 
-def _build_declaracao_texto(data: dict) -> tuple[str, str]:
-    nome = data.get("nome", "").strip() or "____________________________"
-    nacionalidade = data.get("nacionalidade", "").strip() or "____________________________"
-    profissao = data.get("profissao", "").strip() or "____________________________"
-    rg = data.get("rg", "").strip() or "____________________________"
-    orgao_emissor = data.get("orgao_emissor", "").strip()
-    cpf_cnpj = data.get("cpf_cnpj", "").strip() or "____________________________"
-    ulsav = data.get("ulsav", "").strip() or "____________________________"
-    endereco = data.get("endereco", "").strip() or "____________________________"
-    municipio = data.get("municipio", "").strip() or "____________________________"
-    uf = data.get("uf", "").strip() or "RO"
-
-    rg_completo = f"{rg} {orgao_emissor}".strip()
-
-    texto_principal = (
-        f"Declaramos para os devidos fins de direito, que {nome}, {nacionalidade}, "
-        f"{profissao}, portador(a) do RG n.º {rg_completo}, e do CPF/CNPJ n.º {cpf_cnpj}, "
-        "encontra-se com rebanho da espécie SUÍNA devidamente regular quanto ao "
-        f"cumprimento das exigências sanitárias e cadastrado junto à ULSAV de {ulsav}, "
-        f"localizado no endereço: {endereco}, no município de {municipio} - {uf}."
-    )
-    texto_responsabilidade = (
-        "A IDARON não certifica a relação jurídica de posse que o(s) titular(es) da "
-        "ficha de controle sanitário possui(em) com os animais (bens) abaixo declarados, "
-        "e as informações do rebanho foram prestadas pelo produtor, sendo, portanto, de "
-        "sua inteira responsabilidade."
-    )
-    return texto_principal, texto_responsabilidade
-
-
-def _draw_table_header(
-    c: canvas.Canvas, col_x: list[float], y_top: float, row_h: float, header_h: float
-) -> float:
-    labels = [
-        "Reprodutor",
-        "Matriz",
-        "Leitão M",
-        "Leitão F",
-        "Idade e Sexo\nnão relev.",
-        "Total de\nAnimais",
-    ]
-
-    c.rect(col_x[0], y_top - header_h, col_x[-1] - col_x[0], header_h, stroke=1, fill=0)
-    c.setFont("Helvetica-Bold", 8.5)
-
-    for idx, label in enumerate(labels):
-        x_left = col_x[idx]
-        x_right = col_x[idx + 1]
-        linhas = label.split("\n")
-        y_text = y_top - 4.8 * mm
-        if len(linhas) == 2:
-            y_text = y_top - 3.4 * mm
-        for linha_idx, linha in enumerate(linhas):
-            c.drawCentredString((x_left + x_right) / 2, y_text - linha_idx * 3.8 * mm, linha)
-
-    return y_top - header_h
-
-
-def _draw_estratificacao_table(c: canvas.Canvas, x: float, y_top: float, width: float, data: dict) -> float:
-    c.setFont("Helvetica-Bold", 9)
-    c.drawString(x, y_top, "Estratificação - SUÍNOS")
-    y_top -= 2 * mm
-
-    col_widths = [24 * mm, 24 * mm, 24 * mm, 24 * mm, 32 * mm, 28 * mm]
-    scale = width / sum(col_widths)
-    col_widths = [w * scale for w in col_widths]
-    col_x = [x]
-    for item in col_widths:
-        col_x.append(col_x[-1] + item)
-
-    header_h = 10 * mm
-    row_h = 8 * mm
-    table_top = y_top
-    body_top = _draw_table_header(c, col_x, table_top, row_h, header_h)
-
-    c.setLineWidth(0.7)
-    c.rect(x, body_top - row_h, width, row_h)
-    for x_line in col_x[1:-1]:
-        c.line(x_line, table_top - header_h - row_h, x_line, table_top)
-
-    valores = [
-        str(_safe_int(data.get("reprodutor"))),
-        str(_safe_int(data.get("matriz"))),
-        str(_safe_int(data.get("leitao_m"))),
-        str(_safe_int(data.get("leitao_f"))),
-        str(_safe_int(data.get("idade_sexo_nao_relevante"))),
-        str(_safe_int(data.get("total_animais"))),
-    ]
-
-    c.setFont("Helvetica-Bold", 10)
-    for idx, valor in enumerate(valores):
-        c.drawCentredString((col_x[idx] + col_x[idx + 1]) / 2, body_top - 5.2 * mm, valor)
-
-    return body_top - row_h - 4 * mm
-
-
-def _draw_labeled_box(
-    c: canvas.Canvas,
-    x: float,
-    y_top: float,
-    width: float,
-    height: float,
-    label: str,
-    value: str,
-    value_font: int = 8,
-) -> None:
-    c.rect(x, y_top - height, width, height)
-    c.setFont("Helvetica-Bold", 6.3)
-    c.drawString(x + 1.2 * mm, y_top - 2.8 * mm, label)
-    c.setFont("Helvetica", value_font)
-    linhas = _wrap_text(value or "", "Helvetica", value_font, width - 2.6 * mm)
-    y_text = y_top - 6.4 * mm
-    for linha in linhas[:3]:
-        c.drawString(x + 1.2 * mm, y_text, linha)
-        y_text -= 3.4 * mm
-
-
-def _draw_imovel_section(c: canvas.Canvas, x: float, y_top: float, width: float, data: dict) -> float:
-    c.setFont("Helvetica-Bold", 8.8)
-    c.drawString(x, y_top, "Dados do Imóvel Rural aonde os animais se encontram")
-    y_top -= 2 * mm
-
-    row1_h = 9 * mm
-    row2_h = 9 * mm
-    row3_h = 9 * mm
-
-    cpf_w = 34 * mm
-    nome_w = 78 * mm
-    cod_prop_w = width - cpf_w - nome_w
-    _draw_labeled_box(c, x, y_top, cpf_w, row1_h, "CPF/CNPJ DO PROP.", data.get("cpf_cnpj_prop", ""))
-    _draw_labeled_box(c, x + cpf_w, y_top, nome_w, row1_h, "NOME DO PROP. DO IMÓVEL", data.get("nome_prop_imovel", ""))
-    _draw_labeled_box(c, x + cpf_w + nome_w, y_top, cod_prop_w, row1_h, "CÓD. PROPRIEDADE PGA", data.get("cod_propriedade_pga", ""))
-    y_top -= row1_h
-
-    vinculo_w = 92 * mm
-    exploracao_w = width - vinculo_w
-    _draw_labeled_box(c, x, y_top, vinculo_w, row2_h, "Tipo de Vínculo do Pecuarista com a Terra", data.get("tipo_vinculo", ""))
-    _draw_labeled_box(c, x + vinculo_w, y_top, exploracao_w, row2_h, "CÓD. EXPLORAÇÃO PGA", data.get("cod_exploracao_pga", ""))
-    y_top -= row2_h
-
-    local_data = data.get("local_data_extenso", "").strip()
-    c.setFont("Helvetica", 9)
-    c.drawString(x, y_top - 5 * mm, local_data)
-    y_top -= row3_h
-
-    return y_top
-
-
-def _draw_observacoes_section(c: canvas.Canvas, x: float, y_top: float, width: float, observacoes: str) -> float:
-    texto = (observacoes or "").strip()
-    if not texto:
-        return y_top
-
-    c.setFont("Helvetica-Bold", 8.5)
-    c.drawString(x, y_top, "Observações:")
-    y_top -= 5 * mm
-
-    c.setFont("Helvetica", 9)
-    for linha in _wrap_text(texto, "Helvetica", 9, width):
-        c.drawString(x, y_top, linha)
-        y_top -= 4.4 * mm
-
-    return y_top - 3 * mm
-
-
-def _draw_emitente_section(c: canvas.Canvas, x: float, y_top: float, width: float, data: dict) -> float:
-    numero = data.get("numero_declaracao", "").strip() or "____________________________"
-    c.setFont("Helvetica-Bold", 8.8)
-    c.drawRightString(x + width, y_top, f"DECLARAÇÃO - N.º {numero}")
-    y_top -= 5 * mm
-
-    c.setFont("Helvetica-Bold", 8.5)
-    c.drawString(x, y_top, "Identificação do Emitente:")
-    y_top -= 5 * mm
-
-    y_top = _draw_label_value(c, x, y_top, "Nome:", data.get("emitente_nome", "").strip() or "____________________________")
-    y_top = _draw_label_value(c, x, y_top, "Cargo:", data.get("emitente_cargo", "").strip() or "____________________________")
-    y_top = _draw_label_value(c, x, y_top, "Matrícula:", data.get("emitente_matricula", "").strip() or "____________________________")
-    return y_top
-
-
-def build_pdf_declaracao_cadastral_suinos(data: dict, logo_path: Path) -> bytes:
-    buffer = BytesIO()
-    page_width, page_height = A4
-    c = canvas.Canvas(buffer, pagesize=A4)
-
-    title_y = _draw_restituicao_header(c, page_width, page_height, logo_path)
-
-    margin = 20 * mm
-    width = page_width - 2 * margin
-    y = title_y - 8 * mm
-
-    c.setFont("Helvetica-Bold", 12)
-    c.drawCentredString(page_width / 2, y, "DECLARAÇÃO CADASTRAL - SUÍNOS")
-    y -= 8 * mm
-
-    ulsav = data.get("ulsav", "").strip() or "____________________________"
-    numero = data.get("numero_declaracao", "").strip() or "____________________________"
-    c.setFont("Helvetica-Bold", 10)
-    c.drawCentredString(page_width / 2, y, f"ULSAV: {ulsav}")
-    y -= 5.5 * mm
-    c.drawCentredString(page_width / 2, y, f"DECLARAÇÃO - N.º: {numero}")
-    y -= 7 * mm
-
-    texto_principal, texto_responsabilidade = _build_declaracao_texto(data)
-    c.setFont("Helvetica", 9.5)
-    for linha in _wrap_text(texto_principal, "Helvetica", 9.5, width):
-        c.drawString(margin, y, linha)
-        y -= 4.6 * mm
-
-    y -= 1 * mm
-    for linha in _wrap_text(texto_responsabilidade, "Helvetica", 9.5, width):
-        c.drawString(margin, y, linha)
-        y -= 4.6 * mm
-
-    y -= 2 * mm
-    y = _draw_estratificacao_table(c, margin, y, width, data)
-    y = _draw_imovel_section(c, margin, y, width, data)
-    y = _draw_observacoes_section(c, margin, y - 1 * mm, width, data.get("observacoes", ""))
-    _draw_emitente_section(c, margin, y, width, data)
-
-    c.showPage()
-    c.save()
-    buffer.seek(0)
-    return buffer.read()
-
-
 def render_declaracao_cadastral_suinos():
     st.session_state.setdefault("dcs_reprodutor", 0)
     st.session_state.setdefault("dcs_matriz", 0)
@@ -448,12 +153,14 @@ def render_declaracao_cadastral_suinos():
             pdf_bytes = build_pdf_declaracao_cadastral_suinos(data, logo_path)
             st.session_state["declaracao_cadastral_suinos_pdf"] = pdf_bytes
 
-            output_dir = Path(__file__).resolve().parents[1] / "pdf"
-            output_dir.mkdir(parents=True, exist_ok=True)
-            output_path = output_dir / "declaracao_cadastral_suinos.pdf"
-            output_path.write_bytes(pdf_bytes)
-            st.session_state["declaracao_cadastral_suinos_pdf_path"] = output_path
-            st.success("PDF gerado e salvo.")
+            st.session_state["declaracao_cadastral_suinos_pdf_gravacao"] = agendar(
+                pdf_bytes,
+                "declaracao_cadastral_suinos",
+                "declaracao_cadastral_suinos.pdf",
+                pessoa=data["nome"],
+                numero=data["numero_declaracao"],
+            )
+            st.success("PDF gerado.")
 
         if "declaracao_cadastral_suinos_pdf" in st.session_state:
             st.markdown("### Página de impressão")
@@ -471,5 +178,5 @@ def render_declaracao_cadastral_suinos():
                 file_name="declaracao_cadastral_suinos.pdf",
                 mime="application/pdf",
             )
-            if "declaracao_cadastral_suinos_pdf_path" in st.session_state:
-                st.caption(f"Salvo em: {st.session_state['declaracao_cadastral_suinos_pdf_path']}")
+            if "declaracao_cadastral_suinos_pdf_gravacao" in st.session_state:
+                mostrar_situacao(st.session_state["declaracao_cadastral_suinos_pdf_gravacao"])
@@ -1,125 +1,12 @@
 from datetime import datetime
-from io import BytesIO
 from pathlib import Path
 
 import streamlit as st
 from streamlit.errors import StreamlitAPIException
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import mm
-from reportlab.lib.utils import ImageReader
-from reportlab.pdfbase.pdfmetrics import stringWidth
-from reportlab.pdfgen import canvas
 
-def _wrap_text(text: str, font_name: str, font_size: int, max_width: float):
-    linhas = []
-    for paragrafo in text.splitlines():
-        palavras = paragrafo.split()
-        if not palavras:
-            linhas.append("")
-            continue
-        linha = palavras[0]
-        for palavra in palavras[1:]:
-            tentativa = f"{linha} {palavra}"
-            if stringWidth(tentativa, font_name, font_size) <= max_width:
-                linha = tentativa
-            else:
-                linhas.append(linha)
-                linha = palavra
-        linhas.append(linha)
-    return linhas
+from pdf.declaracao_nada_consta import build_pdf_declaracao_nada_consta
+from services.gravacao import agendar, mostrar_situacao
 
-def build_pdf_declaracao_nada_consta(data: dict, logo_path: Path) -> bytes:
-    buffer = BytesIO()
-    page_width, page_height = A4
-    c = canvas.Canvas(buffer, pagesize=A4)
-
-    margin = 20 * mm
-    y = page_height - margin
-
-    if logo_path.exists():
-        logo = ImageReader(str(logo_path))
-        img_w, img_h = logo.getSize()
-        max_w = page_width - 2 * margin
-        max_h = 25 * mm
-        scale = min(max_w / img_w, max_h / img_h)
-        draw_w = img_w * scale
-        draw_h = img_h * scale
-        img_x = (page_width - draw_w) / 2
-        y -= draw_h
-        c.drawImage(logo, img_x, y, width=draw_w, height=draw_h, mask="auto")
-        y -= 10 * mm
-    else:
-        y -= 10 * mm
-
-    c.setFont("Helvetica-Bold", 14)
-    c.drawCentredString(page_width / 2, y, "DECLARAÇÃO")
-    y -= 12 * mm
-
-    c.setFont("Helvetica", 11)
-    for linha in [
-        data.get("destinatario", ""),
-        "Requerente",
-        data.get("nome_caps", ""),
-        data.get("vocativo", ""),
-    ]:
-        if linha:
-            c.drawString(margin, y, linha)
-            y -= 6 * mm
-
-    corpo = data.get("corpo", "")
-    if corpo:
-        y -= 2 * mm
-        for linha in _wrap_text(corpo, "Helvetica", 11, page_width - 2 * margin):
-            c.drawString(margin, y, linha)
-            y -= 5 * mm
-
-    y -= 6 * mm
-    c.drawString(margin, y, "Atenciosamente,")
-    y -= 14 * mm
-
-    servidor_nome = data.get("servidor_nome") or data.get("nome_caps", "")
-    servidor_cargo = data.get("servidor_cargo", "")
-    servidor_matricula = data.get("servidor_matricula", "")
-    incluir_assinatura_requerente = data.get("incluir_assinatura_requerente", True)
-    requerente_nome = data.get("nome_caps", "").strip()
-    requerente_cpf = data.get("cpf", "").strip()
-    requerente_rg = data.get("rg", "").strip()
-
-    if servidor_nome:
-        c.setFont("Helvetica", 11)
-        c.drawCentredString(page_width / 2, y, servidor_nome)
-        y -= 6 * mm
-    if servidor_cargo:
-        c.setFont("Helvetica", 10)
-        c.drawCentredString(page_width / 2, y, f"Cargo: {servidor_cargo}")
-        y -= 5 * mm
-    if servidor_matricula:
-        c.setFont("Helvetica", 10)
-        c.drawCentredString(page_width / 2, y, f"Matrícula: {servidor_matricula}")
-        y -= 5 * mm
-
-    if incluir_assinatura_requerente and (requerente_nome or requerente_cpf or requerente_rg):
-        y -= 10 * mm
-        if requerente_nome:
-            c.setFont("Helvetica", 11)
-            c.drawCentredString(page_width / 2, y, requerente_nome)
-            y -= 6 * mm
-        docs_requerente = []
-        if requerente_cpf:
-            docs_requerente.append(f"CPF: {requerente_cpf}")
-        if requerente_rg:
-            docs_requerente.append(f"RG: {requerente_rg}")
-        if docs_requerente:
-            c.setFont("Helvetica", 10)
-            c.drawCentredString(page_width / 2, y, " | ".join(docs_requerente))
-            y -= 5 * mm
-        c.setFont("Helvetica", 10)
-        c.drawCentredString(page_width / 2, y, "Assinatura do requerente")
-
-    c.showPage()
-    c.save()
-    buffer.seek(0)
-    return buffer.read()
 
 def render_declaracao_nada_consta():
     col_esq, col_meio, col_dir = st.columns([0.1, 8, 0.1])
@@ -195,6 +82,7 @@ def render_declaracao_nada_consta():
                 "incluir_assinatura_requerente": incluir_assinatura_requerente,
             }
             st.session_state["dnc_show_page"] = True
+            st.session_state["dnc_registrar"] = True
 
         if st.session_state.get("dnc_show_page"):
             data = st.session_state.get("dnc_page_data", {})
@@ -222,6 +110,10 @@ def render_declaracao_nada_consta():
                 },
                 logo_path,
             )
+            if st.session_state.pop("dnc_registrar", False):
+                st.session_state["dnc_pdf_gravacao"] = agendar(
+                    pdf_bytes, "declaracao_nada_consta", "declaracao_nada_consta.pdf", pessoa=nome_caps, numero=cpf
+                )
             try:
                 st.pdf(pdf_bytes)
             except StreamlitAPIException:
@@ -235,3 +127,5 @@ def render_declaracao_nada_consta():
                 file_name="declaracao_nada_consta.pdf",
                 mime="application/pdf",
             )
+            if "dnc_pdf_gravacao" in st.session_state:
+                mostrar_situacao(st.session_state["dnc_pdf_gravacao"])
@@ -0,0 +1,93 @@
+import streamlit as st
+
+from pdf.imagens import estatisticas_imagens
+from pdf.modelo_pagina import estatisticas_modelos
+from services.busca_documentos import estatisticas_busca
+from services.cache_documentos import estatisticas_cache
+from services.cache_extracao import estatisticas_extracao
+from services.gravacao import estatisticas_gravacao
+from services.instrumentacao import (
+    AMOSTRAGEM,
+    configurar_amostragem,
+    estatisticas_instrumentacao,
+    exportar_jsonl,
+    limpar_instrumentacao,
+    resumo_medicoes,
+)
+from services.pessoas import estatisticas_pessoas
+from services.registro_documentos import estatisticas_registro
+from services.renderizacao import estatisticas_renderizacao
+from views.registro import tempos_importacao
+
+
+def render_diagnostico():
+    """Página oculta (``?pagina=diagnostico``) com as medições dos geradores."""
+    st.title("Diagnóstico")
+
+    estatisticas = estatisticas_instrumentacao()
+    st.caption(
+        f"{estatisticas['itens']} de {estatisticas['capacidade']} registros no buffer · "
+        f"{estatisticas['chamadas']} chamadas vistas · {estatisticas['com_memoria']} com memória medida"
+    )
+
+    col_tempo, col_memoria = st.columns(2)
+    with col_tempo:
+        tempo = st.slider("Chamadas registradas", 0.0, 1.0, AMOSTRAGEM["tempo"], 0.05, key="diagnostico_tempo")
+    with col_memoria:
+        memoria = st.slider(
+            "Registradas com tracemalloc", 0.0, 1.0, AMOSTRAGEM["memoria"], 0.01, key="diagnostico_memoria"
+        )
+    configurar_amostragem(tempo=tempo, memoria=memoria)
+
+    st.subheader("Por tipo de documento")
+    resumo = resumo_medicoes()
+    if resumo:
+        st.dataframe(resumo, hide_index=True, width="stretch")
+    else:
+        st.info("Nenhuma chamada registrada ainda.")
+
+    col_baixar, col_limpar = st.columns(2)
+    with col_baixar:
+        st.download_button(
+            "Exportar registros (JSON lines)",
+            data=exportar_jsonl(),
+            file_name="medicoes.jsonl",
+            mime="application/x-ndjson",
+            key="diagnostico_exportar",
+        )
+    with col_limpar:
+        if st.button("Limpar registros", key="diagnostico_limpar"):
+            limpar_instrumentacao()
+            st.rerun()
+
+    st.subheader("Caches")
+    st.dataframe(
+        [
+            {"cache": "documentos", **estatisticas_cache()},
+            {"cache": "extração", **estatisticas_extracao()},
+        ],
+        hide_index=True,
+        width="stretch",
+    )
+    st.json(
+        {
+            "modelos de página": estatisticas_modelos(),
+            "imagens": estatisticas_imagens(),
+            "cadastro de pessoas": estatisticas_pessoas(),
+            "fila de renderização": estatisticas_renderizacao(),
+        },
+        expanded=False,
+    )
+
+    st.subheader("Registro de documentos")
+    st.json(
+        {
+            "registro": estatisticas_registro(),
+            "gravação": estatisticas_gravacao(),
+            "busca": estatisticas_busca(),
+        },
+        expanded=False,
+    )
+
+    st.subheader("Importação das páginas (s)")
+    st.json(tempos_importacao(), expanded=False)
@@ -1,6 +1,7 @@
 import streamlit as st
 from streamlit.errors import StreamlitAPIException
 
+from services.gravacao import agendar, mostrar_situacao
 from services.pdf_builders import gerar_lista_presenca_pdf
 from services.constants import MESES, ANOS_OPCOES
 
@@ -109,7 +110,15 @@ def render_lista_presenca():
                 ),
                 qual=qual,
             )
+            st.session_state["lista_presenca_pdf"] = pdf_bytes
+            st.session_state["lista_presenca_pdf_gravacao"] = agendar(
+                pdf_bytes, "lista_presenca", "lista_presenca.pdf", pessoa=unidade, data=data
+            )
             st.success("Lista de presença gerada.")
+
+        # fica na sessão: o aviso de gravação refaz a página quando termina
+        if "lista_presenca_pdf" in st.session_state:
+            pdf_bytes = st.session_state["lista_presenca_pdf"]
             try:
                 st.pdf(pdf_bytes)
             except StreamlitAPIException:
@@ -120,3 +129,4 @@ def render_lista_presenca():
                 file_name="lista_presenca.pdf",
                 mime="application/pdf",
             )
+            mostrar_situacao(st.session_state["lista_presenca_pdf_gravacao"])
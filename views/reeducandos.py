@@ -1,21 +1,133 @@
-﻿import streamlit as st
+﻿import tempfile
+import time
+
+import streamlit as st
 from streamlit.errors import StreamlitAPIException
 
 from services.constants import (
     ANOS_OPCOES,
     MESES,
 )
+from services.feriados import feriados_do_mes
+from services.gravacao import agendar, mostrar_situacao
+from services.importacao import (
+    COLUNAS_ROSTER,
+    expandir_arquivos,
+    importar_arquivos,
+    linhas_para_lote,
+)
+from services.lote import (
+    TIPOS_DOCUMENTO,
+    escrever_pdf_unico,
+    escrever_zip,
+    gerar_lote,
+    ler_roster,
+    preparar_lote,
+    workers_padrao,
+)
 from services.parsers import (
-    _ler_upload,
+    _campos_upload,
+    _chave_upload,
     _parse_campos,
     _safe_index,
+    parse_calendario_feriados,
     parse_feriados_text,
 )
 from services.pdf_builders import (
     gerar_pdf,
+    gerar_periodo_pdf,
     gerar_relatorio_pdf,
+    rotulo_periodo,
+)
+from services.pessoas import buscar_pessoas, obter_pessoa, registrar_emissao, salvar_pessoa
+from services.saida import (
+    DIRETORIO,
+    botao_download,
+    existe,
+    finalizar,
+    guardar_na_sessao,
+    ler_bytes,
+    novo_arquivo,
+    remover,
 )
 
+
+def _feriados_tela(ano, mes, municipio, feriados_digitados):
+    """Feriados digitados, somados aos automáticos quando a opção está marcada."""
+    if st.session_state.get("feriados_automaticos", True):
+        return feriados_do_mes(ano, mes, municipio, feriados_digitados)
+    return {dia: nome for dia, nome in (feriados_digitados or {}).items() if nome}
+
+
+def _preencher_pessoa():
+    """Callback do autocompletar: copia o cadastro escolhido para os campos da tela."""
+    pessoa = obter_pessoa(st.session_state.get("pessoa_escolhida"))
+    if pessoa is None:
+        return
+    st.session_state.update({campo: valor for campo, valor in pessoa["campos"].items() if valor})
+    st.session_state["pessoa_id"] = pessoa["id"]
+
+
+def _rotulo_pessoa(pessoa: dict) -> str:
+    campos = pessoa["campos"]
+    partes = [campos.get("reeducando", ""), campos.get("cpf", ""), campos.get("secretaria", "")]
+    return " · ".join(parte for parte in partes if parte)
+
+
+def _registrar_documento(chave_sessao: str, handle: dict, tipo: str, campos: dict, data: str) -> None:
+    """Agenda o PDF gerado para o registro de documentos (e a busca)."""
+    st.session_state[f"{chave_sessao}_gravacao"] = agendar(
+        ler_bytes(handle),
+        tipo,
+        handle["nome"],
+        pessoa=campos.get("reeducando", ""),
+        numero=campos.get("cpf", ""),
+        data=data,
+    )
+
+
+def _lembrar_pessoa(campos: dict, ano, mes, tipo: str) -> None:
+    """Grava/atualiza o cadastro da pessoa e marca o mês como emitido."""
+    if not str(campos.get("reeducando") or "").strip():
+        return
+    identificador = salvar_pessoa(campos)
+    registrar_emissao(identificador, ano, mes, tipo)
+    st.session_state["pessoa_id"] = identificador
+
+
+def _gerar_lote_na_tela(pessoas, tipos, workers, pdf_unico, chave_sessao):
+    """Gera o lote com barra de progresso e guarda o arquivo na sessão."""
+    barra = st.progress(0.0, text=f"0 de {len(pessoas)}")
+
+    def _progresso(concluidos, total):
+        barra.progress(concluidos / total, text=f"{concluidos} de {total}")
+
+    if pdf_unico:
+        lote = novo_arquivo("lote.pdf", "application/pdf")
+    else:
+        lote = novo_arquivo("lote.zip", "application/zip")
+    try:
+        with tempfile.TemporaryDirectory(dir=DIRETORIO) as pasta:
+            resultados = gerar_lote(
+                pessoas,
+                pasta,
+                tipos,
+                workers=workers,
+                progresso=_progresso,
+                separados=not pdf_unico,
+            )
+            if pdf_unico:
+                escrever_pdf_unico(resultados, lote["caminho"])
+            else:
+                escrever_zip(resultados, lote["caminho"])
+    except RuntimeError as exc:
+        remover(lote)
+        st.error(str(exc))
+    else:
+        guardar_na_sessao(chave_sessao, finalizar(lote))
+        st.success(f"Lote gerado: {len(pessoas)} reeducando(s).")
+
+
 def render_folha_ponto():
     col_left, col_mid, col_right = st.columns([0.1, 8, 0.1])
     with col_mid:
@@ -25,20 +137,48 @@ def render_folha_ponto():
             arquivo = st.file_uploader("Selecione o PDF ou DOCX da ?ltima folha", type=["pdf", "docx"])
             if arquivo:
                 # aplica os campos apenas uma vez por arquivo para permitir edicoes depois
-                if st.session_state.get("_ultimo_upload") != arquivo.name:
+                chave_upload = _chave_upload(arquivo)
+                if st.session_state.get("_ultimo_upload") != chave_upload:
                     st.session_state["_upload_aplicado"] = False
-                    st.session_state["_ultimo_upload"] = arquivo.name
+                    st.session_state["_ultimo_upload"] = chave_upload
 
                 if not st.session_state.get("_upload_aplicado", False):
-                    texto = _ler_upload(arquivo)
-                    if not texto:
+                    campos = _campos_upload(arquivo, _parse_campos)
+                    if not campos:
                         st.warning("N?o consegui ler o arquivo enviado.")
                     else:
-                        campos = _parse_campos(texto)
                         st.session_state.update({k: v for k, v in campos.items() if v})
                         st.session_state["_upload_aplicado"] = True
                         st.success("Campos preenchidos a partir do arquivo.")
 
+        with st.expander("Buscar reeducando cadastrado", expanded=False):
+            busca = st.text_input(
+                "Nome, CPF ou secretaria",
+                key="pessoa_busca",
+                placeholder="Digite o começo do nome ou do CPF",
+            )
+            encontrados = {pessoa["id"]: pessoa for pessoa in buscar_pessoas(busca)}
+            if encontrados:
+                st.selectbox(
+                    "Cadastros encontrados",
+                    list(encontrados),
+                    index=None,
+                    format_func=lambda identificador: _rotulo_pessoa(encontrados[identificador]),
+                    placeholder="Escolha para preencher os dados",
+                    key="pessoa_escolhida",
+                    on_change=_preencher_pessoa,
+                )
+            elif busca.strip():
+                st.caption("Nenhum cadastro encontrado.")
+            pessoa_atual = obter_pessoa(st.session_state.get("pessoa_id"))
+            if pessoa_atual and pessoa_atual["emissoes"]:
+                st.caption(
+                    f"Já emitidos para {pessoa_atual['campos']['reeducando']}: "
+                    + ", ".join(
+                        f"{item['mes']:02d}/{item['ano']} ({item['tipo']})" for item in pessoa_atual["emissoes"][:12]
+                    )
+                )
+
         with st.expander("Dados do Reeducando", expanded=False):
             secretaria_input = st.text_input("Secretaria", key="secretaria")
             reeducando_input = st.text_input("Reeducando", key="reeducando")
@@ -135,6 +275,25 @@ def render_folha_ponto():
                 hs_index = _safe_index(opcoes_hs, hs_default, 0)
                 hs = st.selectbox("Horário de saída (HS)", opcoes_hs, index=hs_index, key="hs")
 
+            # o que vai para o cadastro de pessoas quando a folha ou o relatório é gerado
+            campos_pessoa = {
+                "secretaria": secretaria_input,
+                "reeducando": reeducando_input,
+                "funcao": funcao_input,
+                "data_inclusao": data_inclusao_input,
+                "municipio": municipio_input,
+                "cpf": cpf_input,
+                "banco": banco_input,
+                "agencia": agencia_input,
+                "conta": conta_input,
+                "tipo_conta": tipo_conta_input,
+                "endereco": endereco_input,
+                "cep": cep_input,
+                "telefone": telefone_input,
+                "he": he,
+                "hs": hs,
+            }
+
             feriados_texto = st.text_area(
                 "Feriados (formato: dia-descrição, separados por vírgulas)",
                 value=st.session_state.get("feriados_texto", ""),
@@ -142,10 +301,27 @@ def render_folha_ponto():
                 help=(
                     "Use dia-descrição separados por vírgulas. Ex.: 1-Confraternização Universal, "
                     "15-Feriado inventado, 21-Dia tal (dia entre 1 e 31). "
-                    "Exemplo para colar: 1-Feriado, 2-Feriado2, 3-Feriado3."
+                    "Exemplo para colar: 1-Feriado, 2-Feriado2, 3-Feriado3. "
+                    "Dia sem descrição (ex.: 21-) retira o feriado automático daquele dia."
                 ),
             )
 
+            feriados_automaticos = st.checkbox(
+                "Incluir feriados nacionais, estaduais (RO) e municipais",
+                value=True,
+                key="feriados_automaticos",
+                help=(
+                    "Os feriados digitados acima são somados a estes (ou os renomeiam, no mesmo dia). "
+                    "Para retirar só um deles, digite o dia sem descrição (ex.: 21-)."
+                ),
+            )
+            if feriados_automaticos:
+                do_mes = feriados_do_mes(ano, MESES[mes_label], municipio_input)
+                st.caption(
+                    "Feriados do mês: "
+                    + (", ".join(f"{dia}-{nome}" for dia, nome in do_mes.items()) or "nenhum")
+                )
+
             st.write(
                 """
             Selecione o mês e o ano, gere o PDF com o cabeçalho oficial e depois baixe o arquivo.
@@ -161,7 +337,8 @@ def render_folha_ponto():
                         st.error("Revise os feriados informados: " + "; ".join(erros))
                     else:
                         st.session_state["feriados_texto"] = feriados_texto
-                        st.session_state["pdf"] = gerar_pdf(
+                        folha = novo_arquivo("folha.pdf", "application/pdf")
+                        gerar_pdf(
                             ano=ano,
                             mes=MESES[mes_label],
                             he=he,
@@ -180,8 +357,12 @@ def render_folha_ponto():
                             agencia=agencia_input,
                             conta=conta_input,
                             tipo_conta=tipo_conta_input,
-                            feriados=feriados_dict,
+                            feriados=_feriados_tela(ano, MESES[mes_label], municipio_input, feriados_dict),
+                            destino=folha["caminho"],
                         )
+                        guardar_na_sessao("pdf", finalizar(folha))
+                        _registrar_documento("pdf", folha, "folha", campos_pessoa, data_input)
+                        _lembrar_pessoa(campos_pessoa, ano, MESES[mes_label], "folha")
                         st.success("Folha de ponto gerada com sucesso!")
             with col_btn[1]:
                 if st.button("Gerar Relatório de Atividades"):
@@ -190,7 +371,8 @@ def render_folha_ponto():
                         st.error("Revise os feriados informados: " + "; ".join(erros))
                     else:
                         st.session_state["feriados_texto"] = feriados_texto
-                        st.session_state["relatorio_pdf"] = gerar_relatorio_pdf(
+                        relatorio = novo_arquivo("relatorio_atividades.pdf", "application/pdf")
+                        gerar_relatorio_pdf(
                             ano=ano,
                             mes=MESES[mes_label],
                             secretaria=secretaria_input,
@@ -201,45 +383,268 @@ def render_folha_ponto():
                             cep=cep_input,
                             telefone=telefone_input,
                             data_preenchimento=data_input,
-                            feriados=feriados_dict,
+                            feriados=_feriados_tela(ano, MESES[mes_label], municipio_input, feriados_dict),
                             rodape_titulo=rodape_titulo_input,
                             rodape_endereco=rodape_endereco_input,
                             rodape_fone=rodape_fone_input,
                             rodape_cep=rodape_cep_input,
                             rodape_email=rodape_email_input,
+                            destino=relatorio["caminho"],
                         )
+                        guardar_na_sessao("relatorio_pdf", finalizar(relatorio))
+                        _registrar_documento("relatorio_pdf", relatorio, "relatorio", campos_pessoa, data_input)
+                        _lembrar_pessoa(campos_pessoa, ano, MESES[mes_label], "relatorio")
                         st.success("Relatório de atividades gerado com sucesso!")
 
+        with st.expander("Gerar vários meses (mesmo reeducando)", expanded=False):
+            mes_opcoes = list(MESES.keys())
+            col_periodo = st.columns(2)
+            with col_periodo[0]:
+                mes_ini_label = st.selectbox("Mês inicial", mes_opcoes, index=0, key="periodo_mes_ini")
+            with col_periodo[1]:
+                mes_fim_label = st.selectbox("Mês final", mes_opcoes, index=len(mes_opcoes) - 1, key="periodo_mes_fim")
+            meses_periodo = list(range(MESES[mes_ini_label], MESES[mes_fim_label] + 1))
+            tipos_periodo = st.multiselect(
+                "Documentos",
+                list(TIPOS_DOCUMENTO),
+                default=list(TIPOS_DOCUMENTO),
+                format_func=TIPOS_DOCUMENTO.get,
+                key="periodo_tipos",
+            )
+            st.caption(
+                f"Ano, horários e dados do reeducando vêm dos campos acima ({ano}, {he}–{hs}). "
+                "Informe os feriados de cada mês na tabela abaixo (além dos automáticos, se marcados); "
+                "mês e dia sem descrição retiram o feriado automático daquele dia."
+            )
+            calendario_editado = st.data_editor(
+                st.session_state.get("periodo_feriados", [{"mes": None, "dia": None, "descricao": ""}]),
+                num_rows="dynamic",
+                width="stretch",
+                column_config={
+                    "mes": st.column_config.SelectboxColumn("Mês", options=mes_opcoes),
+                    "dia": st.column_config.NumberColumn("Dia", min_value=1, max_value=31, step=1),
+                    "descricao": st.column_config.TextColumn("Descrição"),
+                },
+                key="periodo_feriados_editor",
+            )
+
+            if st.button("Gerar período", disabled=not meses_periodo or not tipos_periodo):
+                calendario, erros = parse_calendario_feriados(calendario_editado, ano)
+                if erros:
+                    st.error("Revise os feriados informados: " + "; ".join(erros))
+                else:
+                    st.session_state["periodo_feriados"] = calendario_editado
+                    periodo = novo_arquivo("folhas_periodo.pdf", "application/pdf")
+                    gerar_periodo_pdf(
+                        ano=ano,
+                        meses=meses_periodo,
+                        he=he,
+                        hs=hs,
+                        feriados_por_mes={
+                            mes: _feriados_tela(ano, mes, municipio_input, calendario.get(mes))
+                            for mes in meses_periodo
+                        },
+                        tipos=tipos_periodo,
+                        endereco=endereco_input,
+                        cep=cep_input,
+                        telefone=telefone_input,
+                        data_preenchimento=data_input,
+                        secretaria=secretaria_input,
+                        reeducando=reeducando_input,
+                        funcao=funcao_input,
+                        data_inclusao=data_inclusao_input,
+                        municipio=municipio_input,
+                        cpf=cpf_input,
+                        banco=banco_input,
+                        agencia=agencia_input,
+                        conta=conta_input,
+                        tipo_conta=tipo_conta_input,
+                        rodape_titulo=rodape_titulo_input,
+                        rodape_endereco=rodape_endereco_input,
+                        rodape_fone=rodape_fone_input,
+                        rodape_cep=rodape_cep_input,
+                        rodape_email=rodape_email_input,
+                        destino=periodo["caminho"],
+                    )
+                    guardar_na_sessao("periodo_pdf", finalizar(periodo))
+                    _registrar_documento("periodo_pdf", periodo, "periodo", campos_pessoa, data_input)
+                    st.session_state["periodo_rotulo"] = rotulo_periodo(ano, meses_periodo)
+                    st.success(f"Período {st.session_state['periodo_rotulo']} gerado com sucesso!")
+            elif not meses_periodo:
+                st.warning("O mês final deve ser igual ou posterior ao mês inicial.")
+
+            if "periodo_pdf" in st.session_state:
+                botao_download(
+                    f"Baixar {st.session_state.get('periodo_rotulo', 'período')}",
+                    st.session_state["periodo_pdf"],
+                    key="periodo_download",
+                )
+                if "periodo_pdf_gravacao" in st.session_state:
+                    mostrar_situacao(st.session_state["periodo_pdf_gravacao"])
+
+        with st.expander("Gerar em lote (planilha CSV ou XLSX)", expanded=False):
+            st.caption(
+                "Uma linha por reeducando, com as mesmas colunas dos campos acima "
+                "(reeducando, funcao, cpf, municipio...). Mês, ano, horários e feriados "
+                "vêm de \"Preencher dados da folha\", salvo se a planilha tiver as colunas "
+                "mes_label/ano/he/hs."
+            )
+            roster = st.file_uploader("Planilha de reeducandos", type=["csv", "xlsx"], key="lote_arquivo")
+            tipos_lote = st.multiselect(
+                "Documentos",
+                list(TIPOS_DOCUMENTO),
+                default=list(TIPOS_DOCUMENTO),
+                format_func=TIPOS_DOCUMENTO.get,
+                key="lote_tipos",
+            )
+            col_lote = st.columns(2)
+            with col_lote[0]:
+                workers_lote = st.number_input(
+                    "Processos em paralelo",
+                    min_value=1,
+                    max_value=32,
+                    value=workers_padrao(),
+                    step=1,
+                    key="lote_workers",
+                )
+            with col_lote[1]:
+                saida_lote = st.radio("Saída", ["PDF único", "ZIP (um arquivo por pessoa)"], key="lote_saida")
+
+            if st.button("Gerar lote", disabled=roster is None or not tipos_lote):
+                feriados_dict, erros = parse_feriados_text(feriados_texto)
+                try:
+                    linhas = ler_roster(roster.name, roster.getvalue())
+                except (RuntimeError, ValueError) as exc:
+                    linhas = []
+                    erros.append(str(exc))
+                pessoas, erros_linhas = preparar_lote(
+                    linhas, ano, MESES[mes_label], he, hs, feriados_dict, feriados_automaticos=feriados_automaticos
+                )
+                erros.extend(erros_linhas)
+                if erros:
+                    st.warning("Revise a planilha/feriados: " + "; ".join(erros))
+                if not pessoas:
+                    st.error("Nenhum reeducando válido na planilha.")
+                else:
+                    _gerar_lote_na_tela(
+                        pessoas, tipos_lote, workers_lote, saida_lote == "PDF único", "lote_arquivo_saida"
+                    )
+
+            if "lote_arquivo_saida" in st.session_state:
+                botao_download("Baixar lote", st.session_state["lote_arquivo_saida"], key="lote_download")
+
+        with st.expander("Importar folhas do mês anterior (vários PDF/DOCX ou ZIP)", expanded=False):
+            st.caption(
+                "Os arquivos são lidos em paralelo e cada um vira uma linha da tabela, que pode "
+                "ser corrigida antes de gerar. Linhas com erro de leitura ficam desmarcadas. "
+                "As folhas saem no mês, ano, horários e feriados de \"Preencher dados da folha\"."
+            )
+            enviados = st.file_uploader(
+                "Folhas anteriores",
+                type=["pdf", "docx", "zip"],
+                accept_multiple_files=True,
+                key="importacao_arquivos",
+            )
+            if st.button("Ler arquivos", disabled=not enviados, key="importacao_ler"):
+                entradas, erros = expandir_arquivos((item.name, item.getvalue()) for item in enviados)
+                if erros:
+                    st.warning("; ".join(erros))
+                if entradas:
+                    barra = st.progress(0.0, text=f"0 de {len(entradas)}")
+
+                    def _progresso_leitura(concluidos, total):
+                        barra.progress(concluidos / total, text=f"{concluidos} de {total}")
+
+                    inicio = time.perf_counter()
+                    st.session_state["importacao_roster"] = importar_arquivos(
+                        entradas, progresso=_progresso_leitura
+                    )
+                    st.session_state["importacao_tempo"] = time.perf_counter() - inicio
+                    # tabela nova: descarta as edições feitas na anterior
+                    st.session_state.pop("importacao_editor", None)
+
+            if st.session_state.get("importacao_roster"):
+                roster_importado = st.session_state["importacao_roster"]
+                falhas = sum(1 for linha in roster_importado if linha["status"] != "ok")
+                st.caption(
+                    f"{len(roster_importado)} arquivo(s) lidos em "
+                    f"{st.session_state.get('importacao_tempo', 0):.2f} s; {falhas} com erro."
+                )
+                editado = st.data_editor(
+                    roster_importado,
+                    column_order=COLUNAS_ROSTER,
+                    column_config={
+                        "gerar": st.column_config.CheckboxColumn("Gerar"),
+                        "arquivo": st.column_config.TextColumn("Arquivo"),
+                        "status": st.column_config.TextColumn("Status"),
+                        "ms": st.column_config.NumberColumn("Tempo (ms)", format="%.1f"),
+                    },
+                    disabled=["arquivo", "status", "ms"],
+                    hide_index=True,
+                    key="importacao_editor",
+                )
+                saida_importacao = st.radio(
+                    "Saída", ["PDF único", "ZIP (um arquivo por pessoa)"], key="importacao_saida"
+                )
+                linhas_marcadas = linhas_para_lote(editado)
+                if st.button(
+                    f"Gerar folhas ({len(linhas_marcadas)})",
+                    disabled=not linhas_marcadas,
+                    key="importacao_gerar",
+                ):
+                    feriados_dict, erros = parse_feriados_text(feriados_texto)
+                    pessoas, erros_linhas = preparar_lote(
+                        linhas_marcadas,
+                        ano,
+                        MESES[mes_label],
+                        he,
+                        hs,
+                        feriados_dict,
+                        feriados_automaticos=feriados_automaticos,
+                    )
+                    erros.extend(erros_linhas)
+                    if erros:
+                        st.warning("Revise a tabela/feriados: " + "; ".join(erros))
+                    if pessoas:
+                        _gerar_lote_na_tela(
+                            pessoas,
+                            ("folha",),
+                            workers_padrao(),
+                            saida_importacao == "PDF único",
+                            "importacao_arquivo_saida",
+                        )
+
+            if "importacao_arquivo_saida" in st.session_state:
+                botao_download(
+                    "Baixar folhas", st.session_state["importacao_arquivo_saida"], key="importacao_download"
+                )
+
         # Botoes de download
         if "pdf" in st.session_state:
             st.markdown("### Pagina de impressao - Folha de Ponto")
             folha_pdf = st.session_state["pdf"]
             try:
-                st.pdf(folha_pdf)
+                if existe(folha_pdf):
+                    st.pdf(ler_bytes(folha_pdf))
             except StreamlitAPIException:
                 st.info(
                     "Pre-visualizacao de PDF indisponivel neste ambiente. "
                     "Para habilitar, instale: pip install streamlit[pdf]"
                 )
-            st.download_button(
-                "Baixar Folha de Ponto",
-                data=folha_pdf,
-                file_name="folha.pdf",
-                mime="application/pdf",
-            )
+            botao_download("Baixar Folha de Ponto", folha_pdf, key="pdf_download")
+            if "pdf_gravacao" in st.session_state:
+                mostrar_situacao(st.session_state["pdf_gravacao"])
         if "relatorio_pdf" in st.session_state:
             st.markdown("### Pagina de impressao - Relatorio de Atividades")
             relatorio_pdf = st.session_state["relatorio_pdf"]
             try:
-                st.pdf(relatorio_pdf)
+                if existe(relatorio_pdf):
+                    st.pdf(ler_bytes(relatorio_pdf))
             except StreamlitAPIException:
                 st.info(
                     "Pre-visualizacao de PDF indisponivel neste ambiente. "
                     "Para habilitar, instale: pip install streamlit[pdf]"
                 )
-            st.download_button(
-                "Baixar Relatorio de Atividades",
-                data=relatorio_pdf,
-                file_name="relatorio_atividades.pdf",
-                mime="application/pdf",
-            )
+            botao_download("Baixar Relatorio de Atividades", relatorio_pdf, key="relatorio_pdf_download")
+            if "relatorio_pdf_gravacao" in st.session_state:
+                mostrar_situacao(st.session_state["relatorio_pdf_gravacao"])
@@ -0,0 +1,83 @@
+"""
+Registro das páginas do menu lateral.
+
+Cada entrada aponta para o módulo e a função ``render_*`` da página; o módulo
+só é importado quando a página é aberta pela primeira vez no processo (cada
+página puxa bibliotecas pesadas diferentes: PyMuPDF, python-docx, pandas...).
+O tempo de importação de cada página fica registrado em ``tempos_importacao``.
+As páginas de ``PAGINAS_OCULTAS`` não aparecem no menu e são abertas pela URL
+(``?pagina=diagnostico``).
+"""
+
+import importlib
+import threading
+import time
+
+
+# (rótulo no menu, ícone bootstrap, módulo, função de render)
+PAGINAS = [
+    ("Folha Reeducandos", "file-earmark-text", "views.reeducandos", "render_folha_ponto"),
+    ("Lista de Presença", "card-checklist", "views.lista_presenca", "render_lista_presenca"),
+    ("Controle de Veículos", "truck", "views.veiculos", "render_veiculos"),
+    ("Cadastro de Emissão de GTA", "person-vcard", "views.cadastro_emissao_gta", "render_cadastro_emissao_gta"),
+    ("Parcelar Auto de Infração", "receipt", "views.parcelamento", "render_parcelamento"),
+    (
+        "Requerimento de restituição de valor recolhido indevidamente",
+        "cash-coin",
+        "views.restituicao",
+        "render_restituicao",
+    ),
+    ("Declaração de nada consta", "file-text", "views.declaracao_nada_consta", "render_declaracao_nada_consta"),
+    ("Declaração de residência", "house", "views.declaracao_residencia", "render_declaracao_residencia"),
+    (
+        "Declaração cadastral - suínos",
+        "file-earmark-richtext",
+        "views.declaracao_cadastral_suinos",
+        "render_declaracao_cadastral_suinos",
+    ),
+    ("Etiqueta de arquivo", "tag", "views.etiqueta_arquivo", "render_etiqueta_arquivo"),
+    ("Guia de malote", "inbox", "views.guia_malote", "render_guia_malote"),
+    ("Autorização de viagem manual", "car-front", "views.autorizacao_viagem_manual", "render_autorizacao_viagem_manual"),
+    ("FAI vazio sanitário", "clipboard2-check", "views.fai_vazio_sanitario", "render_fai_vazio_sanitario"),
+    ("Buscar documentos emitidos", "search", "views.busca_documentos", "render_busca_documentos"),
+]
+
+# chave do parâmetro ``pagina`` da URL -> (rótulo, módulo, função de render)
+PAGINAS_OCULTAS = {
+    "diagnostico": ("Diagnóstico", "views.diagnostico", "render_diagnostico"),
+}
+
+_POR_ROTULO = {rotulo: (modulo, funcao) for rotulo, _, modulo, funcao in PAGINAS}
+_POR_ROTULO.update({rotulo: (modulo, funcao) for rotulo, modulo, funcao in PAGINAS_OCULTAS.values()})
+_TEMPOS = {}
+_LOCK = threading.Lock()
+
+
+def rotulos() -> list:
+    return [rotulo for rotulo, _, _, _ in PAGINAS]
+
+
+def icones() -> list:
+    return [icone for _, icone, _, _ in PAGINAS]
+
+
+def pagina_oculta(chave) -> str:
+    """Rótulo da página oculta pedida na URL ("" se não houver)."""
+    return PAGINAS_OCULTAS.get(chave or "", ("",))[0]
+
+
+def carregar_pagina(rotulo: str):
+    """Importa (na primeira vez) o módulo da página e devolve a função de render."""
+    nome_modulo, nome_funcao = _POR_ROTULO.get(rotulo, _POR_ROTULO[PAGINAS[0][0]])
+    with _LOCK:
+        if nome_modulo not in _TEMPOS:
+            inicio = time.perf_counter()
+            importlib.import_module(nome_modulo)
+            _TEMPOS[nome_modulo] = time.perf_counter() - inicio
+    return getattr(importlib.import_module(nome_modulo), nome_funcao)
+
+
+def tempos_importacao() -> dict:
+    """Segundos gastos na primeira importação de cada página já aberta."""
+    with _LOCK:
+        return dict(_TEMPOS)
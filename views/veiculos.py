@@ -1,12 +1,13 @@
 import base64
-from io import BytesIO
 from pathlib import Path
 
 import streamlit as st
-from reportlab.lib.pagesizes import A4, landscape
-from reportlab.lib.units import mm
-from reportlab.lib.utils import ImageReader
-from reportlab.pdfgen import canvas
+
+from pdf.imagens import obter_imagem
+from pdf.veiculos import VEICULO_TABLE_HEADERS, VEICULO_TABLE_WIDTHS, build_pdf_veiculo
+from services.artefatos import publicar
+from services.gravacao import agendar, mostrar_situacao
+
 
 VEICULO_MESES = [
     "Janeiro",
@@ -23,137 +24,7 @@ VEICULO_MESES = [
     "Dezembro",
 ]
 VEICULO_ANOS = list(range(2026, 2037))
-VEICULO_TABLE_HEADERS = [
-    "DATA",
-    "HR SAIDA",
-    "KM SAIDA",
-    "HR CHEG",
-    "KM CHEGADA",
-    "DESTINO",
-    "ABASTECIMENTO",
-    "SERVIÇO REALIZADO DETALHADAMENTE",
-    "NOME DO CONDUTOR POR EXTENSO",
-]
-VEICULO_TABLE_WIDTHS = [18, 18, 18, 18, 16, 50, 24, 50, 50]
-
-def build_pdf_veiculo(data: dict, logo_path: Path) -> bytes:
-    buffer = BytesIO()
-    page_width, page_height = landscape(A4)
-    c = canvas.Canvas(buffer, pagesize=(page_width, page_height))
-
-    margin = 10 * mm
-    rect_h = 30 * mm
-    rect_w = page_width - 2 * margin
-    rect_x = margin
-    rect_y = page_height - margin - rect_h
-
-    c.setLineWidth(0.7)
-    c.rect(rect_x, rect_y, rect_w, rect_h)
-
-    if logo_path.exists():
-        logo = ImageReader(str(logo_path))
-        img_w, img_h = logo.getSize()
-        max_w = rect_w * 0.8
-        max_h = 32 * mm
-        scale = min(max_w / img_w, max_h / img_h)
-        draw_w = img_w * scale
-        draw_h = img_h * scale
-        img_x = rect_x + (rect_w - draw_w) / 2
-        img_y = rect_y + (rect_h - draw_h) / 2 - 2 * mm
-        c.drawImage(logo, img_x, img_y, width=draw_w, height=draw_h, mask="auto")
-
-    title_h = 6 * mm
-    title_y = rect_y - title_h
-
-    c.setLineWidth(0.7)
-    c.rect(rect_x, title_y, rect_w, title_h)
-    c.setFont("Helvetica-Bold", 10)
-    c.drawCentredString(
-        rect_x + rect_w / 2, title_y + 2.2 * mm, "CONTROLE DE USO E SAIDA DE VEICULO"
-    )
-
-    info_y = title_y - 4 * mm
-    info_h = 8 * mm
-    c.rect(rect_x, info_y - info_h, rect_w, info_h)
-    c.setFont("Helvetica-Bold", 8)
-    c.drawString(rect_x + 2 * mm, info_y - 7 * mm, f"ANO: {data['ano']} / MES: {data['mes']}")
-    c.drawString(
-        rect_x + 55 * mm,
-        info_y - 7 * mm,
-        f"NOME DA UNIDADE: {data['unidade'] or '______________________________'}",
-    )
-    c.drawString(
-        rect_x + 140 * mm,
-        info_y - 7 * mm,
-        f"PLACA DO VEICULO: {data['placa']} ({data['modelo']})",
-    )
-
-    table_top = info_y - info_h
-    bottom_area_h = 30 * mm
-    table_bottom = margin + bottom_area_h
-    table_height = table_top - table_bottom
-    rows = 14
-    row_h = table_height / rows
-
-    scale = rect_w / sum(VEICULO_TABLE_WIDTHS)
-    col_widths = [w * scale for w in VEICULO_TABLE_WIDTHS]
-
-    x = rect_x
-    c.setLineWidth(0.5)
-    for w in col_widths:
-        c.line(x, table_bottom, x, table_top)
-        x += w
-    c.line(rect_x + rect_w, table_bottom, rect_x + rect_w, table_top)
-
-    for i in range(rows + 1):
-        y = table_top - i * row_h
-        c.line(rect_x, y, rect_x + rect_w, y)
-
-    c.setFont("Helvetica-Bold", 6)
-    x = rect_x
-    y = table_top - row_h + 2 * mm
-    for w, h in zip(col_widths, VEICULO_TABLE_HEADERS):
-        c.drawCentredString(x + w / 2, y, h)
-        x += w
-
-    c.setFont("Helvetica", 7)
-    first_col_x = rect_x + col_widths[0] / 2
-    for i in range(1, rows):
-        row_y = table_top - (i + 0.5) * row_h
-        c.drawCentredString(first_col_x, row_y, "/    /")
-
-    checklist_x = rect_x
-    checklist_y = table_bottom - 6 * mm
-    c.setFont("Helvetica-Bold", 7)
-    c.drawString(checklist_x, checklist_y, "CHECKLIST:")
-    c.setFont("Helvetica", 7)
-    checklist_items = [
-        "DOCUMENTO DE PORTE OBRIGATORIO ( )SIM ( )NAO",
-        "CHAVE DE RODA ( )SIM ( )NAO",
-        "MACACO ( )SIM ( )NAO",
-        "TRIANGULO ( )SIM ( )NAO",
-        "EXTINTOR ( )SIM ( )NAO",
-        "ESTEPE ( )SIM ( )NAO",
-    ]
-    for idx, item in enumerate(checklist_items):
-        c.drawString(checklist_x, checklist_y - (4 * mm) * (idx + 1), item)
-
-    sig_y = margin + 8 * mm
-    sig_x = rect_x + rect_w * 0.35
-    sig_w = rect_w * 0.3
-    c.line(sig_x, sig_y, sig_x + sig_w, sig_y)
-    c.setFont("Helvetica", 7)
-    c.drawCentredString(sig_x + sig_w / 2, sig_y - 4 * mm, "Assinatura do Chefe da Unidade")
-
-    obs_x = rect_x + rect_w * 0.75
-    obs_y = margin + 18 * mm
-    c.setFont("Helvetica-Bold", 7)
-    c.drawString(obs_x, obs_y, "OBS.:")
 
-    c.showPage()
-    c.save()
-    buffer.seek(0)
-    return buffer.read()
 
 def render_veiculos():
     st.title("Entrada e Saida de Veiculos")
@@ -188,23 +59,38 @@ def render_veiculos():
             "modelo": modelo,
         }
         st.session_state["veiculo_show_print"] = True
+        st.session_state["veiculo_registrar"] = True
 
     if st.session_state["veiculo_show_print"]:
         data = st.session_state["veiculo_form_data"]
 
         logo_path = Path(__file__).resolve().parents[1] / "assets" / "logo_inferior_dir.jpg"
-        logo_b64 = ""
-        if logo_path.exists():
-            logo_b64 = base64.b64encode(logo_path.read_bytes()).decode("ascii")
+        logo_src = ""
+        logo = obter_imagem(logo_path)
+        if logo is not None:
+            logo_src = publicar(logo["dados"], logo_path.suffix)
+            if logo_src is None:
+                logo_src = "data:image/jpg;base64," + base64.b64encode(logo["dados"]).decode("ascii")
 
         st.markdown("## Pagina de impressao")
         pdf_bytes = build_pdf_veiculo(data, logo_path)
+        if st.session_state.pop("veiculo_registrar", False):
+            st.session_state["veiculo_pdf_gravacao"] = agendar(
+                pdf_bytes,
+                "veiculo",
+                "controle_uso_saida_veiculo.pdf",
+                pessoa=data["unidade"],
+                numero=data["placa"],
+                data=f"{data['mes']}/{data['ano']}",
+            )
         st.download_button(
             "Baixar PDF",
             data=pdf_bytes,
             file_name="controle_uso_saida_veiculo.pdf",
             mime="application/pdf",
         )
+        if "veiculo_pdf_gravacao" in st.session_state:
+            mostrar_situacao(st.session_state["veiculo_pdf_gravacao"])
 
         st.markdown(
             f"""
@@ -318,7 +204,7 @@ def render_veiculos():
             </style>
             <div class="print-page">
                 <div class="top-rect">
-                    {"<img src='data:image/jpg;base64," + logo_b64 + "' alt='Logo' />" if logo_b64 else ""}
+                    {"<img src='" + logo_src + "' alt='Logo' />" if logo_src else ""}
                 </div>
                 <div class="titulo-linha">CONTROLE DE USO E SAIDA DE VEICULO</div>
                 <div class="info-row">